@@ -0,0 +1,57 @@
+"""add_raw_connector_rows
+
+Revision ID: raw_rows_20251116
+Revises: raw_dq_20251115
+Create Date: 2025-11-16 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'raw_rows_20251116'
+down_revision: Union[str, None] = 'raw_dq_20251115'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Row-level staging for uploaded files (one row per CSV record, loaded via COPY)
+    op.create_table(
+        'raw_connector_rows',
+        sa.Column('raw_id', sa.UUID(), nullable=False),  # FK to raw_connector_data.raw_id
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('source_id', sa.UUID(), nullable=False),
+        sa.Column('row_num', sa.BigInteger(), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint('raw_id', 'row_num'),
+        sa.ForeignKeyConstraint(['raw_id'], ['raw_connector_data.raw_id'], ondelete='CASCADE'),
+    )
+    op.create_index('idx_raw_rows_source', 'raw_connector_rows', ['tenant_id', 'source_id'], unique=False)
+
+    # Upload progress, written outside the upload's transaction so every API process can report it
+    op.create_table(
+        'csv_uploads',
+        sa.Column('upload_id', sa.String(length=255), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('connector_id', sa.UUID(), nullable=True),
+        sa.Column('filename', sa.String(length=500), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='running'),  # running, completed, failed
+        sa.Column('bytes_read', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('rows', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('upload_id'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('csv_uploads')
+    op.drop_index('idx_raw_rows_source', table_name='raw_connector_rows')
+    op.drop_table('raw_connector_rows')
@@ -0,0 +1,68 @@
+"""add_elt_source_state
+
+Revision ID: elt_state_20251117
+Revises: raw_rows_20251116
+Create Date: 2025-11-17 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'elt_state_20251117'
+down_revision: Union[str, None] = 'raw_rows_20251116'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-source ELT aggregates and watermark (incremental processing)
+    op.create_table(
+        'elt_source_state',
+        sa.Column('source_id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('dataset', sa.String(length=100), nullable=True),
+        sa.Column('watermark', sa.DateTime(), nullable=True),  # ingested_at of the newest merged batch
+        sa.Column('last_raw_id', sa.UUID(), nullable=True),
+        sa.Column('batches_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_metric_id', sa.UUID(), nullable=True),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('source_id'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+        sa.ForeignKeyConstraint(['source_id'], ['data_sources.source_id'], ondelete='CASCADE'),
+    )
+    op.create_index('idx_elt_state_tenant', 'elt_source_state', ['tenant_id'], unique=False)
+
+    # Weekly demand points per source; ELT upserts only each batch's rows and
+    # keeps running aggregates in elt_source_state.state
+    op.create_table(
+        'elt_demand_weeks',
+        sa.Column('source_id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('sku', sa.String(length=255), nullable=False),
+        sa.Column('week', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('source_id', 'sku', 'week'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+        sa.ForeignKeyConstraint(['source_id'], ['data_sources.source_id'], ondelete='CASCADE'),
+    )
+
+    # Pending batches are claimed by source in ingestion order
+    op.create_index(
+        'idx_raw_unprocessed',
+        'raw_connector_data',
+        ['source_id', 'ingested_at'],
+        unique=False,
+        postgresql_where=sa.text('NOT processed')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_raw_unprocessed', table_name='raw_connector_data')
+    op.drop_table('elt_demand_weeks')
+    op.drop_index('idx_elt_state_tenant', table_name='elt_source_state')
+    op.drop_table('elt_source_state')
@@ -0,0 +1,77 @@
+"""add_jobs_queue
+
+Revision ID: jobs_20251118
+Revises: elt_state_20251117
+Create Date: 2025-11-18 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'jobs_20251118'
+down_revision: Union[str, None] = 'elt_state_20251117'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Background job queue (ELT, forecast, optimize) polled by worker processes
+    op.create_table(
+        'jobs',
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),  # queued, running, succeeded, failed
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('dedupe_key', sa.String(length=255), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_by', sa.String(length=255), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('progress', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+    )
+    op.create_index(
+        'idx_jobs_ready',
+        'jobs',
+        [sa.text('priority DESC'), 'run_after'],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index('idx_jobs_tenant_created', 'jobs', ['tenant_id', sa.text('created_at DESC')], unique=False)
+    # At most one queued job per dedupe key (e.g. one pending ELT run per tenant)
+    op.create_index(
+        'idx_jobs_dedupe_queued',
+        'jobs',
+        ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'idx_jobs_running_heartbeat',
+        'jobs',
+        ['heartbeat_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'running'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_jobs_running_heartbeat', table_name='jobs')
+    op.drop_index('idx_jobs_dedupe_queued', table_name='jobs')
+    op.drop_index('idx_jobs_tenant_created', table_name='jobs')
+    op.drop_index('idx_jobs_ready', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,75 @@
+"""add_coaching_memory
+
+Revision ID: coach_memory_20251119
+Revises: jobs_20251118
+Create Date: 2025-11-19 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision: str = 'coach_memory_20251119'
+down_revision: Union[str, None] = 'jobs_20251118'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+
+    # Chat sessions are opened through the API before a user is known
+    op.alter_column('coaching_sessions', 'user_id', existing_type=sa.UUID(), nullable=True)
+
+    # One row per question/answer turn; the session row keeps recent messages
+    # and the mean of its turn embeddings
+    op.create_table(
+        'coaching_turns',
+        sa.Column('turn_id', sa.UUID(), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('turn_index', sa.Integer(), nullable=False),
+        sa.Column('question', sa.Text(), nullable=False),
+        sa.Column('answer', sa.Text(), nullable=True),
+        sa.Column('intent', sa.String(length=50), nullable=True),
+        sa.Column('embedding', Vector(dim=1536), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('turn_id'),
+        sa.ForeignKeyConstraint(['session_id'], ['coaching_sessions.session_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+    )
+    op.create_index('idx_coaching_turns_session', 'coaching_turns', ['session_id', sa.text('turn_index DESC')], unique=False)
+    # Exact recall over one tenant's turns when the shared HNSW scan comes up short
+    op.create_index('idx_coaching_turns_tenant', 'coaching_turns', ['tenant_id'], unique=False)
+
+    # Approximate nearest-neighbour search over past turns and sessions
+    op.create_index(
+        'idx_coaching_turns_embedding',
+        'coaching_turns',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
+    op.create_index(
+        'idx_coaching_sessions_embedding',
+        'coaching_sessions',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_coaching_sessions_embedding', table_name='coaching_sessions')
+    op.drop_index('idx_coaching_turns_embedding', table_name='coaching_turns')
+    op.drop_index('idx_coaching_turns_tenant', table_name='coaching_turns')
+    op.drop_index('idx_coaching_turns_session', table_name='coaching_turns')
+    op.drop_table('coaching_turns')
+    op.alter_column('coaching_sessions', 'user_id', existing_type=sa.UUID(), nullable=False)
@@ -0,0 +1,47 @@
+"""add_dashboard_snapshots
+
+Revision ID: dashboard_20251120
+Revises: coach_memory_20251119
+Create Date: 2025-11-20 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'dashboard_20251120'
+down_revision: Union[str, None] = 'coach_memory_20251119'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Precomputed dashboard aggregates, one row per tenant. Each section is
+    # refreshed on its own when connectors, goals or ELT metrics change.
+    op.create_table(
+        'tenant_dashboard_snapshots',
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        # sources: data_sources.extra_data totals by data type
+        sa.Column('order_records', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('inventory_records', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('customer_records', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('has_real_data', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('sources_refreshed_at', sa.DateTime(), nullable=True),
+        # goals: active smart_goals and their mean progress
+        sa.Column('active_goals', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column('goal_progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('goals_refreshed_at', sa.DateTime(), nullable=True),
+        # metrics: latest business_metrics values shown on cards
+        sa.Column('revenue_growth', sa.Float(), nullable=True),
+        sa.Column('metrics_refreshed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('tenant_id'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_dashboard_snapshots')
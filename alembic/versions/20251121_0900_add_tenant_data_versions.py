@@ -0,0 +1,34 @@
+"""add_tenant_data_versions
+
+Revision ID: data_versions_20251121
+Revises: dashboard_20251120
+Create Date: 2025-11-21 09:00:00+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'data_versions_20251121'
+down_revision: Union[str, None] = 'dashboard_20251120'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-tenant counter bumped by writes; cached GET responses and their
+    # ETags are keyed by it
+    op.create_table(
+        'tenant_data_versions',
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('tenant_id'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id']),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_data_versions')
@@ -12,8 +12,10 @@ class GoalsRepositoryPG:
 	"""Repository for smart_goals table in Postgres."""
 
 	def __init__(self, backend=None):
-		from packages.kernel_common.persistence_v2 import get_backend
-		self._backend = backend or get_backend()
+		if backend is None:
+			from backend.utils.database import get_backend
+			backend = get_backend()
+		self._backend = backend
 
 	def create(
 		self,
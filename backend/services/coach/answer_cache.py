@@ -0,0 +1,147 @@
+"""
+Answer Cache
+Coach answers reused across phrasings of the same question until the tenant's data changes
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.utils.caching import TTLCache
+
+# Latest write to each input of the coach's answers. Optimization runs
+# written by what-if/why/chat themselves (problem_type 'inventory_lp') are
+# derived from metrics and forecasts, so only the EOQ runs that /coach/ask
+# reads count towards the version.
+DATA_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(timestamp) FROM business_metrics WHERE tenant_id = %s),
+        (SELECT MAX(created_at) FROM forecasts WHERE tenant_id = %s),
+        (SELECT MAX(created_at) FROM optimization_runs
+          WHERE tenant_id = %s AND problem_type = 'inventory_optimization')
+"""
+
+
+def answer_key(kind: str, params: Dict[str, Any], data_version: str) -> str:
+    """
+    Stable hash of what an answer depends on
+
+    Args:
+        kind: Answering endpoint ('ask', 'what_if', 'why', 'chat')
+        params: Normalized intent and parameters parsed from the question
+        data_version: Tenant data version (see data_version)
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = json.dumps([kind, params, data_version], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def restate(answer: Dict[str, Any], question: str) -> Dict[str, Any]:
+    """Copy of a cached answer that echoes the new phrasing of the question"""
+    restated = dict(answer)
+    original = answer.get('question')
+    restated['question'] = question
+    narrative = answer.get('narrative')
+    if original and isinstance(narrative, str):
+        restated['narrative'] = narrative.replace(original, question, 1)
+    return restated
+
+
+class AnswerCache:
+    """
+    Per-tenant TTL + LRU cache of coach answers
+
+    Keys embed the tenant's data version, so new metrics, forecasts or
+    optimizations make old answers unreachable; invalidate() drops them
+    eagerly when a write happens in this process.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 2048, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl_seconds: Seconds an answer is served after it was computed
+            max_entries: Answers kept (all tenants) before the least recent is dropped
+            clock: Monotonic time source
+        """
+        self._entries = TTLCache(max_entries, ttl_seconds, clock)
+
+    def get(self, tenant_id: str, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get((tenant_id, key))
+
+    def put(self, tenant_id: str, key: str, answer: Dict[str, Any]) -> None:
+        self._entries.put((tenant_id, key), answer)
+
+    def invalidate(self, tenant_id: str) -> None:
+        self._entries.discard(lambda entry_key: entry_key[0] == tenant_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache configured by COACH_ANSWER_TTL_SECONDS / COACH_ANSWER_CACHE_SIZE"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache(
+                    ttl_seconds=float(os.getenv("COACH_ANSWER_TTL_SECONDS", "300")),
+                    max_entries=int(os.getenv("COACH_ANSWER_CACHE_SIZE", "2048")),
+                )
+    return _cache
+
+
+async def read_data_version(cur, tenant_id: str) -> str:
+    """Latest metric, forecast and EOQ optimization write times for a tenant"""
+    await cur.execute(DATA_VERSION_SQL, [tenant_id] * 3)
+    row = await cur.fetchone()
+    return '|'.join('' if value is None else str(value) for value in (row or ()))
+
+
+async def data_version(async_backend, tenant_id: str) -> str:
+    """read_data_version on a connection of its own"""
+    async with async_backend.get_connection() as conn:
+        async with conn.cursor() as cur:
+            return await read_data_version(cur, tenant_id)
+
+
+async def cached_answer(
+    async_backend,
+    tenant_id: str,
+    kind: str,
+    params: Dict[str, Any],
+    question: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    cache: Optional[AnswerCache] = None,
+) -> Dict[str, Any]:
+    """
+    Serve an answer from cache, or compute and cache it
+
+    Answers carrying an 'error' are returned but not cached.
+
+    Args:
+        async_backend: Async backend (see as_async_backend)
+        tenant_id: Tenant identifier
+        kind: Answering endpoint
+        params: Normalized intent and parameters parsed from the question
+        question: The question as asked (echoed in cached answers)
+        compute: Coroutine factory producing the answer on a miss
+        cache: Answer cache (defaults to the process-wide one)
+    """
+    cache = cache or get_answer_cache()
+    key = answer_key(kind, params, await data_version(async_backend, tenant_id))
+    answer = cache.get(tenant_id, key)
+    if answer is not None:
+        return restate(answer, question)
+    answer = await compute()
+    if isinstance(answer, dict) and not answer.get('error'):
+        cache.put(tenant_id, key, answer)
+    return answer
@@ -0,0 +1,170 @@
+"""
+Tenant Data Context
+Metrics, forecast and optimization context gathered in one round trip and cached per tenant
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from backend.services.coach.answer_cache import read_data_version
+from backend.utils.caching import TTLCache
+
+# Every consumer's lookups as scalar subqueries, so one statement serves the
+# coach's data gatherer and the narrative generator alike
+CONTEXT_SQL = """
+    SELECT
+        (SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'metric_name', m.metric_name, 'value', m.value,
+                    'extra_data', m.extra_data, 'timestamp', m.timestamp
+                ) ORDER BY m.timestamp DESC), '[]'::jsonb)
+           FROM (SELECT metric_name, value, extra_data, timestamp
+                   FROM business_metrics
+                  WHERE tenant_id = %s
+                  ORDER BY timestamp DESC LIMIT 20) m),
+        (SELECT jsonb_build_object('value', value, 'extra_data', extra_data)
+           FROM business_metrics
+          WHERE tenant_id = %s AND metric_name = 'total_inventory_value'
+          ORDER BY timestamp DESC LIMIT 1),
+        (SELECT jsonb_build_object(
+                    'predictions', predictions, 'horizon_days', horizon_days,
+                    'model_type', model_type, 'created_at', created_at)
+           FROM forecasts
+          WHERE tenant_id = %s AND metric_name = 'demand'
+          ORDER BY created_at DESC LIMIT 1),
+        (SELECT jsonb_build_object(
+                    'solution', solution, 'objective_value', objective_value,
+                    'problem_type', problem_type, 'created_at', created_at)
+           FROM optimization_runs
+          WHERE tenant_id = %s
+          ORDER BY created_at DESC LIMIT 1),
+        (SELECT jsonb_build_object('solution', solution, 'objective_value', objective_value)
+           FROM optimization_runs
+          WHERE tenant_id = %s AND problem_type = 'inventory_optimization'
+          ORDER BY created_at DESC LIMIT 1)
+"""
+
+FORECAST_SKUS = 10  # Per-SKU forecasts kept in the coach's context
+
+
+def build_context(row: Optional[tuple]) -> Dict[str, Any]:
+    """
+    Shape the CONTEXT_SQL row for its consumers
+
+    Returns:
+        metrics ({name: latest value}), forecasts ({sku: forecast} for the
+        first FORECAST_SKUS SKUs), optimization (latest run of any type),
+        plus inventory, demand_forecast and inventory_optimization (latest
+        rows used by NarrativeGenerator, or None)
+    """
+    metric_rows, inventory, demand_forecast, optimization, inventory_optimization = row or (None,) * 5
+
+    metrics: Dict[str, Any] = {}
+    for metric in metric_rows or []:
+        metrics.setdefault(metric['metric_name'], {
+            'value': metric['value'],
+            'extra_data': metric['extra_data'],
+            'timestamp': metric['timestamp'],
+        })
+
+    forecasts: Dict[str, Any] = {}
+    if demand_forecast and isinstance(demand_forecast.get('predictions'), dict):
+        for sku, forecast in list(demand_forecast['predictions'].items())[:FORECAST_SKUS]:
+            forecasts[sku] = {
+                'predictions': forecast.get('predictions', []) if isinstance(forecast, dict) else forecast,
+                'model_type': demand_forecast.get('model_type'),
+                'created_at': demand_forecast.get('created_at'),
+            }
+
+    return {
+        'metrics': metrics,
+        'forecasts': forecasts,
+        'optimization': optimization or {},
+        'inventory': inventory,
+        'demand_forecast': demand_forecast,
+        'inventory_optimization': inventory_optimization,
+        'gathered_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class TenantContextCache:
+    """
+    Per-tenant data contexts that expire after a short TTL
+
+    Entries are keyed on the tenant's data version (the one the answer
+    cache uses), so a write committed by another process - the job worker -
+    makes the old context unreachable even though invalidate() only runs
+    where the write happened.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_tenants: int = 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl_seconds: Seconds a gathered context is served before re-querying
+            max_tenants: Contexts kept before the least recently used is dropped
+            clock: Monotonic time source
+        """
+        self._entries = TTLCache(max_tenants, ttl_seconds, clock)
+
+    def get(self, tenant_id: str, data_version: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get((tenant_id, data_version))
+
+    def put(self, tenant_id: str, data_version: str, context: Dict[str, Any]) -> None:
+        self._entries.put((tenant_id, data_version), context)
+
+    def invalidate(self, tenant_id: str) -> None:
+        self._entries.discard(lambda key: key[0] == tenant_id)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        return {
+            'tenants': stats['entries'],
+            'ttl_seconds': stats['ttl_seconds'],
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+        }
+
+
+_cache: Optional[TenantContextCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tenant_context_cache() -> TenantContextCache:
+    """Process-wide context cache configured by COACH_CONTEXT_TTL_SECONDS / COACH_CONTEXT_CACHE_SIZE"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TenantContextCache(
+                    ttl_seconds=float(os.getenv("COACH_CONTEXT_TTL_SECONDS", "30")),
+                    max_tenants=int(os.getenv("COACH_CONTEXT_CACHE_SIZE", "1024")),
+                )
+    return _cache
+
+
+async def tenant_context(async_backend, tenant_id: str, cache: Optional[TenantContextCache] = None) -> Dict[str, Any]:
+    """
+    The tenant's data context, from cache or one combined query
+
+    The data version is read on every call; only the combined query is
+    skipped on a hit.
+
+    Args:
+        async_backend: Async backend (see as_async_backend)
+        tenant_id: Tenant identifier
+        cache: Context cache (defaults to the process-wide one)
+
+    Returns:
+        Context dict (see build_context)
+    """
+    cache = cache or get_tenant_context_cache()
+    async with async_backend.get_connection() as conn:
+        async with conn.cursor() as cur:
+            version = await read_data_version(cur, tenant_id)
+            context = cache.get(tenant_id, version)
+            if context is None:
+                await cur.execute(CONTEXT_SQL, [tenant_id] * 5)
+                context = build_context(await cur.fetchone())
+                cache.put(tenant_id, version, context)
+    return context
@@ -16,7 +16,7 @@ Agent Roles:
 Workflow:
 User Question → Goal Planning → Data Gathering → Analysis (Parallel) → Synthesis → Response
 """
-from typing import Dict, List, Any, Optional, TypedDict, Annotated
+from typing import AsyncIterator, Dict, List, Any, Optional, TypedDict, Annotated
 import json
 from datetime import datetime, timezone
 import operator
@@ -33,6 +33,10 @@ from backend.services.forecaster.prophet_forecaster import ProphetForecaster
 from backend.services.optimizer.ortools_optimizer import ORToolsOptimizer
 from backend.services.optimizer.inventory import InventoryOptimizer
 from backend.services.coach.optiguide_agent import OptiGuideInventoryAgent
+from backend.services.coach.context import tenant_context
+from backend.services.coach.memory import ConversationMemory, render_memory
+from backend.services.coach.registry import CoachRegistry
+from backend.utils.database import as_async_backend
 
 
 class ConversationState(TypedDict):
@@ -59,33 +63,48 @@ class LangGraphInventoryCoach:
     
     Example usage:
     ```python
-    coach = LangGraphInventoryCoach(backend, llm_config)
-    response = coach.chat(tenant_id="demo", question="What if order costs increase 20%?")
+    coach = get_coach_registry(backend).coach(llm_config)
+    response = await coach.chat(tenant_id="demo", question="What if order costs increase 20%?")
     ```
     """
     
-    def __init__(self, backend, llm_config: Optional[Dict] = None):
+    def __init__(self, backend, llm_config: Optional[Dict] = None, services: Optional[CoachRegistry] = None):
         """
         Initialize LangGraph coach with database backend and LLM config.
         
+        Nodes only read and write the per-request ConversationState, so one
+        coach (and its compiled workflow) can serve concurrent requests.
+        Use get_coach_registry(backend).coach(llm_config) rather than
+        constructing one per request.
+        
         Args:
             backend: PostgreSQL backend connection
             llm_config: LLM configuration
                        Example: {"model": "gpt-4", "api_key": "...", "temperature": 0}
+            services: Registry supplying shared service agents (created here when omitted)
         """
         self.backend = backend
+        self.async_backend = as_async_backend(backend)
         self.llm_config = llm_config or {}
         
         # Initialize LLM
         self.llm = self._init_llm()
         
         # Initialize service agents
-        self.elt_pipeline = ELTPipeline(backend)
-        self.forecaster = ProphetForecaster(backend) if self._prophet_available() else ForecastService(backend)
-        self.ortools_optimizer = ORToolsOptimizer(backend) if self._ortools_available() else InventoryOptimizer(backend)
-        self.optiguide = OptiGuideInventoryAgent(backend, llm_config)
+        if services is not None:
+            self.elt_pipeline = services.elt_pipeline
+            self.forecaster = services.forecaster
+            self.ortools_optimizer = services.optimizer
+            self.optiguide = services.optiguide(llm_config)
+            self.memory = services.memory
+        else:
+            self.elt_pipeline = ELTPipeline(backend)
+            self.forecaster = ProphetForecaster(backend) if self._prophet_available() else ForecastService(backend)
+            self.ortools_optimizer = ORToolsOptimizer(backend) if self._ortools_available() else InventoryOptimizer(backend)
+            self.optiguide = OptiGuideInventoryAgent(backend, llm_config)
+            self.memory = ConversationMemory(backend)
         
-        # Build LangGraph workflow
+        # Build LangGraph workflow (compiled once per coach)
         self.workflow = self._build_workflow()
     
     def _init_llm(self) -> Optional[ChatOpenAI]:
@@ -116,6 +135,9 @@ class LangGraphInventoryCoach:
         except ImportError:
             return False
     
+    NODES = ("goal_planner", "data_gatherer", "forecaster_agent", "optimizer_agent",
+             "what_if_agent", "evidence_agent", "narrator")
+    
     def _build_workflow(self) -> StateGraph:
         """Build LangGraph state machine for conversation workflow"""
         workflow = StateGraph(ConversationState)
@@ -161,6 +183,20 @@ class LangGraphInventoryCoach:
     
     # ========== Agent Nodes ==========
     
+    @staticmethod
+    def classify_intent(question: str) -> str:
+        """Simple intent classification (production would use LLM)"""
+        question = question.lower()
+        if any(word in question for word in ["forecast", "predict", "demand", "future"]):
+            return "forecast"
+        if any(word in question for word in ["what if", "scenario", "suppose", "if we"]):
+            return "what_if"
+        if any(word in question for word in ["why", "reason", "cause", "explain"]):
+            return "why"
+        if any(word in question for word in ["optimize", "reduce cost", "save", "improve"]):
+            return "optimize"
+        return "overview"
+    
     def _goal_planner_node(self, state: ConversationState) -> ConversationState:
         """
         Goal Planner Agent: Understands user intent and plans analysis strategy.
@@ -172,20 +208,7 @@ class LangGraphInventoryCoach:
         - why: Root cause analysis questions
         - overview: General status inquiries
         """
-        question = state["user_question"].lower()
-        
-        # Simple intent classification (production would use LLM)
-        if any(word in question for word in ["forecast", "predict", "demand", "future"]):
-            intent = "forecast"
-        elif any(word in question for word in ["what if", "scenario", "suppose", "if we"]):
-            intent = "what_if"
-        elif any(word in question for word in ["why", "reason", "cause", "explain"]):
-            intent = "why"
-        elif any(word in question for word in ["optimize", "reduce cost", "save", "improve"]):
-            intent = "optimize"
-        else:
-            intent = "overview"
-        
+        intent = self.classify_intent(state["user_question"])
         state["intent"] = intent
         state["messages"].append(
             SystemMessage(content=f"Classified intent as: {intent}")
@@ -193,11 +216,11 @@ class LangGraphInventoryCoach:
         
         return state
     
-    def _data_gatherer_node(self, state: ConversationState) -> ConversationState:
+    async def _data_gatherer_node(self, state: ConversationState) -> ConversationState:
         """
         Data Gatherer Agent: Fetches relevant metrics, forecasts, and optimization results.
         
-        Gathers:
+        Gathers (one combined query, cached per tenant for a short TTL):
         - Business metrics from ELT pipeline
         - Latest forecasts
         - Latest optimization results
@@ -205,16 +228,18 @@ class LangGraphInventoryCoach:
         """
         tenant_id = state["tenant_id"]
         
-        # Gather data from various sources
-        data_context = {
-            "metrics": self._get_latest_metrics(tenant_id),
-            "forecasts": self._get_latest_forecasts(tenant_id),
-            "optimization": self._get_latest_optimization(tenant_id),
-        }
+        try:
+            data_context = await tenant_context(self.async_backend, tenant_id)
+        except Exception as e:
+            print(f"Error gathering data context: {e}")
+            data_context = {"metrics": {}, "forecasts": {}, "optimization": {}}
         
         state["data_context"] = data_context
         state["messages"].append(
-            SystemMessage(content=f"Gathered data context with {len(data_context)} sources")
+            SystemMessage(content=(
+                f"Gathered data context with {len(data_context['metrics'])} metrics "
+                f"and {len(data_context['forecasts'])} forecasts"
+            ))
         )
         
         return state
@@ -369,90 +394,6 @@ class LangGraphInventoryCoach:
     
     # ========== Helper Functions ==========
     
-    def _get_latest_metrics(self, tenant_id: str) -> Dict:
-        """Get latest business metrics from database"""
-        try:
-            with self.backend.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT metric_name, value, extra_data, timestamp
-                        FROM business_metrics
-                        WHERE tenant_id = %s
-                        ORDER BY timestamp DESC
-                        LIMIT 20
-                    """, (tenant_id,))
-                    
-                    rows = cur.fetchall()
-                    metrics = {}
-                    for row in rows:
-                        metric_name = row[0]
-                        if metric_name not in metrics:
-                            metrics[metric_name] = {
-                                "value": row[1],
-                                "extra_data": row[2],
-                                "timestamp": row[3].isoformat() if row[3] else None
-                            }
-                    
-                    return metrics
-        except Exception as e:
-            print(f"Error fetching metrics: {e}")
-            return {}
-    
-    def _get_latest_forecasts(self, tenant_id: str) -> Dict:
-        """Get latest forecasts from database"""
-        try:
-            with self.backend.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT sku, predictions, model_type, created_at
-                        FROM forecasts
-                        WHERE tenant_id = %s
-                        ORDER BY created_at DESC
-                        LIMIT 10
-                    """, (tenant_id,))
-                    
-                    rows = cur.fetchall()
-                    forecasts = {}
-                    for row in rows:
-                        sku = row[0]
-                        if sku not in forecasts:
-                            forecasts[sku] = {
-                                "predictions": row[1],
-                                "model_type": row[2],
-                                "created_at": row[3].isoformat() if row[3] else None
-                            }
-                    
-                    return forecasts
-        except Exception as e:
-            print(f"Error fetching forecasts: {e}")
-            return {}
-    
-    def _get_latest_optimization(self, tenant_id: str) -> Dict:
-        """Get latest optimization results from database"""
-        try:
-            with self.backend.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT solution, objective_value, problem_type, created_at
-                        FROM optimization_runs
-                        WHERE tenant_id = %s
-                        ORDER BY created_at DESC
-                        LIMIT 1
-                    """, (tenant_id,))
-                    
-                    row = cur.fetchone()
-                    if row:
-                        return {
-                            "solution": row[0],
-                            "objective_value": row[1],
-                            "problem_type": row[2],
-                            "created_at": row[3].isoformat() if row[3] else None
-                        }
-                    return {}
-        except Exception as e:
-            print(f"Error fetching optimization: {e}")
-            return {}
-    
     def _generate_forecast_narrative(self, forecast_data: Dict) -> str:
         """Generate narrative from forecast results"""
         if not forecast_data or "error" in forecast_data:
@@ -513,34 +454,53 @@ class LangGraphInventoryCoach:
     
     # ========== Public Interface ==========
     
-    async def chat(self, tenant_id: str, question: str) -> Dict[str, Any]:
+    def _initial_state(self, tenant_id: str, question: str, recalled: List[Dict[str, Any]]) -> ConversationState:
+        history = [SystemMessage(content=render_memory(recalled))] if recalled else []
+        return {
+            "messages": history + [HumanMessage(content=question)],
+            "tenant_id": tenant_id,
+            "user_question": question,
+            "intent": None,
+            "data_context": None,
+            "analysis_results": None,
+            "narrative": None,
+            "next_action": None,
+        }
+    
+    async def _recall(self, tenant_id: str, question: str, session_id: Optional[str], user_id: Optional[str]):
+        """Open the session (when one is used) and recall the turns relevant to this question"""
+        if session_id is None:
+            return None, []
+        session_id = await self.memory.open_session(tenant_id, session_id, user_id)
+        return session_id, await self.memory.recall(tenant_id, session_id, question)
+    
+    async def chat(
+        self,
+        tenant_id: str,
+        question: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Main chat interface for conversational inventory optimization.
         
         Args:
             tenant_id: Tenant identifier
             question: User's natural language question
+            session_id: Coaching session to continue (created if new); None keeps no history
+            user_id: User opening the session
         
         Returns:
             Response dictionary with narrative and supporting data
         """
-        # Initialize conversation state
-        initial_state: ConversationState = {
-            "messages": [HumanMessage(content=question)],
-            "tenant_id": tenant_id,
-            "user_question": question,
-            "intent": None,
-            "data_context": None,
-            "analysis_results": None,
-            "narrative": None,
-            "next_action": None,
-        }
+        session_id, recalled = await self._recall(tenant_id, question, session_id, user_id)
+        initial_state = self._initial_state(tenant_id, question, recalled)
         
         try:
             # Run workflow (use ainvoke for async nodes)
             final_state = await self.workflow.ainvoke(initial_state)
             
-            return {
+            response = {
                 "question": question,
                 "intent": final_state.get("intent"),
                 "narrative": final_state.get("narrative"),
@@ -554,42 +514,75 @@ class LangGraphInventoryCoach:
                 "error": str(e),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
+        
+        if session_id is not None:
+            await self.memory.remember(tenant_id, session_id, [
+                {"question": question, "answer": response["narrative"], "intent": response["intent"]}
+            ])
+            response.update({"session_id": session_id, "recalled_turns": len(recalled)})
+        return response
     
-    def stream_chat(self, tenant_id: str, question: str):
+    async def astream_chat(
+        self,
+        tenant_id: str,
+        question: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
         Streaming version of chat for real-time updates.
         
+        Runs the workflow with astream_events on the caller's event loop;
+        LangGraph runs the synchronous nodes in its executor, so the loop
+        stays free between events. Closing the generator cancels the run.
+        
+        Args:
+            session_id: Coaching session to continue (created if new); None keeps no history
+            user_id: User opening the session
+        
         Yields:
-            JSON-serializable state updates as they occur during workflow execution
+            {"type": "session", "session_id", "recalled_turns"} first when a session is used,
+            {"type": "token", "node", "delta"} for each LLM token as it is produced,
+            {"type": "node", "node", "intent", "narrative", "next_action"} as each agent finishes,
+            or {"error"} if the workflow fails
         """
-        initial_state: ConversationState = {
-            "messages": [HumanMessage(content=question)],
-            "tenant_id": tenant_id,
-            "user_question": question,
-            "intent": None,
-            "data_context": None,
-            "analysis_results": None,
-            "narrative": None,
-            "next_action": None,
-        }
+        session_id, recalled = await self._recall(tenant_id, question, session_id, user_id)
+        initial_state = self._initial_state(tenant_id, question, recalled)
+        if session_id is not None:
+            yield {"type": "session", "session_id": session_id, "recalled_turns": len(recalled)}
         
+        node, intent, narrative = None, None, None
         try:
-            # Stream workflow execution - yields (node_name, state_update) tuples
-            for chunk in self.workflow.stream(initial_state):
-                # chunk is a dict with node names as keys
-                for node_name, state_update in chunk.items():
-                    # Extract fields from the state update
-                    serializable_state = {
-                        "node": node_name,
+            async for event in self.workflow.astream_events(initial_state, version="v1"):
+                kind, name = event["event"], event.get("name")
+                if kind == "on_chain_start" and name in self.NODES:
+                    node = name
+                elif kind == "on_chat_model_stream":
+                    chunk = event["data"].get("chunk")
+                    delta = getattr(chunk, "content", None)
+                    if delta:
+                        yield {"type": "token", "node": node, "delta": delta}
+                elif kind == "on_chain_end" and name in self.NODES:
+                    state_update = event["data"].get("output") or {}
+                    intent = state_update.get("intent") or intent
+                    narrative = state_update.get("narrative") or narrative
+                    yield {
+                        "type": "node",
+                        "node": name,
                         "intent": state_update.get("intent"),
                         "narrative": state_update.get("narrative"),
                         "next_action": state_update.get("next_action"),
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     }
-                    yield serializable_state
         except Exception as e:
             yield {
                 "error": str(e),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
+            return
+        
+        if session_id is not None and narrative is not None:
+            await self.memory.remember(tenant_id, session_id, [
+                {"question": question, "answer": narrative, "intent": intent}
+            ])
 
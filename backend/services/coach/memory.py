@@ -0,0 +1,328 @@
+"""
+Conversation Memory
+Persisted coaching turns with embedding retrieval of the most relevant earlier turns
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.utils.database import as_async_backend
+
+EMBEDDING_DIM = 1536  # coaching_sessions.embedding / coaching_turns.embedding
+SESSION_MESSAGES = 20  # Messages kept on the session row (turns live in coaching_turns)
+ANSWER_CHARS = 300  # Answer text carried into the prompt per recalled turn
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+# Recent turns of this session, then the tenant's nearest turns by cosine
+# distance (served by the HNSW index on coaching_turns.embedding)
+RECALL_SQL = """
+    (SELECT 'recent', session_id, turn_index, question, answer, intent, NULL::float8
+       FROM coaching_turns
+      WHERE tenant_id = %s AND session_id = %s
+      ORDER BY turn_index DESC
+      LIMIT %s)
+    UNION ALL
+    (SELECT 'relevant', session_id, turn_index, question, answer, intent, embedding <=> %s::vector
+       FROM coaching_turns
+      WHERE tenant_id = %s AND embedding IS NOT NULL
+      ORDER BY embedding <=> %s::vector
+      LIMIT %s)
+"""
+
+# Exact ranking of the tenant's turns; OFFSET 0 keeps the planner off the
+# HNSW index, whose scan filters by tenant only after it has run
+EXACT_RELEVANT_SQL = """
+    SELECT 'relevant', session_id, turn_index, question, answer, intent, distance
+      FROM (SELECT session_id, turn_index, question, answer, intent, embedding <=> %s::vector AS distance
+              FROM coaching_turns
+             WHERE tenant_id = %s AND embedding IS NOT NULL
+            OFFSET 0) turns
+     ORDER BY distance
+     LIMIT %s
+"""
+
+ITERATIVE_SCAN_VERSION = (0, 8)  # pgvector release that added hnsw.iterative_scan
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest % EMBEDDING_DIM, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """
+    Local stand-in embedding model
+
+    Signed feature hashing of word unigrams and bigrams into EMBEDDING_DIM
+    dimensions, L2-normalized. Deterministic and dependency-free, so tests
+    and offline deployments get lexical-overlap retrieval without an API.
+    """
+
+    dim = EMBEDDING_DIM
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dim) float32 matrix"""
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall((text or '').lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                col, sign = _feature_slot(feature)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), np.asarray(signs, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings (text-embedding-3-small, 1536 dims) requested in batches"""
+
+    dim = EMBEDDING_DIM
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "text-embedding-3-small", batch_size: int = 256):
+        try:
+            from langchain_openai import OpenAIEmbeddings
+        except ImportError:
+            raise ImportError("OpenAI embeddings require langchain-openai. Run: pip install langchain-openai")
+        self._client = OpenAIEmbeddings(model=model, api_key=api_key, chunk_size=batch_size)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._client.embed_documents(list(texts)), dtype=np.float32)
+
+
+def get_embedder():
+    """
+    Embedder selected by COACH_EMBEDDER
+
+    'local' uses HashingEmbedder, 'openai' uses OpenAIEmbedder with
+    OPENAI_API_KEY; 'auto' (default) picks OpenAI when a key is set and
+    langchain-openai is installed.
+    """
+    choice = os.getenv("COACH_EMBEDDER", "auto").lower()
+    if choice == "openai" or (choice == "auto" and os.getenv("OPENAI_API_KEY")):
+        try:
+            return OpenAIEmbedder(api_key=os.getenv("OPENAI_API_KEY"))
+        except ImportError:
+            if choice == "openai":
+                raise
+    return HashingEmbedder()
+
+
+def vector_literal(vector) -> str:
+    """pgvector text form of an embedding"""
+    return '[' + ','.join(f"{float(value):.6g}" for value in vector) + ']'
+
+
+def turn_text(turn: Dict[str, Any]) -> str:
+    """Text embedded for a turn: the question and the start of its answer"""
+    return f"{turn.get('question') or ''}\n{(turn.get('answer') or '')[:1000]}"
+
+
+def render_memory(turns: List[Dict[str, Any]]) -> str:
+    """Bounded prompt section summarizing recalled turns"""
+    lines = ["Relevant earlier conversation:"]
+    for turn in turns:
+        answer = (turn.get('answer') or '').replace('\n', ' ')
+        if len(answer) > ANSWER_CHARS:
+            answer = answer[:ANSWER_CHARS].rstrip() + '…'
+        lines.append(f"- Q: {turn['question']}\n  A: {answer}")
+    return '\n'.join(lines)
+
+
+class ConversationMemory:
+    """
+    Multi-turn coaching sessions stored in coaching_sessions / coaching_turns
+
+    Each turn is embedded when it is stored. recall() returns the last few
+    turns of the current session plus the tenant's k most similar earlier
+    turns, so the prompt stays bounded however long the history grows.
+    """
+
+    def __init__(self, backend, embedder=None, recent_turns: Optional[int] = None, top_k: Optional[int] = None):
+        """
+        Args:
+            backend: PostgreSQL backend
+            embedder: Object with embed(texts) -> (n, EMBEDDING_DIM) array (see get_embedder)
+            recent_turns: Latest turns of the session always recalled (env COACH_MEMORY_RECENT_TURNS)
+            top_k: Similar earlier turns recalled (env COACH_MEMORY_TOP_K)
+        """
+        self.async_backend = as_async_backend(backend)
+        self.embedder = embedder or get_embedder()
+        self.recent_turns = recent_turns if recent_turns is not None else int(os.getenv("COACH_MEMORY_RECENT_TURNS", "2"))
+        self.top_k = top_k if top_k is not None else int(os.getenv("COACH_MEMORY_TOP_K", "4"))
+        self.max_distance = float(os.getenv("COACH_MEMORY_MAX_DISTANCE", "0.9"))
+        self.ef_search = int(os.getenv("COACH_MEMORY_EF_SEARCH", "64"))
+        self._iterative_scan: Optional[bool] = None
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed one batch off the event loop"""
+        return await asyncio.to_thread(self.embedder.embed, texts)
+
+    async def open_session(self, tenant_id: str, session_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
+        """
+        Create the session if it does not exist yet
+
+        Returns:
+            The session id (a new UUID when none was given)
+
+        Raises:
+            ValueError: session_id is not a UUID or belongs to another tenant
+        """
+        try:
+            session_id = str(uuid.UUID(session_id)) if session_id else str(uuid.uuid4())
+        except ValueError:
+            raise ValueError("session_id must be a UUID")
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO coaching_sessions
+                    (session_id, tenant_id, user_id, messages, created_at, updated_at, extra_data)
+                    VALUES (%s, %s, %s, '[]'::jsonb, NOW(), NOW(), '{}'::jsonb)
+                    ON CONFLICT (session_id) DO UPDATE SET session_id = EXCLUDED.session_id
+                    RETURNING tenant_id
+                    """,
+                    [session_id, tenant_id, user_id]
+                )
+                (owner,) = await cur.fetchone()
+                await conn.commit()
+        if str(owner) != str(tenant_id):
+            raise ValueError("Unknown session")
+        return session_id
+
+    async def recall(self, tenant_id: str, session_id: str, question: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Turns to carry into the prompt for a new question
+
+        Returns:
+            Up to k similar earlier turns within max_distance (nearest first) followed by
+            the session's most recent turns (oldest first); no turn twice
+        """
+        k = self.top_k if k is None else k
+        [vector] = await self.embed([question])
+        literal = vector_literal(vector)
+        limit = k + self.recent_turns
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT set_config('hnsw.ef_search', %s, true)", [str(max(self.ef_search, limit))])
+                if await self._supports_iterative_scan(cur):
+                    # Keep walking the graph until enough of this tenant's turns pass the filter
+                    await cur.execute("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+                await cur.execute(RECALL_SQL, [
+                    tenant_id, session_id, self.recent_turns,
+                    literal, tenant_id, literal, limit,
+                ])
+                rows = await cur.fetchall()
+                if sum(row[0] == 'relevant' for row in rows) < limit:
+                    # The index scan ran dry before the tenant filter let `limit` turns through,
+                    # e.g. when other tenants' turns crowd the neighbourhood: rank exactly
+                    await cur.execute(EXACT_RELEVANT_SQL, [literal, tenant_id, limit])
+                    rows = [row for row in rows if row[0] == 'recent'] + list(await cur.fetchall())
+
+        recent, relevant = [], []
+        for source, turn_session, turn_index, turn_question, answer, intent, distance in rows:
+            turn = {
+                'session_id': str(turn_session),
+                'turn_index': turn_index,
+                'question': turn_question,
+                'answer': answer,
+                'intent': intent,
+                'distance': distance,
+            }
+            (recent if source == 'recent' else relevant).append(turn)
+        seen = {(turn['session_id'], turn['turn_index']) for turn in recent}
+        # relaxed_order iterative scans may return neighbours slightly out of order
+        relevant = sorted(
+            (turn for turn in relevant
+             if (turn['session_id'], turn['turn_index']) not in seen and turn['distance'] <= self.max_distance),
+            key=lambda turn: turn['distance'],
+        )[:k]
+        return relevant + recent[::-1]
+
+    async def _supports_iterative_scan(self, cur) -> bool:
+        if self._iterative_scan is None:
+            await cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            row = await cur.fetchone()
+            version = tuple(int(part) for part in re.findall(r'\d+', row[0])[:2]) if row else ()
+            self._iterative_scan = version >= ITERATIVE_SCAN_VERSION
+        return self._iterative_scan
+
+    async def remember(self, tenant_id: str, session_id: str, turns: List[Dict[str, Any]]) -> int:
+        """
+        Append turns ({question, answer, intent}) to a session
+
+        All turns are embedded in one batch and inserted in one statement.
+
+        Returns:
+            Number of turns stored
+        """
+        if not turns:
+            return 0
+        vectors = await self.embed([turn_text(turn) for turn in turns])
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                # Row lock serializes concurrent writers to the same session
+                await cur.execute(
+                    """
+                    SELECT s.messages,
+                           (SELECT COALESCE(MAX(turn_index), -1) FROM coaching_turns t WHERE t.session_id = s.session_id)
+                      FROM coaching_sessions s
+                     WHERE s.session_id = %s AND s.tenant_id = %s
+                       FOR UPDATE
+                    """,
+                    [session_id, tenant_id]
+                )
+                row = await cur.fetchone()
+                if row is None:
+                    raise ValueError("Unknown session")
+                messages, last_index = row
+                if isinstance(messages, str):
+                    messages = json.loads(messages)
+                first = last_index + 1
+
+                await cur.execute(
+                    """
+                    INSERT INTO coaching_turns
+                    (turn_id, session_id, tenant_id, turn_index, question, answer, intent, embedding, created_at)
+                    SELECT turn_id, %s, %s, turn_index, question, answer, intent, embedding::vector, NOW()
+                      FROM unnest(%s::uuid[], %s::int[], %s::text[], %s::text[], %s::text[], %s::text[])
+                           AS t(turn_id, turn_index, question, answer, intent, embedding)
+                    """,
+                    [
+                        session_id, tenant_id,
+                        [str(uuid.uuid4()) for _ in turns],
+                        list(range(first, first + len(turns))),
+                        [turn['question'] for turn in turns],
+                        [turn.get('answer') for turn in turns],
+                        [turn.get('intent') for turn in turns],
+                        [vector_literal(vector) for vector in vectors],
+                    ]
+                )
+
+                for turn in turns:
+                    messages.append({'role': 'user', 'content': turn['question']})
+                    messages.append({'role': 'assistant', 'content': turn.get('answer') or ''})
+                await cur.execute(
+                    """
+                    UPDATE coaching_sessions
+                       SET messages = %s,
+                           embedding = (SELECT AVG(embedding) FROM coaching_turns WHERE session_id = %s),
+                           updated_at = NOW()
+                     WHERE session_id = %s
+                    """,
+                    [json.dumps(messages[-SESSION_MESSAGES:]), session_id, session_id]
+                )
+                await conn.commit()
+        return len(turns)
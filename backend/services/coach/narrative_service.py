@@ -7,6 +7,9 @@ from typing import Dict, List, Any, Optional
 import json
 from datetime import datetime, timezone
 
+from backend.services.coach.context import tenant_context
+from backend.utils.database import as_async_backend
+
 
 class NarrativeGenerator:
     """Simple narrative generation service"""
@@ -14,6 +17,7 @@ class NarrativeGenerator:
     def __init__(self, backend):
         """Initialize with PostgreSQL backend"""
         self.backend = backend
+        self.async_backend = as_async_backend(backend)
     
     def _format_currency(self, value: float) -> str:
         """Format value as currency"""
@@ -103,6 +107,18 @@ class NarrativeGenerator:
         
         return narrative
     
+    @staticmethod
+    def classify_intent(question: str) -> str:
+        """Map a business question to the narrative intent it is answered with"""
+        question_lower = question.lower()
+        if any(word in question_lower for word in ['cost', 'save', 'reduce', 'optimize']):
+            return 'cost_reduction'
+        if any(word in question_lower for word in ['forecast', 'demand', 'predict', 'future']):
+            return 'demand_forecast'
+        if any(word in question_lower for word in ['inventory', 'stock', 'level']):
+            return 'inventory_status'
+        return 'general_overview'
+    
     async def generate_narrative(
         self,
         tenant_id: str,
@@ -120,112 +136,73 @@ class NarrativeGenerator:
         Returns:
             Narrative response with supporting data
         """
-        question_lower = question.lower()
-        
-        # Determine intent from question
-        intent = None
-        if any(word in question_lower for word in ['cost', 'save', 'reduce', 'optimize']):
-            intent = 'cost_reduction'
-        elif any(word in question_lower for word in ['forecast', 'demand', 'predict', 'future']):
-            intent = 'demand_forecast'
-        elif any(word in question_lower for word in ['inventory', 'stock', 'level']):
-            intent = 'inventory_status'
+        intent = self.classify_intent(question)
+        
+        # Shared with the coach's data gatherer: one query per tenant per TTL
+        data = await tenant_context(self.async_backend, tenant_id)
+        narrative_parts = []
+        supporting_data = {}
+        
+        # Latest inventory metrics
+        metric_row = data['inventory']
+        if intent in ['inventory_status', 'general_overview', 'cost_reduction'] and metric_row:
+            extra_data = metric_row['extra_data'] or {}
+            inventory_data = {
+                'total_inventory_value': metric_row['value'],
+                'product_count': extra_data.get('product_count', 0),
+                'stockout_risk_count': extra_data.get('stockout_risk_count', 0),
+                'overstock_count': extra_data.get('overstock_count', 0)
+            }
+            narrative_parts.append(self._generate_inventory_narrative(inventory_data))
+            supporting_data['inventory_metrics'] = inventory_data
+        
+        # Latest forecast
+        forecast_row = data['demand_forecast']
+        if intent in ['demand_forecast', 'general_overview'] and forecast_row:
+            forecast_data = {
+                'forecasts': forecast_row['predictions'],
+                'periods': (forecast_row['horizon_days'] or 0) // 7,  # Convert days to weeks
+                'model': forecast_row['model_type']
+            }
+            narrative_parts.append(self._generate_forecast_narrative(forecast_data))
+            supporting_data['forecast'] = forecast_data
+        
+        # Latest optimization
+        opt_row = data['inventory_optimization']
+        if intent in ['cost_reduction', 'general_overview'] and opt_row:
+            recommendations = opt_row['solution'] or []
+            opt_data = {
+                'recommendations': recommendations,
+                'total_potential_savings': opt_row['objective_value'],
+                'actions_required': sum(1 for r in recommendations if r['action'] in ['ORDER_NOW', 'REDUCE_STOCK'])
+            }
+            narrative_parts.append(self._generate_optimization_narrative(opt_data))
+            supporting_data['optimization'] = opt_data
+        
+        # Combine narratives
+        if not narrative_parts:
+            full_narrative = "No data available yet. Please run the ELT pipeline and generate forecasts/optimizations first."
         else:
-            intent = 'general_overview'
-        
-        with self.backend.get_connection() as conn:
-            with conn.cursor() as cur:
-                narrative_parts = []
-                supporting_data = {}
-                
-                # Get latest metrics
-                if intent in ['inventory_status', 'general_overview', 'cost_reduction']:
-                    cur.execute(
-                        """
-                        SELECT value, extra_data FROM business_metrics 
-                        WHERE tenant_id = %s AND metric_name = 'total_inventory_value'
-                        ORDER BY timestamp DESC LIMIT 1
-                        """,
-                        [tenant_id]
-                    )
-                    metric_row = cur.fetchone()
-                    if metric_row:
-                        inventory_data = {
-                            'total_inventory_value': metric_row[0],
-                            'product_count': metric_row[1].get('product_count', 0),
-                            'stockout_risk_count': metric_row[1].get('stockout_risk_count', 0),
-                            'overstock_count': metric_row[1].get('overstock_count', 0)
-                        }
-                        narrative_parts.append(self._generate_inventory_narrative(inventory_data))
-                        supporting_data['inventory_metrics'] = inventory_data
-                
-                # Get latest forecast
-                if intent in ['demand_forecast', 'general_overview']:
-                    cur.execute(
-                        """
-                        SELECT predictions, horizon_days, model_type 
-                        FROM forecasts 
-                        WHERE tenant_id = %s AND metric_name = 'demand'
-                        ORDER BY created_at DESC LIMIT 1
-                        """,
-                        [tenant_id]
-                    )
-                    forecast_row = cur.fetchone()
-                    if forecast_row:
-                        forecast_data = {
-                            'forecasts': forecast_row[0],
-                            'periods': forecast_row[1] // 7,  # Convert days to weeks
-                            'model': forecast_row[2]
-                        }
-                        narrative_parts.append(self._generate_forecast_narrative(forecast_data))
-                        supporting_data['forecast'] = forecast_data
-                
-                # Get latest optimization
-                if intent in ['cost_reduction', 'general_overview']:
-                    cur.execute(
-                        """
-                        SELECT solution, objective_value 
-                        FROM optimization_runs 
-                        WHERE tenant_id = %s AND problem_type = 'inventory_optimization'
-                        ORDER BY created_at DESC LIMIT 1
-                        """,
-                        [tenant_id]
-                    )
-                    opt_row = cur.fetchone()
-                    if opt_row:
-                        recommendations = opt_row[0]
-                        opt_data = {
-                            'recommendations': recommendations,
-                            'total_potential_savings': opt_row[1],
-                            'actions_required': sum(1 for r in recommendations if r['action'] in ['ORDER_NOW', 'REDUCE_STOCK'])
-                        }
-                        narrative_parts.append(self._generate_optimization_narrative(opt_data))
-                        supporting_data['optimization'] = opt_data
-                
-                # Combine narratives
-                if not narrative_parts:
-                    full_narrative = "No data available yet. Please run the ELT pipeline and generate forecasts/optimizations first."
-                else:
-                    full_narrative = ' '.join(narrative_parts)
-                
-                # Add specific recommendations based on intent
-                recommendations = []
-                if intent == 'cost_reduction' and 'optimization' in supporting_data:
-                    opt = supporting_data['optimization']
-                    for rec in opt['recommendations'][:5]:
-                        if rec['action'] in ['ORDER_NOW', 'REDUCE_STOCK']:
-                            recommendations.append({
-                                'action': rec['action'],
-                                'sku': rec['sku'],
-                                'description': f"{rec['action'].replace('_', ' ').title()}: {rec['sku']} (Save {self._format_currency(rec['potential_saving'])})",
-                                'potential_saving': rec['potential_saving']
-                            })
-                
-                return {
-                    'narrative': full_narrative,
-                    'intent': intent,
-                    'question': question,
-                    'recommendations': recommendations,
-                    'supporting_data': supporting_data,
-                    'generated_at': datetime.now(timezone.utc).isoformat()
-                }
+            full_narrative = ' '.join(narrative_parts)
+        
+        # Add specific recommendations based on intent
+        recommendations = []
+        if intent == 'cost_reduction' and 'optimization' in supporting_data:
+            opt = supporting_data['optimization']
+            for rec in opt['recommendations'][:5]:
+                if rec['action'] in ['ORDER_NOW', 'REDUCE_STOCK']:
+                    recommendations.append({
+                        'action': rec['action'],
+                        'sku': rec['sku'],
+                        'description': f"{rec['action'].replace('_', ' ').title()}: {rec['sku']} (Save {self._format_currency(rec['potential_saving'])})",
+                        'potential_saving': rec['potential_saving']
+                    })
+        
+        return {
+            'narrative': full_narrative,
+            'intent': intent,
+            'question': question,
+            'recommendations': recommendations,
+            'supporting_data': supporting_data,
+            'generated_at': datetime.now(timezone.utc).isoformat()
+        }
@@ -17,7 +17,6 @@ Architecture:
 - Narrator Agent: Explains impact in business-friendly language
 """
 from typing import Dict, List, Any, Optional, Tuple
-import json
 import re
 from datetime import datetime, timezone
 
@@ -31,6 +30,7 @@ except ImportError:
     AUTOGEN_AVAILABLE = False
 
 # Import existing services
+from backend.services.optimizer.lp_model import LP_DEFAULTS
 from backend.services.optimizer.ortools_optimizer import ORToolsOptimizer
 from backend.services.optimizer.inventory import InventoryOptimizer
 
@@ -46,7 +46,13 @@ class OptiGuideInventoryAgent:
     - "How would costs change if holding costs doubled?"
     """
     
-    def __init__(self, backend, llm_config: Optional[Dict] = None):
+    def __init__(
+        self,
+        backend,
+        llm_config: Optional[Dict] = None,
+        ortools_optimizer: Optional[ORToolsOptimizer] = None,
+        simple_optimizer: Optional[InventoryOptimizer] = None,
+    ):
         """
         Initialize OptiGuide agent with database backend and LLM config.
         
@@ -54,11 +60,13 @@ class OptiGuideInventoryAgent:
             backend: PostgreSQL backend connection
             llm_config: Optional LLM configuration for AutoGen agents
                        Example: {"model": "gpt-4", "api_key": "..."}
+            ortools_optimizer: Shared LP optimizer (created when omitted)
+            simple_optimizer: Shared EOQ optimizer (created when omitted)
         """
         self.backend = backend
         self.llm_config = llm_config
-        self.ortools_optimizer = ORToolsOptimizer(backend)
-        self.simple_optimizer = InventoryOptimizer(backend)
+        self.ortools_optimizer = ortools_optimizer or ORToolsOptimizer(backend)
+        self.simple_optimizer = simple_optimizer or InventoryOptimizer(backend)
         
         # Initialize agents if AutoGen is available
         if AUTOGEN_AVAILABLE and llm_config:
@@ -222,11 +230,7 @@ Generate Python dictionary to modify parameters based on this question.
                 }
             
             # Step 4: Run optimization with modifications
-            modified_result = self._run_modified_optimization(
-                tenant_id, 
-                original_result, 
-                modifications
-            )
+            modified_result = await self._run_modified_optimization(tenant_id, modifications)
             
             # Step 5: Analyze results
             analysis = self._analyze_results(original_result, modified_result, modifications)
@@ -250,6 +254,10 @@ Generate Python dictionary to modify parameters based on this question.
                 "question": question
             }
     
+    def question_params(self, question: str) -> Dict[str, Any]:
+        """Normalized parameters a what-if answer depends on (for answer caching)"""
+        return {"modifications": self._parse_question_to_modifications(question)}
+    
     def _parse_question_to_modifications(self, question: str) -> Dict[str, Any]:
         """
         Parse natural language question into parameter modifications.
@@ -334,37 +342,39 @@ Generate Python dictionary to modify parameters based on this question.
         
         return True
     
-    def _run_modified_optimization(
+    def _modified_constraints(self, modifications: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate what-if modifications into LP parameters (relative to LP_DEFAULTS)"""
+        constraints = {}
+        if 'order_cost_multiplier' in modifications:
+            constraints['order_cost'] = LP_DEFAULTS['order_cost'] * modifications['order_cost_multiplier']
+        if 'holding_cost_multiplier' in modifications:
+            constraints['holding_cost_rate'] = LP_DEFAULTS['holding_cost_rate'] * modifications['holding_cost_multiplier']
+        if 'stockout_cost_multiplier' in modifications:
+            constraints['stockout_cost_multiplier'] = LP_DEFAULTS['stockout_cost_multiplier'] * modifications['stockout_cost_multiplier']
+        if 'service_level' in modifications:
+            constraints['service_level'] = modifications['service_level']
+        if 'budget_constraint' in modifications:
+            constraints['budget_limit'] = modifications['budget_constraint']
+        if 'capacity_constraint' in modifications:
+            constraints['capacity_limit'] = modifications['capacity_constraint']
+        return constraints
+    
+    async def _run_modified_optimization(
         self, 
         tenant_id: str, 
-        original_result: Dict,
         modifications: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Run optimization with modified parameters.
         
-        This simulates what OptiGuide does: modify the optimization code
-        and re-run the solver with new constraints.
+        This is what OptiGuide does: change the optimization inputs and
+        re-solve. The tenant's LP is kept between calls, so only its
+        coefficients and bounds change and GLOP warm-starts.
         """
-        # For now, create a modified version of the optimization
-        # In production, this would actually modify OR-Tools constraints
-        
-        # Apply multipliers to costs
-        modified_result = json.loads(json.dumps(original_result))  # Deep copy
-        
-        cost_multiplier = 1.0
-        if 'order_cost_multiplier' in modifications:
-            cost_multiplier *= modifications['order_cost_multiplier']
-        if 'holding_cost_multiplier' in modifications:
-            cost_multiplier *= modifications['holding_cost_multiplier']
-        
-        # Adjust objective value
-        if 'objective_value' in modified_result:
-            modified_result['objective_value'] *= cost_multiplier
-        
-        # Adjust savings
-        if 'total_potential_savings' in modified_result:
-            modified_result['total_potential_savings'] *= cost_multiplier
+        modified_result = await self.ortools_optimizer.solve_what_if(
+            tenant_id,
+            self._modified_constraints(modifications)
+        )
         
         # Mark as modified
         modified_result['_modified'] = True
@@ -0,0 +1,151 @@
+"""
+Coach Registry
+Process-wide service agents and compiled coach workflows shared across requests
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from backend.services.elt_pipeline import ELTPipeline
+from backend.services.forecaster.service import ForecastService
+from backend.services.lazy_services import get_lazy_services
+from backend.services.optimizer.inventory import InventoryOptimizer
+
+
+def llm_config_key(llm_config: Optional[Dict[str, Any]]) -> str:
+    """Stable digest of an LLM config (the API key never becomes a dict key)"""
+    payload = json.dumps(llm_config or {}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CoachRegistry:
+    """
+    Shared coach services for one backend
+
+    The forecaster, optimizers and ELT pipeline hold no per-request
+    state, so one instance of each serves every request. OptiGuide agents
+    and LangGraph coaches depend on the caller's LLM config and are kept
+    per config digest in small LRUs; a coach's workflow graph is compiled
+    once, when the coach is first built.
+    """
+
+    def __init__(self, backend, max_coaches: Optional[int] = None):
+        """
+        Args:
+            backend: PostgreSQL backend shared by every service
+            max_coaches: Coaches (and OptiGuide agents) kept per distinct
+                LLM config (env COACH_REGISTRY_SIZE)
+        """
+        self.backend = backend
+        self.max_coaches = max_coaches or int(os.getenv("COACH_REGISTRY_SIZE", "8"))
+        self._services: Dict[str, Any] = {}
+        self._optiguides: "OrderedDict[str, Any]" = OrderedDict()
+        self._coaches: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.coaches_built = 0
+
+    def _service(self, name: str, factory: Callable[[], Any]) -> Any:
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._services[name] = factory()
+        return service
+
+    @property
+    def elt_pipeline(self) -> ELTPipeline:
+        return self._service('elt_pipeline', lambda: ELTPipeline(self.backend))
+
+    @property
+    def forecaster(self):
+        """ProphetForecaster when Prophet is installed, else ForecastService"""
+        def build():
+            services = get_lazy_services()
+            if services.available('prophet_forecaster'):
+                return services.symbol('prophet_forecaster', 'ProphetForecaster')(self.backend)
+            return ForecastService(self.backend)
+        return self._service('forecaster', build)
+
+    @property
+    def simple_optimizer(self) -> InventoryOptimizer:
+        return self._service('simple_optimizer', lambda: InventoryOptimizer(self.backend))
+
+    @property
+    def optimizer(self):
+        """ORToolsOptimizer when OR-Tools is installed, else the EOQ optimizer"""
+        def build():
+            services = get_lazy_services()
+            if services.available('ortools_optimizer'):
+                return services.symbol('ortools_optimizer', 'ORToolsOptimizer')(self.backend)
+            return self.simple_optimizer
+        return self._service('optimizer', build)
+
+    @property
+    def memory(self):
+        """Conversation memory with the process's embedder (see get_embedder)"""
+        def build():
+            from backend.services.coach.memory import ConversationMemory
+            return ConversationMemory(self.backend)
+        return self._service('memory', build)
+
+    def _per_config(self, cache: "OrderedDict[str, Any]", llm_config: Optional[Dict[str, Any]], factory: Callable[[], Any]) -> Any:
+        key = llm_config_key(llm_config)
+        with self._lock:
+            entry = cache.get(key)
+            if entry is None:
+                entry = cache[key] = factory()
+            cache.move_to_end(key)
+            while len(cache) > self.max_coaches:
+                cache.popitem(last=False)
+            return entry
+
+    def optiguide(self, llm_config: Optional[Dict[str, Any]] = None):
+        """OptiGuide agent for this LLM config, sharing the registry's optimizers"""
+        OptiGuideInventoryAgent = get_lazy_services().symbol('optiguide_agent', 'OptiGuideInventoryAgent')
+
+        return self._per_config(self._optiguides, llm_config, lambda: OptiGuideInventoryAgent(
+            self.backend, llm_config,
+            ortools_optimizer=self.optimizer, simple_optimizer=self.simple_optimizer,
+        ))
+
+    def coach(self, llm_config: Optional[Dict[str, Any]] = None):
+        """
+        Compiled LangGraph coach for this LLM config
+
+        Raises:
+            ImportError: LangGraph / LangChain are not installed
+        """
+        LangGraphInventoryCoach = get_lazy_services().symbol('langgraph_coach', 'LangGraphInventoryCoach')
+
+        def build():
+            self.coaches_built += 1
+            return LangGraphInventoryCoach(self.backend, llm_config, services=self)
+        return self._per_config(self._coaches, llm_config, build)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'services': sorted(self._services),
+                'optiguide_agents': len(self._optiguides),
+                'coaches': len(self._coaches),
+                'coaches_built': self.coaches_built,
+                'max_coaches': self.max_coaches,
+            }
+
+
+_registry: Optional[CoachRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_coach_registry(backend) -> CoachRegistry:
+    """Process-wide registry for the given backend (rebuilt if the backend changes)"""
+    global _registry
+    if _registry is None or _registry.backend is not backend:
+        with _registry_lock:
+            if _registry is None or _registry.backend is not backend:
+                _registry = CoachRegistry(backend)
+    return _registry
@@ -0,0 +1,144 @@
+"""
+Marketplace Catalog Index
+Connector catalog indexed once for faceted browsing and substring search over pre-serialized entries
+"""
+import hashlib
+import json
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.caching import TTLCache
+
+TIERS = ["free", "standard", "premium", "enterprise"]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _dumps(value: Any) -> bytes:
+    # Same form as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _facet(value: Any) -> Optional[str]:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _grams(text: str, n: int) -> Iterable[str]:
+    return (text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class CatalogIndex:
+    """
+    Immutable index over a connector catalog
+
+    Category and tier facets are bitmaps (Python ints, bit i = item i), so a
+    filter is one AND. Search matches a case-insensitive substring of the
+    display name and description: queries of up to three characters are a
+    single n-gram bitmap lookup; longer queries AND their trigram bitmaps
+    and confirm the few candidates with a substring test. Each entry is
+    serialized once, and responses for every facet combination are
+    serialized when the index is built.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], search_cache_size: int = 256):
+        """
+        Args:
+            items: Catalog entries (marketplace package or DEFAULT_CATALOG)
+            search_cache_size: Serialized search responses kept
+        """
+        self.items = list(items)
+        self._entries = [_dumps(item) for item in self.items]
+        self._texts: List[str] = []
+        self._categories: Dict[str, int] = {}
+        self._tiers: Dict[str, int] = {}
+        self._grams: Dict[str, int] = {}
+        for i, item in enumerate(self.items):
+            bit = 1 << i
+            category, tier = _facet(item.get("category")), _facet(item.get("tier"))
+            if category is not None:
+                self._categories[category] = self._categories.get(category, 0) | bit
+            if tier is not None:
+                self._tiers[tier] = self._tiers.get(tier, 0) | bit
+            name = item.get("displayName") or item.get("display_name") or ""
+            text = f"{name} {item.get('description') or ''}".lower()
+            self._texts.append(text)
+            for n in (1, 2, 3):
+                for gram in set(_grams(text, n)):
+                    self._grams[gram] = self._grams.get(gram, 0) | bit
+        self._all = (1 << len(self.items)) - 1
+        self.categories = sorted(self._categories)
+        self.fingerprint = hashlib.blake2b(b"\x1e".join(self._entries), digest_size=12).hexdigest()
+
+        self._searches = TTLCache(search_cache_size)
+        self._facets: Dict[Tuple[Optional[str], Optional[str]], bytes] = {
+            (category, tier): self._serialize(self._facet_mask(category, tier))
+            for category in [None, *self.categories]
+            for tier in [None, *TIERS, *[t for t in self._tiers if t not in TIERS]]
+        }
+
+    def _facet_mask(self, category: Optional[str], tier: Optional[str]) -> int:
+        mask = self._all
+        if category:
+            mask &= self._categories.get(category, 0)
+        if tier:
+            mask &= self._tiers.get(tier, 0)
+        return mask
+
+    def _search_mask(self, query: str) -> int:
+        if len(query) <= 3:
+            return self._grams.get(query, 0)
+        mask = self._all
+        for gram in set(_grams(query, 3)):
+            mask &= self._grams.get(gram, 0)
+            if not mask:
+                return 0
+        confirmed = 0
+        for i in self._positions(mask):
+            if query in self._texts[i]:
+                confirmed |= 1 << i
+        return confirmed
+
+    @staticmethod
+    def _positions(mask: int) -> Iterable[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _serialize(self, mask: int) -> bytes:
+        positions = list(self._positions(mask))
+        return b"".join([
+            b'{"connectors":[', b",".join(self._entries[i] for i in positions),
+            b'],"total":', str(len(positions)).encode("ascii"),
+            b',"categories":', _dumps(self.categories),
+            b',"tiers":', _dumps(TIERS), b"}",
+        ])
+
+    def ids(self, category: Optional[str] = None, tier: Optional[str] = None, search: Optional[str] = None) -> List[str]:
+        """Ids of matching entries in catalog order"""
+        mask = self._facet_mask(category, tier)
+        if search:
+            mask &= self._search_mask(search.lower())
+        return [self.items[i].get("id") for i in self._positions(mask)]
+
+    def response(self, category: Optional[str] = None, tier: Optional[str] = None, search: Optional[str] = None) -> bytes:
+        """
+        Serialized {connectors, total, categories, tiers} body
+
+        Facet-only requests are precomputed; search responses are kept in a
+        bounded LRU.
+        """
+        if not search:
+            body = self._facets.get((category or None, tier or None))
+            return body if body is not None else self._serialize(self._facet_mask(category, tier))
+        key = (category or None, tier or None, search.lower())
+        body = self._searches.get(key)
+        if body is not None:
+            return body
+        body = self._serialize(self._facet_mask(category, tier) & self._search_mask(key[2]))
+        self._searches.put(key, body)
+        return body
@@ -0,0 +1,537 @@
+"""
+Marketplace Catalog Data
+Built-in connector catalog, served when the marketplace package is unavailable
+"""
+from typing import Any, Dict, List
+
+DEFAULT_CATALOG: List[Dict[str, Any]] = [
+    {
+        "id": "csv_upload",
+        "name": "csv_upload",
+        "display_name": "CSV/Excel Upload",
+        "category": "storage",
+        "description": "Upload spreadsheet data to get started quickly.",
+        "icon": "FileSpreadsheet",
+        "data_types": ["orders", "inventory", "customers"],
+        "auth_type": "none",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "global",
+        "documentation_url": None,
+        "setup_complexity": "low",
+        "sync_realtime": False,
+        "supports_mcp": True,
+        "features": ["Simple upload", "URL fetch"],
+        "limitations": ["Manual updates unless URL is provided"],
+        "config_fields": [],
+    },
+    {
+        "id": "salesforce",
+        "name": "salesforce",
+        "display_name": "Salesforce",
+        "category": "crm",
+        "description": "World's #1 CRM. Sync leads, opportunities, accounts, and sales pipeline data.",
+        "icon": "Users",
+        "data_types": ["contacts", "deals", "customers", "analytics"],
+        "auth_type": "oauth2",
+        "tier": "premium",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "medium",
+        "sync_realtime": True,
+        "supports_mcp": True,
+        "features": ["Lead tracking", "Sales forecasting", "Account management"],
+        "limitations": ["API rate limits apply"],
+        "config_fields": [
+            {
+                "name": "connection_name",
+                "label": "Connection Name",
+                "type": "text",
+                "required": True,
+                "placeholder": "e.g., Production Salesforce, Sales Team CRM",
+                "helper": "A friendly name to identify this connection"
+            },
+            {
+                "name": "instance_url",
+                "label": "Salesforce Instance URL",
+                "type": "text",
+                "required": True,
+                "placeholder": "https://yourcompany.my.salesforce.com",
+                "helper": "Your Salesforce instance URL (including https://)"
+            },
+            {
+                "name": "username",
+                "label": "Username",
+                "type": "text",
+                "required": True,
+                "placeholder": "user@company.com",
+                "helper": "Your Salesforce username (email)"
+            },
+            {
+                "name": "password",
+                "label": "Password",
+                "type": "password",
+                "required": True,
+                "placeholder": "Enter your Salesforce password",
+                "helper": "Your Salesforce password"
+            },
+            {
+                "name": "security_token",
+                "label": "Security Token",
+                "type": "password",
+                "required": True,
+                "placeholder": "Security token from email",
+                "helper": "Reset your security token in Salesforce: Setup → Personal Setup → My Personal Information → Reset Security Token"
+            },
+            {
+                "name": "client_id",
+                "label": "Consumer Key (Client ID)",
+                "type": "text",
+                "required": True,
+                "placeholder": "3MVG9...",
+                "helper": "From your Salesforce Connected App"
+            },
+            {
+                "name": "client_secret",
+                "label": "Consumer Secret (Client Secret)",
+                "type": "password",
+                "required": True,
+                "placeholder": "Enter consumer secret",
+                "helper": "From your Salesforce Connected App"
+            }
+        ],
+    },
+    {
+        "id": "shopify",
+        "name": "shopify",
+        "display_name": "Shopify",
+        "category": "ecommerce",
+        "description": "Connect your Shopify store to sync orders, inventory, products, and customers.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "inventory", "customers", "products", "sales"],
+        "auth_type": "oauth2",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": True,
+        "supports_mcp": False,
+        "features": ["Real-time sync", "Multi-location", "Customer profiles"],
+        "limitations": ["API rate limit: 2 req/sec"],
+        "config_fields": [],
+    },
+    {
+        "id": "quickbooks",
+        "name": "quickbooks",
+        "display_name": "QuickBooks Online",
+        "category": "finance",
+        "description": "Sync invoices, expenses, customers, and financial data from QuickBooks.",
+        "icon": "FileText",
+        "data_types": ["invoices", "expenses", "customers", "payments"],
+        "auth_type": "oauth2",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Invoice sync", "Expense tracking", "Financial reports"],
+        "limitations": [],
+        "config_fields": [],
+    },
+    {
+        "id": "stripe",
+        "name": "stripe",
+        "display_name": "Stripe",
+        "category": "finance",
+        "description": "Accept payments and manage subscriptions. Sync charges, payouts, customers.",
+        "icon": "CreditCard",
+        "data_types": ["payments", "payouts", "customers", "subscriptions"],
+        "auth_type": "api_key",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Charges", "Payouts", "Customers"],
+        "limitations": [],
+        "config_fields": [
+            {
+                "name": "api_key",
+                "label": "Secret API Key",
+                "type": "password",
+                "required": True,
+                "placeholder": "sk_live_...",
+                "helper": "Create a restricted API key in your Stripe Dashboard"
+            }
+        ],
+    },
+    {
+        "id": "hubspot",
+        "name": "hubspot",
+        "display_name": "HubSpot",
+        "category": "crm",
+        "description": "Popular CRM for SMB. Sync contacts, companies, deals, and activities.",
+        "icon": "Users",
+        "data_types": ["contacts", "companies", "deals", "activities"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Contacts", "Deals", "Companies"],
+        "limitations": [],
+        "config_fields": [
+            {
+                "name": "private_app_token",
+                "label": "Private App Token",
+                "type": "password",
+                "required": True,
+                "placeholder": "pat-xxx-...",
+                "helper": "Create a Private App token in HubSpot and paste it here"
+            }
+        ],
+    },
+    {
+        "id": "woocommerce",
+        "name": "woocommerce",
+        "display_name": "WooCommerce",
+        "category": "ecommerce",
+        "description": "Connect your WooCommerce store. Sync orders, products, customers, inventory.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "products", "customers", "inventory"],
+        "auth_type": "api_key",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Products", "Customers"],
+        "limitations": ["Requires REST API enabled on site"],
+        "config_fields": [
+            {
+                "name": "site_url",
+                "label": "Site URL",
+                "type": "text",
+                "required": True,
+                "placeholder": "https://shop.example.com",
+                "helper": "Your WooCommerce site base URL"
+            },
+            {
+                "name": "consumer_key",
+                "label": "Consumer Key",
+                "type": "text",
+                "required": True,
+                "placeholder": "ck_...",
+                "helper": "Generate keys in WooCommerce → Settings → Advanced → REST API"
+            },
+            {
+                "name": "consumer_secret",
+                "label": "Consumer Secret",
+                "type": "password",
+                "required": True,
+                "placeholder": "cs_...",
+                "helper": "Generate keys in WooCommerce → Settings → Advanced → REST API"
+            }
+        ],
+    },
+    {
+        "id": "square",
+        "name": "square",
+        "display_name": "Square POS",
+        "category": "pos",
+        "description": "Modern point-of-sale system. Sync transactions, inventory, and customer data.",
+        "icon": "CreditCard",
+        "data_types": ["sales", "inventory", "customers", "payments"],
+        "auth_type": "oauth2",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "US, CA, UK",
+        "setup_complexity": "easy",
+        "sync_realtime": True,
+        "features": ["Transaction tracking", "Inventory management", "Customer profiles"],
+        "limitations": [],
+        "config_fields": [],
+    },
+    {
+        "id": "xero",
+        "name": "xero",
+        "display_name": "Xero Accounting",
+        "category": "finance",
+        "description": "UK-favourite accounting. Sync invoices, payments, contacts, chart of accounts.",
+        "icon": "FileText",
+        "data_types": ["invoices", "expenses", "contacts", "payments"],
+        "auth_type": "oauth2",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "UK, AU, NZ",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Invoices", "Contacts", "Bank reconciliation"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "client_id", "label": "Client ID", "type": "text", "required": True},
+            {"name": "client_secret", "label": "Client Secret", "type": "password", "required": True},
+            {"name": "tenant_id", "label": "Tenant ID (optional)", "type": "text", "required": False}
+        ],
+    },
+    {
+        "id": "sage_business_cloud",
+        "name": "sage_business_cloud",
+        "display_name": "Sage Business Cloud Accounting",
+        "category": "finance",
+        "description": "Accounting for UK SMBs. Sync invoices, products, and contacts.",
+        "icon": "FileText",
+        "data_types": ["invoices", "products", "contacts"],
+        "auth_type": "token",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "UK",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Invoices", "Products", "Contacts"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_token", "label": "API Token", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "zettle",
+        "name": "zettle",
+        "display_name": "Zettle by PayPal",
+        "category": "pos",
+        "description": "Popular UK POS. Sync sales, products and inventory.",
+        "icon": "CreditCard",
+        "data_types": ["sales", "products", "inventory"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "UK, EU",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Sales", "Products", "Inventory"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "access_token", "label": "Access Token", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "lightspeed",
+        "name": "lightspeed",
+        "display_name": "Lightspeed POS",
+        "category": "pos",
+        "description": "Retail/restaurant POS. Sync sales, products, and stock.",
+        "icon": "CreditCard",
+        "data_types": ["sales", "products", "inventory"],
+        "auth_type": "oauth2",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Sales", "Products", "Stock"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "client_id", "label": "Client ID", "type": "text", "required": True},
+            {"name": "client_secret", "label": "Client Secret", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "deliveroo",
+        "name": "deliveroo",
+        "display_name": "Deliveroo",
+        "category": "restaurants",
+        "description": "Delivery platform. Sync orders and payouts.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "payouts"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": False,
+        "region": "UK",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Payouts"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_key", "label": "API Key", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "uber_eats",
+        "name": "uber_eats",
+        "display_name": "Uber Eats",
+        "category": "restaurants",
+        "description": "Food delivery. Sync orders and payments.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "payments"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": False,
+        "region": "UK",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Payments"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_key", "label": "API Key", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "just_eat",
+        "name": "just_eat",
+        "display_name": "Just Eat",
+        "category": "restaurants",
+        "description": "UK takeaway platform. Sync orders and payouts.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "payouts"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": False,
+        "region": "UK",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Payouts"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_key", "label": "API Key", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "bigcommerce",
+        "name": "bigcommerce",
+        "display_name": "BigCommerce",
+        "category": "ecommerce",
+        "description": "E-commerce platform. Sync orders, products, customers.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "products", "customers"],
+        "auth_type": "oauth2",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Products", "Customers"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "client_id", "label": "Client ID", "type": "text", "required": True},
+            {"name": "client_secret", "label": "Client Secret", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "ebay",
+        "name": "ebay",
+        "display_name": "eBay Seller",
+        "category": "ecommerce",
+        "description": "Sell on eBay. Sync orders, listings, and payouts.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "listings", "payouts"],
+        "auth_type": "oauth2",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Listings", "Payouts"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "client_id", "label": "Client ID", "type": "text", "required": True},
+            {"name": "client_secret", "label": "Client Secret", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "amazon_seller",
+        "name": "amazon_seller",
+        "display_name": "Amazon Seller Central",
+        "category": "ecommerce",
+        "description": "Marketplace sales. Sync orders, listings, and settlements.",
+        "icon": "ShoppingCart",
+        "data_types": ["orders", "listings", "settlements"],
+        "auth_type": "token",
+        "tier": "standard",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "medium",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Orders", "Listings", "Settlements"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "refresh_token", "label": "Refresh Token", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "mailchimp",
+        "name": "mailchimp",
+        "display_name": "Mailchimp",
+        "category": "marketing",
+        "description": "Email marketing. Sync audiences and campaign metrics.",
+        "icon": "Mail",
+        "data_types": ["audiences", "campaigns", "metrics"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Audiences", "Campaigns", "Metrics"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_key", "label": "API Key", "type": "password", "required": True}
+        ],
+    },
+    {
+        "id": "pipedrive",
+        "name": "pipedrive",
+        "display_name": "Pipedrive",
+        "category": "crm",
+        "description": "SMB CRM. Sync contacts, deals, organizations.",
+        "icon": "Users",
+        "data_types": ["contacts", "deals", "organizations"],
+        "auth_type": "token",
+        "tier": "free",
+        "popular": True,
+        "verified": True,
+        "region": "Global",
+        "setup_complexity": "easy",
+        "sync_realtime": False,
+        "supports_mcp": False,
+        "features": ["Contacts", "Deals", "Organizations"],
+        "limitations": [],
+        "config_fields": [
+            {"name": "api_token", "label": "API Token", "type": "password", "required": True}
+        ],
+    },
+]
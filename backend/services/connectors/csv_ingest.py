@@ -0,0 +1,301 @@
+"""
+Streaming CSV Ingestion
+Bulk-loads every row of an uploaded CSV into raw_connector_rows via COPY
+"""
+import codecs
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from backend.utils.database import get_backend
+
+
+# Rows kept inline in raw_connector_data for previews
+SAMPLE_ROW_COUNT = 3
+
+# Bytes handed to COPY per read() call
+COPY_BUFFER_SIZE = 1 << 16
+
+# Progress is reported every N rows
+PROGRESS_EVERY_ROWS = 5000
+
+ROW_COLUMNS = "(raw_id, tenant_id, source_id, row_num, data)"
+
+
+class UploadProgress:
+    """
+    Running and recent CSV uploads, tracked in csv_uploads
+
+    Every update commits on a connection of its own, outside the upload's
+    transaction, so any API process can report on an upload that another
+    one is still staging.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: Sync database backend (defaults to the shared pool)
+        """
+        self._backend = backend
+
+    def _execute(self, sql: str, params: List[Any]) -> Optional[tuple]:
+        backend = self._backend or get_backend()
+        with backend.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                row = cur.fetchone() if cur.description else None
+            conn.commit()
+        return row
+
+    def start(
+        self,
+        upload_id: str,
+        tenant_id: str,
+        total_bytes: Optional[int] = None,
+        filename: Optional[str] = None,
+        connector_id: Optional[str] = None,
+    ) -> None:
+        self._execute(
+            """
+            INSERT INTO csv_uploads (upload_id, tenant_id, connector_id, filename, total_bytes)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (upload_id) DO UPDATE
+               SET tenant_id = EXCLUDED.tenant_id, connector_id = EXCLUDED.connector_id,
+                   filename = EXCLUDED.filename, total_bytes = EXCLUDED.total_bytes,
+                   status = 'running', bytes_read = 0, rows = 0, error = NULL,
+                   started_at = NOW(), finished_at = NULL
+            """,
+            [upload_id, tenant_id, connector_id, filename, total_bytes],
+        )
+
+    def update(self, upload_id: str, bytes_read: int, rows: int) -> None:
+        self._execute(
+            "UPDATE csv_uploads SET bytes_read = %s, rows = %s WHERE upload_id = %s",
+            [bytes_read, rows, upload_id],
+        )
+
+    def finish(
+        self,
+        upload_id: str,
+        error: Optional[str] = None,
+        bytes_read: Optional[int] = None,
+        rows: Optional[int] = None,
+    ) -> None:
+        self._execute(
+            """
+            UPDATE csv_uploads
+               SET status = %s, error = %s, finished_at = NOW(),
+                   bytes_read = COALESCE(%s, bytes_read), rows = COALESCE(%s, rows)
+             WHERE upload_id = %s
+            """,
+            ["failed" if error else "completed", error, bytes_read, rows, upload_id],
+        )
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(
+            """
+            SELECT upload_id, tenant_id, connector_id, filename, status, bytes_read,
+                   total_bytes, rows, started_at, finished_at, error
+              FROM csv_uploads WHERE upload_id = %s
+            """,
+            [upload_id],
+        )
+        if row is None:
+            return None
+        keys = ("upload_id", "tenant_id", "connector_id", "filename", "status", "bytes_read",
+                "total_bytes", "rows", "started_at", "finished_at", "error")
+        snapshot = dict(zip(keys, row))
+        for key in ("tenant_id", "connector_id"):
+            snapshot[key] = str(snapshot[key]) if snapshot[key] is not None else None
+        for key in ("started_at", "finished_at"):
+            snapshot[key] = snapshot[key].isoformat() if snapshot[key] is not None else None
+        total = snapshot["total_bytes"]
+        if total:
+            snapshot["percent"] = round(min(100.0, snapshot["bytes_read"] * 100.0 / total), 1)
+        else:
+            snapshot["percent"] = 100.0 if snapshot["status"] == "completed" else None
+        return snapshot
+
+
+upload_progress = UploadProgress()
+
+
+def _copy_escape(value: str) -> str:
+    """Escape a value for COPY text format"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _CopyStream(io.RawIOBase):
+    """
+    File-like adapter that renders CSV rows as COPY text lines on demand.
+
+    COPY pulls from read() until EOF, so only one buffer's worth of rows
+    is ever held in memory regardless of file size.
+    """
+
+    def __init__(
+        self,
+        binary: BinaryIO,
+        raw_id: str,
+        tenant_id: str,
+        source_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self._binary = binary
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._prefix = "\t".join((raw_id, tenant_id, source_id))
+        self._on_progress = on_progress
+        self._buffer = b""
+        self._eof = False
+        self.rows = 0
+        self.bytes_read = 0
+        self.sample_rows: List[Dict[str, str]] = []
+        self._reader = csv.reader(self._lines())
+        self.headers: List[str] = [h.strip() for h in next(self._reader, [])]
+        self.on_record: Optional[Callable[[Dict[str, str]], None]] = None
+
+    def _lines(self):
+        pending = ""
+        while True:
+            chunk = self._binary.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            self.bytes_read += len(chunk)
+            pending += self._decoder.decode(chunk)
+            # Hold back a possibly partial trailing line
+            cut = max(pending.rfind("\n"), pending.rfind("\r")) + 1
+            if cut:
+                yield from io.StringIO(pending[:cut], newline="")
+                pending = pending[cut:]
+        pending += self._decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        size = len(target)
+        while len(self._buffer) < size and not self._eof:
+            self._buffer += self._render(size)
+        out, self._buffer = self._buffer[:size], self._buffer[size:]
+        target[:len(out)] = out
+        return len(out)
+
+    def _render(self, size: int) -> bytes:
+        lines = []
+        produced = 0
+        for values in self._reader:
+            if not values or not any(v.strip() for v in values):
+                continue
+            record = dict(zip(self.headers, values))
+            self.rows += 1
+            if len(self.sample_rows) < SAMPLE_ROW_COUNT:
+                self.sample_rows.append(record)
+            if self.on_record:
+                self.on_record(record)
+            line = f"{self._prefix}\t{self.rows}\t{_copy_escape(json.dumps(record))}\n"
+            lines.append(line)
+            produced += len(line)
+            if self._on_progress and self.rows % PROGRESS_EVERY_ROWS == 0:
+                self._on_progress(self.bytes_read, self.rows)
+            if produced >= size:
+                break
+        else:
+            self._eof = True
+        return "".join(lines).encode("utf-8")
+
+
+class CSVIngester:
+    """Streams CSV uploads into the row-level staging table"""
+
+    def __init__(self, progress: Optional[UploadProgress] = None):
+        self.progress = progress or upload_progress
+
+    def copy_rows(
+        self,
+        cur,
+        binary: BinaryIO,
+        raw_id: str,
+        tenant_id: str,
+        source_id: str,
+        upload_id: Optional[str] = None,
+        snapshots=None,
+    ) -> Dict[str, Any]:
+        """
+        COPY every CSV row into raw_connector_rows on the caller's transaction
+
+        Args:
+            cur: psycopg2 cursor (the caller commits)
+            binary: Binary file object positioned at the start of the CSV
+            raw_id: raw_connector_data row the staged rows belong to
+            tenant_id: Tenant identifier
+            source_id: data_sources identifier
+            upload_id: Optional key to report progress under
+            snapshots: Optional ColumnarDatasetStore to mirror the rows into
+                       in the same pass
+
+        Returns:
+            headers, record_count, bytes, sample_rows and snapshot (the
+            SnapshotWriter to commit once the transaction has, or None)
+        """
+        on_progress = None
+        if upload_id:
+            def on_progress(bytes_read: int, rows: int) -> None:
+                self.progress.update(upload_id, bytes_read=bytes_read, rows=rows)
+
+        stream = _CopyStream(binary, raw_id, tenant_id, source_id, on_progress)
+        if not stream.headers:
+            raise ValueError("CSV file has no header row")
+
+        snapshot = None
+        if snapshots is not None:
+            snapshot = snapshots.open_snapshot(tenant_id, source_id, stream.headers, raw_id)
+            stream.on_record = snapshot.add
+        try:
+            cur.copy_expert(
+                f"COPY raw_connector_rows {ROW_COLUMNS} FROM STDIN",
+                stream,
+                size=COPY_BUFFER_SIZE,
+            )
+        except BaseException:
+            if snapshot is not None:
+                snapshot.abort()
+            raise
+        if upload_id:
+            self.progress.update(upload_id, bytes_read=stream.bytes_read, rows=stream.rows)
+
+        return {
+            "headers": stream.headers,
+            "record_count": stream.rows,
+            "bytes": stream.bytes_read,
+            "sample_rows": stream.sample_rows,
+            "snapshot": snapshot,
+        }
+
+
+async def load_raw_rows(cur, raw_id: Any, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return every staged row for a raw_connector_data record
+
+    Falls back to the inline sample_rows for records ingested before
+    row-level staging existed.
+
+    Args:
+        cur: Async cursor from AsyncPostgresBackend/ThreadedAsyncBackend
+        raw_id: raw_connector_data.raw_id
+        raw_data: raw_connector_data.data payload
+    """
+    if not raw_data.get("staged_rows"):
+        return raw_data.get("sample_rows", [])
+    await cur.execute(
+        "SELECT data FROM raw_connector_rows WHERE raw_id = %s ORDER BY row_num",
+        [str(raw_id)],
+    )
+    return [r[0] for r in await cur.fetchall()]
@@ -0,0 +1,319 @@
+"""
+Columnar Dataset Store
+Parquet snapshots of connector datasets keyed by (tenant_id, source_id, dataset)
+"""
+import asyncio
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.services.connectors.csv_ingest import load_raw_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Rows buffered per Parquet row group while a snapshot is streamed in
+SNAPSHOT_ROW_GROUP = 65536
+
+INVENTORY_COLUMNS = ["sku", "product_name", "current_stock", "min_stock", "max_stock", "unit_cost", "location"]
+INVENTORY_NUMERIC = ("current_stock", "min_stock", "max_stock", "unit_cost")
+DEMAND_COLUMNS = ["sku", "week", "quantity"]
+DEMAND_NUMERIC = ("week", "quantity")
+
+# Columns stored as numbers in each dataset's snapshot; the rest are text
+DATASET_NUMERIC = {"inventory": INVENTORY_NUMERIC, "demand": DEMAND_NUMERIC}
+
+
+def classify_dataset(headers: Iterable[str]) -> str:
+    """Name the dataset a CSV upload holds, based on its columns"""
+    columns = {h.strip().lower() for h in headers}
+    if "current_stock" in columns:
+        return "inventory"
+    if "quantity" in columns and "week" in columns:
+        return "demand"
+    return "data"
+
+
+class ColumnarDatasetStore:
+    """
+    Parquet-on-disk dataset snapshots.
+
+    Layout is ``<root>/<tenant_id>/<source_id>/<dataset>.parquet``; each
+    snapshot records the raw_connector_data.raw_id it was built from so
+    readers can tell when it is stale.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directory the snapshots live under
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not installed. Run: pip install pyarrow")
+        self.root = root
+
+    def path_for(self, tenant_id: str, source_id: str, dataset: str) -> str:
+        return os.path.join(self.root, str(tenant_id), str(source_id), f"{dataset}.parquet")
+
+    def open_snapshot(self, tenant_id: str, source_id: str, headers: Sequence[str], raw_id: str) -> "SnapshotWriter":
+        """
+        Start a snapshot that is fed row by row (see SnapshotWriter)
+
+        Args:
+            tenant_id: Tenant identifier
+            source_id: data_sources identifier
+            headers: CSV header row; also decides the dataset
+            raw_id: raw_connector_data row this snapshot mirrors
+        """
+        dataset = classify_dataset(headers)
+        return SnapshotWriter(self.path_for(tenant_id, source_id, dataset), headers, dataset, raw_id)
+
+    def snapshot_raw_id(self, tenant_id: str, source_id: str, dataset: str) -> Optional[str]:
+        """raw_id the current snapshot was built from, or None if there is none"""
+        path = self.path_for(tenant_id, source_id, dataset)
+        if not os.path.exists(path):
+            return None
+        metadata = pq.read_schema(path).metadata or {}
+        raw_id = metadata.get(b"raw_id")
+        return raw_id.decode() if raw_id else None
+
+    def read_table(
+        self,
+        tenant_id: str,
+        source_id: str,
+        dataset: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        raw_id: Optional[str] = None,
+    ) -> Optional["pa.Table"]:
+        """
+        Read a snapshot with column and predicate pushdown
+
+        Args:
+            tenant_id: Tenant identifier
+            source_id: data_sources identifier
+            dataset: Dataset name
+            columns: Columns to read; ones missing from the snapshot are skipped
+            filters: pyarrow predicates, e.g. [("sku", "=", "WIDGET-001")]
+            raw_id: If given, return None unless the snapshot mirrors this raw_id
+
+        Returns:
+            Arrow table, or None when there is no (current) snapshot
+        """
+        path = self.path_for(tenant_id, source_id, dataset)
+        if not os.path.exists(path):
+            return None
+        schema = pq.read_schema(path)
+        if raw_id is not None:
+            stored = (schema.metadata or {}).get(b"raw_id", b"").decode()
+            if stored != str(raw_id):
+                return None
+        if columns is not None:
+            columns = [c for c in columns if c in schema.names]
+        return pq.read_table(path, columns=columns, filters=filters or None)
+
+    def read_frame(self, *args, **kwargs) -> Optional[pd.DataFrame]:
+        """read_table() as a pandas DataFrame"""
+        table = self.read_table(*args, **kwargs)
+        return table.to_pandas() if table is not None else None
+
+    def read_arrays(self, *args, **kwargs) -> Optional[Dict[str, np.ndarray]]:
+        """read_table() as a dict of NumPy column arrays"""
+        table = self.read_table(*args, **kwargs)
+        if table is None:
+            return None
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    def drop_source(self, tenant_id: str, source_id: str) -> None:
+        """Remove every snapshot for a connector"""
+        shutil.rmtree(os.path.join(self.root, str(tenant_id), str(source_id)), ignore_errors=True)
+
+
+class SnapshotWriter:
+    """
+    Parquet snapshot written while an upload is staged, in the same pass
+
+    The dataset's numeric columns are stored as float64 (values that do
+    not parse become null, as readers would coerce them anyway) and the
+    rest as text, so types never need a second look at the file. Nothing
+    replaces the current snapshot until commit(); a failed write is logged
+    and abandoned, leaving readers on the staged rows.
+    """
+
+    def __init__(self, path: str, headers: Sequence[str], dataset: str, raw_id: str):
+        """
+        Args:
+            path: Snapshot path (see ColumnarDatasetStore.path_for)
+            headers: CSV header row
+            dataset: Dataset name (see classify_dataset)
+            raw_id: raw_connector_data row this snapshot mirrors
+        """
+        numeric = DATASET_NUMERIC.get(dataset, ())
+        self.path = path
+        self.dataset = dataset
+        self.rows = 0
+        self.failed = False
+        self._schema = pa.schema(
+            [(name, pa.float64() if name in numeric else pa.string()) for name in dict.fromkeys(headers)],
+            metadata={b"raw_id": str(raw_id).encode(), b"dataset": dataset.encode()},
+        )
+        self._buffer: Dict[str, List[Optional[str]]] = {name: [] for name in self._schema.names}
+        self._tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        self._writer = None
+
+    def add(self, record: Dict[str, str]) -> None:
+        """Buffer one CSV record; full buffers are written as a row group"""
+        if self.failed:
+            return
+        for name, values in self._buffer.items():
+            values.append(record.get(name))
+        if len(self._buffer[self._schema.names[0]]) >= SNAPSHOT_ROW_GROUP:
+            self._flush()
+
+    def commit(self) -> Optional[Dict[str, Any]]:
+        """
+        Write what is buffered and move the snapshot into place
+
+        Returns:
+            path, rows and column names, or None if the snapshot failed
+        """
+        self._flush(final=True)
+        if self.failed:
+            return None
+        os.replace(self._tmp_path, self.path)
+        return {"path": self.path, "rows": self.rows, "columns": self._schema.names}
+
+    def abort(self) -> None:
+        """Discard the partial snapshot; the current one stays in place"""
+        self.failed = True
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _flush(self, final: bool = False) -> None:
+        if self.failed:
+            return
+        try:
+            if self._writer is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._writer = pq.ParquetWriter(self._tmp_path, self._schema)
+            count = len(self._buffer[self._schema.names[0]]) if self._schema.names else 0
+            if count:
+                arrays = [self._array(field, self._buffer[field.name]) for field in self._schema]
+                self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+                self.rows += count
+            if final:
+                self._writer.close()
+                self._writer = None
+        except Exception as e:
+            print(f"[DATASET_STORE] Snapshot {self.path} failed: {e}")
+            self.abort()
+        finally:
+            for values in self._buffer.values():
+                values.clear()
+
+    @staticmethod
+    def _array(field: "pa.Field", values: List[Optional[str]]) -> "pa.Array":
+        if pa.types.is_floating(field.type):
+            numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype(float)
+            return pa.array(numbers, type=field.type, from_pandas=True)
+        return pa.array(values, type=field.type)
+
+
+_store: Optional[ColumnarDatasetStore] = None
+_store_lock = threading.Lock()
+
+
+def get_dataset_store() -> Optional[ColumnarDatasetStore]:
+    """Process-wide store under DATASET_STORE_DIR, or None without pyarrow"""
+    global _store
+    if not PYARROW_AVAILABLE:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ColumnarDatasetStore(os.getenv("DATASET_STORE_DIR", os.path.join("data", "datasets")))
+    return _store
+
+
+def demand_series_by_sku(frame: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    """Group a demand frame into {sku: [{week, quantity}, ...]} in file order"""
+    series: Dict[str, List[Dict[str, Any]]] = {}
+    for sku, group in frame.groupby("sku", sort=False):
+        series[sku] = [
+            {"week": int(week), "quantity": float(quantity)}
+            for week, quantity in zip(group["week"].to_numpy(), group["quantity"].to_numpy())
+        ]
+    return series
+
+
+def _normalize_frame(frame: pd.DataFrame, columns: Sequence[str], numeric: Sequence[str]) -> pd.DataFrame:
+    for column in columns:
+        if column not in frame.columns:
+            frame[column] = 0 if column in numeric else ""
+    frame = frame[list(columns)]
+    for column in columns:
+        if column in numeric:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0).astype(float)
+        else:
+            frame[column] = frame[column].fillna("").astype(str)
+    return frame
+
+
+async def load_dataset_frame(
+    cur,
+    tenant_id: str,
+    source_id: str,
+    raw_id: Any,
+    raw_data: Dict[str, Any],
+    dataset: str,
+    columns: Sequence[str],
+    numeric: Sequence[str] = (),
+    filters: Optional[List[Tuple[str, str, Any]]] = None,
+) -> pd.DataFrame:
+    """
+    Load only the needed columns of a connector dataset
+
+    Reads the Parquet snapshot when it mirrors raw_id and falls back to
+    the staged JSON rows otherwise. Numeric columns come back as float64
+    (missing values as 0), the rest as strings.
+
+    Args:
+        cur: Async cursor, used only for the JSON fallback
+        tenant_id: Tenant identifier
+        source_id: data_sources identifier
+        raw_id: raw_connector_data.raw_id the caller resolved
+        raw_data: raw_connector_data.data payload
+        dataset: Dataset name ('inventory', 'demand', ...)
+        columns: Columns to return
+        numeric: Subset of columns to coerce to float
+        filters: Equality predicates [(column, '=', value)] pushed into the read
+    """
+    store = get_dataset_store()
+    frame = None
+    if store is not None:
+        frame = await asyncio.to_thread(
+            store.read_frame, str(tenant_id), str(source_id), dataset,
+            columns=list(columns), filters=filters, raw_id=str(raw_id),
+        )
+    if frame is None:
+        frame = pd.DataFrame(await load_raw_rows(cur, raw_id, raw_data))
+        for column, _, value in filters or ():
+            if column in frame.columns:
+                frame = frame[frame[column].astype(str) == str(value)]
+    return _normalize_frame(frame.reset_index(drop=True), columns, numeric)
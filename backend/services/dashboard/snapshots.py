@@ -0,0 +1,367 @@
+"""
+Dashboard Snapshots
+Per-tenant dashboard aggregates materialized in tenant_dashboard_snapshots
+"""
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.database import as_async_backend
+
+# Sections of the snapshot row and the writes that make them stale:
+#   sources - connector create/update/delete/sync and CSV uploads
+#   goals   - goal create/update/delete
+#   metrics - ELT runs (business_metrics)
+SECTIONS = ("sources", "goals", "metrics")
+
+# Each statement recomputes one section and upserts it; other sections keep
+# their values (and freshness timestamps)
+REFRESH_SQL = {
+    "sources": """
+        INSERT INTO tenant_dashboard_snapshots
+        (tenant_id, order_records, inventory_records, customer_records, has_real_data, sources_refreshed_at, updated_at)
+        SELECT %s::uuid,
+               COALESCE(SUM(total) FILTER (WHERE data_types ? 'orders'), 0),
+               COALESCE(SUM(total) FILTER (WHERE data_types ? 'inventory'), 0),
+               COALESCE(SUM(total) FILTER (WHERE data_types ? 'customers'), 0),
+               COALESCE(BOOL_OR(total > 0), false),
+               NOW(), NOW()
+          FROM (SELECT COALESCE(extra_data->'data_types', '[]'::jsonb) AS data_types,
+                       COALESCE((extra_data->>'total_records')::int, 0) AS total
+                  FROM data_sources
+                 WHERE tenant_id = %s) s
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            order_records = EXCLUDED.order_records,
+            inventory_records = EXCLUDED.inventory_records,
+            customer_records = EXCLUDED.customer_records,
+            has_real_data = EXCLUDED.has_real_data,
+            sources_refreshed_at = EXCLUDED.sources_refreshed_at,
+            updated_at = EXCLUDED.updated_at
+    """,
+    "goals": """
+        INSERT INTO tenant_dashboard_snapshots
+        (tenant_id, active_goals, goal_progress, goals_refreshed_at, updated_at)
+        SELECT %s::uuid,
+               COALESCE(jsonb_agg(jsonb_build_object(
+                   'id', goal_id, 'title', title, 'category', COALESCE(category, 'custom'),
+                   'current', COALESCE(current_value, 0), 'target', COALESCE(target_value, 0)
+               ) ORDER BY created_at DESC), '[]'::jsonb),
+               COALESCE(AVG((current_value / NULLIF(target_value, 0)) * 100), 0)::int,
+               NOW(), NOW()
+          FROM smart_goals
+         WHERE tenant_id = %s AND status = 'active'
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            active_goals = EXCLUDED.active_goals,
+            goal_progress = EXCLUDED.goal_progress,
+            goals_refreshed_at = EXCLUDED.goals_refreshed_at,
+            updated_at = EXCLUDED.updated_at
+    """,
+    "metrics": """
+        INSERT INTO tenant_dashboard_snapshots
+        (tenant_id, revenue_growth, metrics_refreshed_at, updated_at)
+        SELECT %s::uuid,
+               (SELECT value FROM business_metrics
+                 WHERE tenant_id = %s AND metric_name = 'revenue_growth'
+                 ORDER BY timestamp DESC LIMIT 1),
+               NOW(), NOW()
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            revenue_growth = EXCLUDED.revenue_growth,
+            metrics_refreshed_at = EXCLUDED.metrics_refreshed_at,
+            updated_at = EXCLUDED.updated_at
+    """,
+}
+
+SNAPSHOT_COLUMNS = (
+    "order_records", "inventory_records", "customer_records", "has_real_data", "sources_refreshed_at",
+    "active_goals", "goal_progress", "goals_refreshed_at",
+    "revenue_growth", "metrics_refreshed_at",
+    "updated_at",
+)
+
+SNAPSHOT_SQL = f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM tenant_dashboard_snapshots WHERE tenant_id = %s"
+
+# Connector readiness cards, shaped in SQL as one jsonb array
+READINESS_SQL = """
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'connector_id', source_id::text,
+               'display_name', name,
+               'datasets', COALESCE(extra_data->'datasets', '[]'::jsonb),
+               'last_refreshed', last_sync,
+               'counts', COALESCE(extra_data->'last_record_count', '{}'::jsonb),
+               'total_records', COALESCE(extra_data->'total_records', '0'::jsonb)
+           ) ORDER BY created_at), '[]'::jsonb)
+      FROM data_sources
+     WHERE tenant_id = %s
+"""
+
+# Everything the home page shows in one statement; snapshot columns are NULL
+# when the tenant has no row yet
+DASHBOARD_SQL = f"""
+    SELECT {', '.join('s.' + column for column in SNAPSHOT_COLUMNS)}, ({READINESS_SQL})
+      FROM (SELECT 1) AS one
+      LEFT JOIN tenant_dashboard_snapshots s ON s.tenant_id = %s
+"""
+
+
+def _sections(sections: Iterable[str]) -> List[str]:
+    sections = list(sections)
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown snapshot sections: {sorted(unknown)}")
+    return sections
+
+
+def refresh_snapshot(cur, tenant_id: str, sections: Iterable[str] = SECTIONS) -> None:
+    """
+    Recompute snapshot sections on an open cursor
+
+    Run it in the transaction that wrote the data so the snapshot commits
+    (or rolls back) with it; the caller commits.
+    """
+    for section in _sections(sections):
+        cur.execute(REFRESH_SQL[section], [tenant_id, tenant_id])
+
+
+async def refresh_snapshot_async(cur, tenant_id: str, sections: Iterable[str] = SECTIONS) -> None:
+    """refresh_snapshot for an async cursor"""
+    for section in _sections(sections):
+        await cur.execute(REFRESH_SQL[section], [tenant_id, tenant_id])
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def fallback_snapshot() -> Dict[str, Any]:
+    """Snapshot rendering the demo dashboard, used when Postgres is unavailable"""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "order_records": 0, "inventory_records": 0, "customer_records": 0, "has_real_data": False,
+        "sources_refreshed_at": now,
+        "active_goals": [], "goal_progress": 72, "goals_refreshed_at": None,
+        "revenue_growth": None, "metrics_refreshed_at": None,
+        "updated_at": now,
+    }
+
+
+def snapshot_from_row(row: tuple) -> Dict[str, Any]:
+    """SNAPSHOT_SQL row as a dict (freshness timestamps as ISO strings)"""
+    snapshot = dict(zip(SNAPSHOT_COLUMNS, row))
+    if isinstance(snapshot["active_goals"], str):
+        snapshot["active_goals"] = json.loads(snapshot["active_goals"])
+    for column in SNAPSHOT_COLUMNS:
+        if column.endswith("_at"):
+            snapshot[column] = _timestamp(snapshot[column])
+    return snapshot
+
+
+def last_modified(snapshot: Dict[str, Any], *sections: str) -> Optional[str]:
+    """HTTP-date of the newest refresh among sections, for a Last-Modified header"""
+    stamps = [snapshot[f"{section}_refreshed_at"] for section in _sections(sections)]
+    stamps = [datetime.fromisoformat(stamp) for stamp in stamps if stamp]
+    return format_datetime(max(stamps), usegmt=True) if stamps else None
+
+
+class DashboardSnapshots:
+    """
+    Reads and refreshes tenant_dashboard_snapshots
+
+    Dashboard endpoints read one row by primary key; writers refresh only
+    the sections they touched. A tenant without a row is backfilled on the
+    first read.
+    """
+
+    def __init__(self, backend):
+        """
+        Args:
+            backend: PostgreSQL backend
+        """
+        self.backend = backend
+        self.async_backend = as_async_backend(backend)
+
+    def get(self, tenant_id: str) -> Dict[str, Any]:
+        """Snapshot of a tenant, computing it first if it was never materialized"""
+        with self.backend.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SNAPSHOT_SQL, [tenant_id])
+                row = cur.fetchone()
+                if row is None:
+                    refresh_snapshot(cur, tenant_id)
+                    cur.execute(SNAPSHOT_SQL, [tenant_id])
+                    row = cur.fetchone()
+            conn.commit()
+        return snapshot_from_row(row)
+
+    def refresh(self, tenant_id: str, sections: Iterable[str] = SECTIONS) -> None:
+        """Recompute sections in their own transaction"""
+        with self.backend.get_connection() as conn:
+            with conn.cursor() as cur:
+                refresh_snapshot(cur, tenant_id, sections)
+            conn.commit()
+
+    async def dashboard(self, tenant_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Snapshot and connector readiness in one round trip
+
+        Returns:
+            (snapshot, readiness connectors); a missing snapshot is
+            materialized on the same connection
+        """
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(DASHBOARD_SQL, [tenant_id, tenant_id])
+                row = await cur.fetchone()
+                if row[SNAPSHOT_COLUMNS.index("updated_at")] is None:
+                    await refresh_snapshot_async(cur, tenant_id)
+                    await cur.execute(DASHBOARD_SQL, [tenant_id, tenant_id])
+                    row = await cur.fetchone()
+            await conn.commit()
+        return snapshot_from_row(row[:-1]), row[-1]
+
+    async def refresh_async(self, tenant_id: str, sections: Iterable[str] = SECTIONS) -> None:
+        """refresh() on the async backend"""
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await refresh_snapshot_async(cur, tenant_id, sections)
+            await conn.commit()
+
+
+# --- Dashboard payloads rendered from a snapshot ---
+
+def health_score(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Health score scaled from record counts per data type"""
+    orders = snapshot["order_records"]
+    inventory = snapshot["inventory_records"]
+    customers = snapshot["customer_records"]
+    # Scale naive subscores: present data boosts corresponding area
+    revenue = min(100, 50 + min(50, orders // 100))
+    operations = min(100, 50 + min(50, inventory // 100))
+    customer = min(100, 50 + min(50, customers // 100))
+    score = round((revenue + operations + customer) / 3)
+    return {
+        "score": score,
+        "trend": 2 if score >= 60 else -1,
+        "breakdown": {
+            "revenue": revenue,
+            "operations": operations,
+            "customer": customer,
+            "revenue_available": orders > 0,
+            "operations_available": inventory > 0,
+            "customer_available": customers > 0,
+        },
+        "last_updated": snapshot["sources_refreshed_at"],
+        "period_days": 7,
+    }
+
+
+def metrics_snapshot(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Dashboard metric cards"""
+    current_score = snapshot["goal_progress"]
+    revenue_growth = snapshot["revenue_growth"] if snapshot["revenue_growth"] is not None else 4.2
+    # Count completed tasks (if we had tasks table; for now, hardcode)
+    tasks_completed = 27
+    return [
+        {
+            "id": "current_score",
+            "label": "Current Score",
+            "value": str(current_score),
+            "change": 4,
+            "changeType": "absolute",
+            "trend": "up" if current_score > 68 else "down",
+            "period": "last_7_days",
+        },
+        {
+            "id": "revenue_growth",
+            "label": "Revenue Growth",
+            "value": f"+{revenue_growth:.1f}%",
+            "change": revenue_growth,
+            "changeType": "percentage",
+            "trend": "up" if revenue_growth > 0 else "down",
+            "period": "vs_prev_7d",
+        },
+        {
+            "id": "tasks_completed",
+            "label": "Tasks Completed",
+            "value": str(tasks_completed),
+            "change": 17,
+            "changeType": "percentage",
+            "trend": "up",
+            "period": "last_7_days",
+        },
+    ]
+
+
+def data_source_summary(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Connected-data summary (BusinessContext.tsx DataSource shape)"""
+    return {
+        "orders": snapshot["order_records"],
+        "inventory": snapshot["inventory_records"],
+        "customers": snapshot["customer_records"],
+        "hasRealData": snapshot["has_real_data"],
+    }
+
+
+def _goal_progress(goal: Dict[str, Any]) -> float:
+    target = goal.get("target") or 0
+    return (goal.get("current", 0) / target * 100) if target > 0 else 0
+
+
+def health_alerts(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Alerts for active goals below 50% progress (a default alert when there are none)"""
+    alerts: List[Dict[str, Any]] = []
+    for goal in snapshot["active_goals"]:
+        progress = _goal_progress(goal)
+        if progress < 50:
+            alerts.append({
+                "id": f"alert-goal-{goal['id']}",
+                "type": "critical",
+                "title": f"Goal at risk: {goal['title']}",
+                "description": f"Only {progress:.0f}% progress toward target.",
+                "metric": goal.get("category", "custom"),
+                "value": f"{goal['current']} / {goal['target']}",
+                "threshold": "50% progress",
+            })
+    # Fallback minimal alert if none from goals
+    if not alerts:
+        alerts.append({
+            "id": "alert-low-ops",
+            "type": "critical",
+            "title": "Operational efficiency is low",
+            "description": "Order fulfillment times are trending above target.",
+            "metric": "operations",
+            "value": "SLA 92%",
+            "threshold": ">= 95%",
+        })
+    return alerts
+
+
+def health_signals(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Signals for active goals at 75% progress or more (a default signal when there are none)"""
+    signals: List[Dict[str, Any]] = []
+    for goal in snapshot["active_goals"]:
+        progress = _goal_progress(goal)
+        if progress >= 75:
+            signals.append({
+                "id": f"signal-goal-{goal['id']}",
+                "type": "positive",
+                "title": f"Strong progress: {goal['title']}",
+                "description": f"Already at {progress:.0f}% of target.",
+                "metric": goal.get("category", "custom"),
+                "value": f"{progress:.0f}%",
+            })
+    # Fallback minimal signal
+    if not signals:
+        signals.append({
+            "id": "signal-rev-growth",
+            "type": "positive",
+            "title": "Revenue up week-over-week",
+            "description": "Last 7 days revenue grew +4% vs prior period.",
+            "metric": "revenue",
+            "value": "+4%",
+        })
+    return signals
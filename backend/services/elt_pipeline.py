@@ -4,214 +4,499 @@ Transforms raw_connector_data into structured business_metrics
 """
 import json
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import uuid
 
+import numpy as np
+import pandas as pd
+
+from backend.services.connectors.dataset_store import (
+    DEMAND_COLUMNS,
+    DEMAND_NUMERIC,
+    INVENTORY_COLUMNS,
+    INVENTORY_NUMERIC,
+    classify_dataset,
+    load_dataset_frame,
+)
+from backend.utils.database import as_async_backend
+
+
+# business_metrics row written for each dataset
+METRIC_NAMES = {
+    'inventory': ('total_inventory_value', 'inventory'),
+    'demand': ('total_demand', 'demand'),
+}
+
+
+def inventory_state_frame(state: Dict[str, Any]) -> pd.DataFrame:
+    """Merged inventory rows held in the ELT state, as a DataFrame"""
+    return pd.DataFrame(state.get('inventory', {}), columns=INVENTORY_COLUMNS)
+
+
+def merge_inventory(state: Dict[str, Any], frame: pd.DataFrame) -> None:
+    """
+    Fold an inventory batch into the per-SKU state
+
+    Inventory uploads are snapshots, so a SKU's newest row replaces the
+    previous one; SKUs absent from the batch keep their last values.
+    State is stored column-wise so merges stay vectorized.
+    """
+    merged = pd.concat([inventory_state_frame(state), frame[INVENTORY_COLUMNS]], ignore_index=True)
+    merged = merged.drop_duplicates('sku', keep='last')
+    state['inventory'] = merged.to_dict('list')
+
+
+def weekly_points(frame) -> Tuple[List[str], List[int], List[float]]:
+    """(sku, week, quantity) columns of a demand batch; the last row wins for repeated weeks"""
+    frame = frame.assign(week=frame['week'].astype(int)).drop_duplicates(['sku', 'week'], keep='last')
+    return frame['sku'].astype(str).tolist(), frame['week'].tolist(), frame['quantity'].astype(float).tolist()
+
+
+def demand_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Running demand aggregates held in the ELT state
+
+    {'total_demand': float, 'skus': {sku: [first_week, first_qty,
+    last_week, last_qty, weeks_tracked]}}; the weekly points themselves
+    live in elt_demand_weeks.
+    """
+    return state.setdefault('demand', {'total_demand': 0.0, 'skus': {}})
+
+
+def merge_demand(state: Dict[str, Any], frame, previous: Dict[Tuple[str, int], float]) -> None:
+    """
+    Fold a demand batch into the running aggregates
+
+    Only the batch is touched: re-sent weeks replace their previous
+    quantity in the total, and a SKU's first/last week move only when the
+    batch extends its range.
+
+    Args:
+        frame: Demand batch (sku, week, quantity)
+        previous: Stored quantity of each (sku, week) the batch re-sends
+    """
+    demand = demand_state(state)
+    skus = demand['skus']
+    for sku, week, quantity in zip(*weekly_points(frame)):
+        replaced = previous.get((sku, week))
+        demand['total_demand'] += quantity - (replaced or 0.0)
+        agg = skus.get(sku)
+        if agg is None:
+            skus[sku] = [week, quantity, week, quantity, 1]
+            continue
+        if replaced is None:
+            agg[4] += 1
+        if week <= agg[0]:
+            agg[0], agg[1] = week, quantity
+        if week >= agg[2]:
+            agg[2], agg[3] = week, quantity
+
+
+async def load_demand_weeks(cur, source_id: str, sku: Optional[str] = None) -> pd.DataFrame:
+    """
+    Demand history ELT has merged for a source, every batch included
+
+    Args:
+        cur: Async cursor
+        source_id: Demand data source
+        sku: Optional SKU to restrict the history to
+
+    Returns:
+        (sku, week, quantity) frame ordered by SKU and week
+    """
+    query = "SELECT sku, week, quantity FROM elt_demand_weeks WHERE source_id = %s"
+    params = [source_id]
+    if sku:
+        query += " AND sku = %s"
+        params.append(sku)
+    await cur.execute(query + " ORDER BY sku, week", params)
+    frame = pd.DataFrame(await cur.fetchall(), columns=DEMAND_COLUMNS)
+    return frame.astype({column: float for column in DEMAND_NUMERIC})
+
+
+def _records(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Column arrays -> list of row dicts with native Python values"""
+    keys = list(columns)
+    values = [column.tolist() for column in columns.values()]
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+class InventoryMetrics:
+    """
+    Array-backed inventory aggregates
+
+    Totals and counts come straight from NumPy masks; the stockout,
+    overstock and product lists are only built when asked for.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self._frame = frame
+        self._sku = None
+        self.current_stock = frame['current_stock'].to_numpy(dtype=float)
+        self.min_stock = frame['min_stock'].to_numpy(dtype=float)
+        self.max_stock = frame['max_stock'].to_numpy(dtype=float)
+        self.unit_cost = frame['unit_cost'].to_numpy(dtype=float)
+
+        self.inventory_value = self.current_stock * self.unit_cost
+        self.stockout_mask = self.current_stock <= self.min_stock * 1.1  # Within 10% of min
+        self.overstock_mask = self.current_stock >= self.max_stock * 0.9  # Within 10% of max
+
+        self.total_inventory_value = float(self.inventory_value.sum())
+        self.product_count = len(self.current_stock)
+        self.stockout_count = int(self.stockout_mask.sum())
+        self.overstock_count = int(self.overstock_mask.sum())
+
+    @property
+    def sku(self) -> np.ndarray:
+        if self._sku is None:
+            self._sku = self._frame['sku'].to_numpy(dtype=object)
+        return self._sku
+
+    def _labels(self, column: str, rows) -> np.ndarray:
+        # Slice before converting so limited lists never touch every row
+        return self._frame[column].iloc[rows].to_numpy(dtype=object)
+
+    def stockout_risk(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        idx = np.flatnonzero(self.stockout_mask)[:limit]
+        return _records({
+            'sku': self._labels('sku', idx),
+            'current_stock': self.current_stock[idx],
+            'min_stock': self.min_stock[idx],
+            'shortfall': self.min_stock[idx] - self.current_stock[idx],
+        })
+
+    def overstock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        idx = np.flatnonzero(self.overstock_mask)[:limit]
+        return _records({
+            'sku': self._labels('sku', idx),
+            'current_stock': self.current_stock[idx],
+            'max_stock': self.max_stock[idx],
+            'excess': self.current_stock[idx] - self.max_stock[idx],
+        })
+
+    def products(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = slice(None, limit)
+        return _records({
+            'sku': self._labels('sku', rows),
+            'product_name': self._labels('product_name', rows),
+            'current_stock': self.current_stock[rows],
+            'inventory_value': self.inventory_value[rows],
+            'unit_cost': self.unit_cost[rows],
+            'location': self._labels('location', rows),
+        })
+
+
+def inventory_metrics(state: Dict[str, Any]) -> InventoryMetrics:
+    """Inventory aggregates from the merged state"""
+    return InventoryMetrics(inventory_state_frame(state))
+
+
+def demand_metrics(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Demand aggregates from the running state
+
+    Returns:
+        - total_demand
+        - sku_count
+        - trends
+    """
+    demand = demand_state(state)
+    trends = {}
+    for sku, (first_week, first_qty, last_week, last_qty, weeks_tracked) in demand['skus'].items():
+        if weeks_tracked >= 2:
+            growth_rate = ((last_qty - first_qty) / first_qty * 100) if first_qty > 0 else 0
+            trends[sku] = {
+                'growth_rate_pct': round(growth_rate, 2),
+                'direction': 'up' if growth_rate > 0 else 'down',
+                'weeks_tracked': weeks_tracked
+            }
+    return {
+        'total_demand': demand['total_demand'],
+        'sku_count': len(demand['skus']),
+        'trends': trends,
+    }
+
 
 class ELTPipeline:
     """Extract, Load, Transform pipeline for connector data"""
-    
+
     def __init__(self, backend):
         """Initialize with PostgreSQL backend"""
         self.backend = backend
-    
+        self.async_backend = as_async_backend(backend)
+
     async def process_inventory_data(self, tenant_id: str, source_id: str) -> Dict[str, Any]:
         """
-        Transform raw inventory CSV into business metrics
-        
+        Merge new raw inventory batches into the source's business metrics
+
         Returns:
             - total_inventory_value
             - product_count
             - stockout_risk items
             - overstock items
         """
-        with self.backend.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Get raw data
-                cur.execute(
-                    """
-                    SELECT data FROM raw_connector_data 
-                    WHERE tenant_id = %s AND source_id = %s 
-                    ORDER BY ingested_at DESC LIMIT 1
-                    """,
-                    [tenant_id, source_id]
-                )
-                row = cur.fetchone()
-                if not row:
-                    return {"error": "No data found"}
-                
-                raw_data = row[0]
-                sample_rows = raw_data.get('sample_rows', [])
-                
-                # Calculate metrics
-                total_value = 0.0
-                stockout_risk = []
-                overstock = []
-                products = []
-                
-                for item in sample_rows:
-                    sku = item.get('sku', '')
-                    current_stock = float(item.get('current_stock', 0))
-                    min_stock = float(item.get('min_stock', 0))
-                    max_stock = float(item.get('max_stock', 0))
-                    unit_cost = float(item.get('unit_cost', 0))
-                    
-                    item_value = current_stock * unit_cost
-                    total_value += item_value
-                    
-                    # Check stockout risk
-                    if current_stock <= min_stock * 1.1:  # Within 10% of min
-                        stockout_risk.append({
-                            'sku': sku,
-                            'current_stock': current_stock,
-                            'min_stock': min_stock,
-                            'shortfall': min_stock - current_stock
-                        })
-                    
-                    # Check overstock
-                    if current_stock >= max_stock * 0.9:  # Within 10% of max
-                        overstock.append({
-                            'sku': sku,
-                            'current_stock': current_stock,
-                            'max_stock': max_stock,
-                            'excess': current_stock - max_stock
-                        })
-                    
-                    products.append({
-                        'sku': sku,
-                        'product_name': item.get('product_name', ''),
-                        'current_stock': current_stock,
-                        'inventory_value': item_value,
-                        'unit_cost': unit_cost,
-                        'location': item.get('location', '')
-                    })
-                
-                # Store in business_metrics table
-                metric_id = str(uuid.uuid4())
-                cur.execute(
-                    """
-                    INSERT INTO business_metrics 
-                    (metric_id, tenant_id, metric_name, value, metric_type, 
-                     timestamp, extra_data)
-                    VALUES (%s, %s, %s, %s, %s, NOW(), %s)
-                    """,
-                    [
-                        metric_id,
-                        tenant_id,
-                        'total_inventory_value',
-                        total_value,
-                        'inventory',
-                        json.dumps({
-                            'product_count': len(products),
-                            'stockout_risk_count': len(stockout_risk),
-                            'overstock_count': len(overstock),
-                            'source_id': source_id
-                        })
-                    ]
-                )
-                conn.commit()
-                
-                return {
-                    'total_inventory_value': round(total_value, 2),
-                    'product_count': len(products),
-                    'stockout_risk': stockout_risk,
-                    'overstock': overstock,
-                    'products': products,
-                    'metric_id': metric_id
-                }
-    
+        return await self.process_source(tenant_id, source_id, 'inventory')
+
     async def process_demand_data(self, tenant_id: str, source_id: str) -> Dict[str, Any]:
         """
-        Transform raw demand CSV into time-series metrics
-        
+        Merge new raw demand batches into the source's time-series metrics
+
         Returns:
-            - demand_by_sku
             - total_demand
+            - sku_count
             - growth_trends
         """
-        with self.backend.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Get raw data
-                cur.execute(
+        return await self.process_source(tenant_id, source_id, 'demand')
+
+    async def process_source(
+        self,
+        tenant_id: str,
+        source_id: str,
+        dataset: Optional[str] = None,
+        detail_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Incrementally process one connector
+
+        Claims the source's unprocessed raw batches (FOR UPDATE SKIP LOCKED,
+        so concurrent runs never double-count), merges them into the stored
+        aggregates, marks them processed and advances the watermark. A
+        business_metrics row is only written when the aggregate changed.
+
+        Args:
+            tenant_id: Tenant identifier
+            source_id: data_sources identifier
+            dataset: 'inventory' or 'demand'; inferred from batch headers if None
+            detail_limit: Cap on per-SKU rows returned in each inventory list (None = all)
+
+        Returns:
+            Dataset metrics plus dataset, batches_processed, changed and watermark
+        """
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
                     """
-                    SELECT data FROM raw_connector_data 
-                    WHERE tenant_id = %s AND source_id = %s 
-                    ORDER BY ingested_at DESC LIMIT 1
+                    SELECT raw_id, data, ingested_at FROM raw_connector_data
+                    WHERE tenant_id = %s AND source_id = %s AND NOT processed
+                    ORDER BY ingested_at
+                    FOR UPDATE SKIP LOCKED
                     """,
                     [tenant_id, source_id]
                 )
-                row = cur.fetchone()
-                if not row:
+                batches = await cur.fetchall()
+
+                state_row = await self._lock_state(cur, tenant_id, source_id, create=bool(batches))
+                if state_row is None:
                     return {"error": "No data found"}
-                
-                raw_data = row[0]
-                sample_rows = raw_data.get('sample_rows', [])
-                
-                # Aggregate demand by SKU
-                demand_by_sku = {}
-                for item in sample_rows:
-                    sku = item.get('sku', '')
-                    week = int(item.get('week', 0))
-                    quantity = float(item.get('quantity', 0))
-                    
-                    if sku not in demand_by_sku:
-                        demand_by_sku[sku] = []
-                    
-                    demand_by_sku[sku].append({
-                        'week': week,
-                        'quantity': quantity
-                    })
-                
-                # Calculate trends
-                trends = {}
-                for sku, data in demand_by_sku.items():
-                    sorted_data = sorted(data, key=lambda x: x['week'])
-                    if len(sorted_data) >= 2:
-                        first_qty = sorted_data[0]['quantity']
-                        last_qty = sorted_data[-1]['quantity']
-                        growth_rate = ((last_qty - first_qty) / first_qty * 100) if first_qty > 0 else 0
-                        trends[sku] = {
-                            'growth_rate_pct': round(growth_rate, 2),
-                            'direction': 'up' if growth_rate > 0 else 'down',
-                            'weeks_tracked': len(sorted_data)
-                        }
-                
-                # Store total demand metric
-                total_demand = sum(item['quantity'] for items in demand_by_sku.values() for item in items)
-                metric_id = str(uuid.uuid4())
-                cur.execute(
-                    """
-                    INSERT INTO business_metrics 
-                    (metric_id, tenant_id, metric_name, value, metric_type, 
-                     timestamp, extra_data)
-                    VALUES (%s, %s, %s, %s, %s, NOW(), %s)
-                    """,
-                    [
-                        metric_id,
-                        tenant_id,
-                        'total_demand',
-                        total_demand,
-                        'demand',
-                        json.dumps({
-                            'sku_count': len(demand_by_sku),
-                            'trends': trends,
-                            'source_id': source_id
-                        })
-                    ]
-                )
-                conn.commit()
-                
-                return {
-                    'total_demand': round(total_demand, 2),
-                    'demand_by_sku': demand_by_sku,
-                    'trends': trends,
-                    'metric_id': metric_id
+
+                stored_dataset, watermark, last_metric_id, state = state_row
+                dataset = dataset or stored_dataset
+                if not batches:
+                    await conn.rollback()
+                    if not dataset or dataset not in METRIC_NAMES:
+                        return {"error": "No data found"}
+                    return self._result(dataset, state, last_metric_id, watermark, 0, changed=False, detail_limit=detail_limit)
+
+                last_raw_id = None
+                for raw_id, raw_data, ingested_at in batches:
+                    dataset = dataset or classify_dataset(raw_data.get('headers', []))
+                    if dataset == 'inventory':
+                        frame = await load_dataset_frame(
+                            cur, tenant_id, source_id, raw_id, raw_data, 'inventory',
+                            INVENTORY_COLUMNS, INVENTORY_NUMERIC,
+                        )
+                        merge_inventory(state, frame)
+                    elif dataset == 'demand':
+                        frame = await load_dataset_frame(
+                            cur, tenant_id, source_id, raw_id, raw_data, 'demand',
+                            DEMAND_COLUMNS, DEMAND_NUMERIC,
+                        )
+                        merge_demand(state, frame, await self._store_demand_weeks(cur, tenant_id, source_id, frame))
+                    await cur.execute(
+                        "UPDATE raw_connector_data SET processed = true WHERE raw_id = %s",
+                        [str(raw_id)]
+                    )
+                    watermark = ingested_at
+                    last_raw_id = raw_id
+
+                if dataset not in METRIC_NAMES:
+                    # Unrecognised dataset: batches are consumed but produce no metrics
+                    await self._save_state(cur, source_id, dataset, watermark, last_raw_id, len(batches), last_metric_id, state)
+                    await conn.commit()
+                    return {"error": f"Unsupported dataset for source {source_id}"}
+
+                metrics = inventory_metrics(state) if dataset == 'inventory' else demand_metrics(state)
+                summary = self._summary(dataset, metrics, source_id)
+                changed = summary != state.get('summary')
+                if changed:
+                    metric_name, metric_type = METRIC_NAMES[dataset]
+                    last_metric_id = str(uuid.uuid4())
+                    await cur.execute(
+                        """
+                        INSERT INTO business_metrics
+                        (metric_id, tenant_id, metric_name, value, metric_type,
+                         timestamp, extra_data)
+                        VALUES (%s, %s, %s, %s, %s, NOW(), %s)
+                        """,
+                        [
+                            last_metric_id,
+                            tenant_id,
+                            metric_name,
+                            summary['value'],
+                            metric_type,
+                            json.dumps(summary['extra_data'])
+                        ]
+                    )
+                    state['summary'] = summary
+
+                await self._save_state(cur, source_id, dataset, watermark, last_raw_id, len(batches), last_metric_id, state)
+                await conn.commit()
+
+                return self._result(dataset, state, last_metric_id, watermark, len(batches), changed, metrics, detail_limit)
+
+    async def _store_demand_weeks(self, cur, tenant_id: str, source_id: str, frame) -> Dict[Tuple[str, int], float]:
+        """Upsert a batch's weekly points; returns the quantities they replaced"""
+        skus, weeks, quantities = weekly_points(frame)
+        # Every CTE sees the snapshot before the upsert, so 'previous' holds the old values
+        await cur.execute(
+            """
+            WITH batch AS (
+                SELECT * FROM unnest(%s::text[], %s::int[], %s::float8[]) AS b (sku, week, quantity)
+            ),
+            previous AS (
+                SELECT stored.sku, stored.week, stored.quantity
+                  FROM elt_demand_weeks stored
+                  JOIN batch USING (sku, week)
+                 WHERE stored.source_id = %s
+            ),
+            upserted AS (
+                INSERT INTO elt_demand_weeks (source_id, tenant_id, sku, week, quantity)
+                SELECT %s, %s, sku, week, quantity FROM batch
+                ON CONFLICT (source_id, sku, week) DO UPDATE SET quantity = EXCLUDED.quantity
+            )
+            SELECT sku, week, quantity FROM previous
+            """,
+            [skus, weeks, quantities, source_id, source_id, tenant_id]
+        )
+        return {(sku, week): quantity for sku, week, quantity in await cur.fetchall()}
+
+    async def _lock_state(self, cur, tenant_id: str, source_id: str, create: bool):
+        """Lock (and optionally create) the source's elt_source_state row"""
+        if create:
+            await cur.execute(
+                """
+                INSERT INTO elt_source_state (source_id, tenant_id)
+                VALUES (%s, %s)
+                ON CONFLICT (source_id) DO NOTHING
+                """,
+                [source_id, tenant_id]
+            )
+        await cur.execute(
+            """
+            SELECT dataset, watermark, last_metric_id, state FROM elt_source_state
+            WHERE source_id = %s AND tenant_id = %s
+            FOR UPDATE
+            """,
+            [source_id, tenant_id]
+        )
+        row = await cur.fetchone()
+        if row is None:
+            return None
+        dataset, watermark, last_metric_id, state = row
+        return dataset, watermark, str(last_metric_id) if last_metric_id else None, state or {}
+
+    async def _save_state(self, cur, source_id, dataset, watermark, last_raw_id, batch_count, last_metric_id, state) -> None:
+        await cur.execute(
+            """
+            UPDATE elt_source_state
+               SET dataset = %s,
+                   watermark = %s,
+                   last_raw_id = %s,
+                   batches_processed = batches_processed + %s,
+                   last_metric_id = %s,
+                   state = %s,
+                   updated_at = NOW()
+             WHERE source_id = %s
+            """,
+            [dataset, watermark, str(last_raw_id), batch_count, last_metric_id, json.dumps(state), source_id]
+        )
+
+    def _summary(self, dataset: str, metrics, source_id: str) -> Dict[str, Any]:
+        """business_metrics value/extra_data for the current aggregates"""
+        if dataset == 'inventory':
+            return {
+                'value': metrics.total_inventory_value,
+                'extra_data': {
+                    'product_count': metrics.product_count,
+                    'stockout_risk_count': metrics.stockout_count,
+                    'overstock_count': metrics.overstock_count,
+                    'source_id': str(source_id)
                 }
-    
-    async def run_full_pipeline(self, tenant_id: str) -> Dict[str, Any]:
+            }
+        return {
+            'value': metrics['total_demand'],
+            'extra_data': {
+                'sku_count': metrics['sku_count'],
+                'trends': metrics['trends'],
+                'source_id': str(source_id)
+            }
+        }
+
+    def _result(
+        self,
+        dataset: str,
+        state: Dict[str, Any],
+        metric_id: Optional[str],
+        watermark,
+        batches: int,
+        changed: bool,
+        metrics=None,
+        detail_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if metrics is None:
+            metrics = inventory_metrics(state) if dataset == 'inventory' else demand_metrics(state)
+        if dataset == 'inventory':
+            result = {
+                'total_inventory_value': round(metrics.total_inventory_value, 2),
+                'product_count': metrics.product_count,
+                'stockout_risk_count': metrics.stockout_count,
+                'overstock_count': metrics.overstock_count,
+                'stockout_risk': metrics.stockout_risk(detail_limit),
+                'overstock': metrics.overstock(detail_limit),
+                'products': metrics.products(detail_limit),
+            }
+        else:
+            result = {
+                'total_demand': round(metrics['total_demand'], 2),
+                'sku_count': metrics['sku_count'],
+                'trends': metrics['trends'],
+            }
+        result.update({
+            'metric_id': metric_id,
+            'dataset': dataset,
+            'batches_processed': batches,
+            'changed': changed,
+            'watermark': watermark.isoformat() if watermark else None,
+        })
+        return result
+
+    async def run_full_pipeline(
+        self,
+        tenant_id: str,
+        progress: Optional[Callable[[int, int, str], Awaitable[None]]] = None,
+        detail_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
-        Run complete ELT pipeline for all connectors
-        
+        Run the incremental ELT pipeline for all connectors
+
+        Only raw batches that have not been processed yet are read; sources
+        without new data return their stored aggregates.
+
+        Args:
+            tenant_id: Tenant identifier
+            progress: Optional async callback(done, total, source_id) per connector
+            detail_limit: Cap on per-SKU rows returned in each inventory list (None = all)
+
         Returns summary of all processed metrics
         """
         results = {
@@ -219,39 +504,26 @@ class ELTPipeline:
             'demand': None,
             'processed_at': datetime.now(timezone.utc).isoformat()
         }
-        
-        with self.backend.get_connection() as conn:
-            with conn.cursor() as cur:
+
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
                 # Find all active connectors
-                cur.execute(
+                await cur.execute(
                     """
-                    SELECT source_id, connector_type FROM data_sources 
+                    SELECT source_id, connector_type FROM data_sources
                     WHERE tenant_id = %s AND status = 'active'
                     """,
                     [tenant_id]
                 )
-                connectors = cur.fetchall()
-                
-                for source_id, connector_type in connectors:
-                    if connector_type == 'csv_upload':
-                        # Determine if inventory or demand based on columns
-                        cur.execute(
-                            """
-                            SELECT data->'headers' as headers FROM raw_connector_data 
-                            WHERE source_id = %s ORDER BY ingested_at DESC LIMIT 1
-                            """,
-                            [source_id]
-                        )
-                        header_row = cur.fetchone()
-                        if header_row:
-                            headers = header_row[0]
-                            
-                            # Check if it's inventory data
-                            if 'current_stock' in str(headers):
-                                results['inventory'] = await self.process_inventory_data(tenant_id, source_id)
-                            
-                            # Check if it's demand data
-                            elif 'quantity' in str(headers) and 'week' in str(headers):
-                                results['demand'] = await self.process_demand_data(tenant_id, source_id)
-        
+                connectors = await cur.fetchall()
+
+        sources = [str(source_id) for source_id, connector_type in connectors if connector_type == 'csv_upload']
+        for done, source_id in enumerate(sources, start=1):
+            result = await self.process_source(tenant_id, source_id, detail_limit=detail_limit)
+            dataset = result.get('dataset')
+            if dataset in results:
+                results[dataset] = result
+            if progress:
+                await progress(done, len(sources), source_id)
+
         return results
@@ -0,0 +1,136 @@
+"""
+Batched Forecast Kernel
+Moving-average + linear-trend forecasts for every SKU in one vectorized pass
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class DemandBatch:
+    """
+    All SKU demand series packed end to end in flat arrays
+
+    SKU skus[i] owns the lengths[i] observations from starts[i] on, sorted
+    by week; codes and position give each observation's SKU and index in
+    its series, so kernels reduce per SKU without padding to the longest.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Args:
+            frame: Demand rows with sku, week and quantity columns
+        """
+        codes, skus = pd.factorize(frame['sku'], sort=False)  # First-appearance order
+        weeks = frame['week'].to_numpy(dtype=float).astype(np.int64)
+        quantity = frame['quantity'].to_numpy(dtype=float)
+
+        order = np.lexsort((weeks, codes))  # Stable: ties keep file order
+        self.codes = codes[order]
+        self.skus: List[str] = list(skus)
+        self.lengths = np.bincount(self.codes, minlength=len(self.skus))
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        self.sorted_weeks = weeks[order]
+        self.sorted_quantity = quantity[order]
+        self.position = np.arange(len(self.codes)) - self.starts[self.codes]
+        self.last_week = self.sorted_weeks[self.starts + self.lengths - 1] if len(self.codes) else np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    def per_sku_sum(self, weights: np.ndarray) -> np.ndarray:
+        """Sum of a per-observation array within each SKU's series"""
+        return np.bincount(self.codes, weights=weights, minlength=len(self.skus))
+
+    def history(self) -> List[List[Dict[str, Any]]]:
+        """Sorted {week, quantity} observations, one list per SKU"""
+        rows = [
+            {'week': week, 'quantity': quantity}
+            for week, quantity in zip(self.sorted_weeks.tolist(), self.sorted_quantity.tolist())
+        ]
+        return [rows[start:start + length] for start, length in zip(self.starts.tolist(), self.lengths.tolist())]
+
+
+def moving_average(batch: DemandBatch, window: int = 3) -> np.ndarray:
+    """Mean of each SKU's last `window` observations (all of them if fewer)"""
+    counts = np.minimum(batch.lengths, window)
+    recent = batch.position >= (batch.lengths - counts)[batch.codes]
+    sums = batch.per_sku_sum(np.where(recent, batch.sorted_quantity, 0.0))
+    return np.divide(sums, counts, out=np.zeros(len(batch)), where=counts > 0)
+
+
+def linear_trend(batch: DemandBatch) -> np.ndarray:
+    """OLS slope of quantity against observation index, per SKU"""
+    n = batch.lengths.astype(float)
+    x_mean = (n - 1) / 2
+    y_mean = np.divide(batch.per_sku_sum(batch.sorted_quantity), n, out=np.zeros(len(batch)), where=n > 0)
+
+    dx = batch.position - x_mean[batch.codes]
+    numerator = batch.per_sku_sum(dx * (batch.sorted_quantity - y_mean[batch.codes]))
+    denominator = batch.per_sku_sum(dx ** 2)
+    return np.divide(numerator, denominator, out=np.zeros(len(batch)), where=(n >= 2) & (denominator != 0))
+
+
+def forecast_batch(
+    batch: DemandBatch,
+    periods: int = 4,
+    window: int = 3,
+    band: float = 0.2,
+) -> Dict[str, np.ndarray]:
+    """
+    Forecast every SKU as moving average + trend * step
+
+    Args:
+        batch: Packed demand series
+        periods: Number of future periods to forecast
+        window: Moving-average window
+        band: Relative width of the confidence interval
+
+    Returns:
+        SKU-length trend/moving_average arrays and SKU x periods
+        period/predicted/lower/upper arrays
+    """
+    trend = linear_trend(batch)
+    ma = moving_average(batch, window)
+    steps = np.arange(1, periods + 1)
+    predicted = np.maximum(ma[:, None] + trend[:, None] * steps, 0)  # No negative demand
+    return {
+        'trend': trend,
+        'moving_average': ma,
+        'period': batch.last_week[:, None] + steps,
+        'predicted': predicted,
+        'lower': predicted * (1 - band),
+        'upper': predicted * (1 + band),
+    }
+
+
+def forecasts_by_sku(batch: DemandBatch, result: Dict[str, np.ndarray], confidence: float = 0.8) -> Dict[str, Dict[str, Any]]:
+    """Per-SKU forecast payloads in the ForecastService response shape"""
+    trend = np.round(result['trend'], 4).tolist()
+    ma = np.round(result['moving_average'], 2).tolist()
+    period = result['period'].tolist()
+    predicted = np.round(result['predicted'], 2).tolist()
+    lower = np.round(result['lower'], 2).tolist()
+    upper = np.round(result['upper'], 2).tolist()
+
+    history = batch.history()
+
+    forecasts = {}
+    for i, sku in enumerate(batch.skus):
+        forecasts[sku] = {
+            'historical_data': history[i],
+            'trend': trend[i],
+            'moving_average': ma[i],
+            'predictions': [
+                {
+                    'period': p,
+                    'predicted_quantity': q,
+                    'lower_bound': lo,
+                    'upper_bound': hi,
+                    'confidence': confidence,
+                }
+                for p, q, lo, hi in zip(period[i], predicted[i], lower[i], upper[i])
+            ],
+        }
+    return forecasts
@@ -0,0 +1,144 @@
+"""
+Forecast Cache
+LRU cache of fitted forecasts keyed on a fingerprint of the input series
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from backend.utils.caching import TTLCache
+
+
+def series_fingerprint(
+    tenant_id: str,
+    sku: str,
+    historical_data: List[Dict[str, Any]],
+    params: Dict[str, Any],
+    periods: int,
+) -> str:
+    """
+    Stable hash of everything a fitted forecast depends on
+
+    Args:
+        tenant_id: Tenant identifier
+        sku: SKU the series belongs to
+        historical_data: List of {week, quantity} observations
+        params: Model name and hyperparameters
+        periods: Forecast horizon
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = json.dumps(
+        [
+            tenant_id,
+            sku,
+            [[d['week'], d['quantity']] for d in historical_data],
+            params,
+            periods,
+        ],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ForecastCache:
+    """
+    In-memory LRU of forecast payloads that spills evictions to disk
+
+    Entries evicted from memory are written as JSON under spill_dir and
+    promoted back into memory on their next hit.
+    """
+
+    def __init__(self, max_entries: int = 10000, spill_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries: Entries kept in memory before the least recent spills
+            spill_dir: Directory for spilled entries (None disables spilling)
+        """
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self._entries = TTLCache(max_entries)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        entry = self._read_spilled(key)
+        if entry is None:
+            return None
+        self.put(key, entry)
+        with self._lock:
+            self.disk_hits += 1
+        return entry
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        for evicted_key, evicted_value in self._entries.put(key, value):
+            self._spill(evicted_key, evicted_value)
+
+    def _spill(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[FORECAST_CACHE] Failed to spill {key[:12]}: {e}")
+
+    def _read_spilled(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.remove(path)  # Back in memory; re-spilled if evicted again
+        except OSError:
+            pass
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        with self._lock:
+            disk_hits = self.disk_hits
+        return {
+            'entries': stats['entries'],
+            'max_entries': self.max_entries,
+            'hits': stats['hits'],
+            'disk_hits': disk_hits,
+            'misses': stats['misses'] - disk_hits,  # Memory misses served from disk are not misses
+        }
+
+
+_cache: Optional[ForecastCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Process-wide cache sized by FORECAST_CACHE_SIZE, spilling to FORECAST_CACHE_DIR"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ForecastCache(
+                    max_entries=int(os.getenv("FORECAST_CACHE_SIZE", "10000")),
+                    spill_dir=os.getenv("FORECAST_CACHE_DIR", os.path.join("data", "forecast_cache")) or None,
+                )
+    return _cache
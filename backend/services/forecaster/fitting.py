@@ -0,0 +1,274 @@
+"""
+Prophet Fitting Pool
+Fans per-SKU Prophet fits out to worker processes with per-fit time budgets
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.services.forecaster.batch import DemandBatch, forecast_batch, forecasts_by_sku
+
+History = List[Dict[str, Any]]
+
+PROPHET_PARAMS: Dict[str, Any] = {
+    'yearly_seasonality': False,
+    'weekly_seasonality': False,
+    'daily_seasonality': False,
+    'interval_width': 0.8,  # 80% confidence interval
+}
+
+
+class FitTimeout(Exception):
+    """A single fit exceeded its time budget"""
+
+
+def prophet_frame(historical_data: History) -> pd.DataFrame:
+    """
+    Convert historical data to Prophet format (ds, y columns)
+
+    Args:
+        historical_data: List of {week: int, quantity: float}
+
+    Returns:
+        DataFrame with 'ds' (dates) and 'y' (values) columns
+    """
+    if not historical_data:
+        return pd.DataFrame(columns=['ds', 'y'])
+
+    # Week 1 starts at 2025-01-01, each week is 7 days apart
+    base_date = datetime(2025, 1, 1)
+    sorted_data = sorted(historical_data, key=lambda x: x['week'])
+    return pd.DataFrame({
+        'ds': [base_date + timedelta(weeks=item['week'] - 1) for item in sorted_data],
+        'y': [item['quantity'] for item in sorted_data],
+    })
+
+
+def fit_prophet_series(historical_data: History, periods: int) -> Dict[str, Any]:
+    """Fit one Prophet model and build its forecast payload (runs in a worker process)"""
+    from prophet import Prophet
+
+    df = prophet_frame(historical_data)
+    last_week = historical_data[-1]['week'] if historical_data else 0
+
+    if len(df) < 2:
+        # Not enough data for Prophet, use simple average
+        avg = df['y'].mean() if len(df) > 0 else 0
+        return {
+            'historical_data': historical_data,
+            'predictions': [
+                {
+                    'period': last_week + i,
+                    'predicted_quantity': round(avg, 2),
+                    'lower_bound': round(avg * 0.8, 2),
+                    'upper_bound': round(avg * 1.2, 2),
+                    'confidence': 0.6
+                }
+                for i in range(1, periods + 1)
+            ],
+            'model': 'simple_average',
+            'trend': 0,
+            'seasonality': None
+        }
+
+    model = Prophet(**PROPHET_PARAMS)
+    model.fit(df)
+
+    future = model.make_future_dataframe(periods=periods, freq='W')
+    forecast = model.predict(future)
+    future_forecast = forecast.tail(periods)
+    predictions = [
+        {
+            'period': last_week + idx,
+            'predicted_quantity': round(max(0, yhat), 2),
+            'lower_bound': round(max(0, lower), 2),
+            'upper_bound': round(max(0, upper), 2),
+            'confidence': 0.8
+        }
+        for idx, (yhat, lower, upper) in enumerate(
+            zip(future_forecast['yhat'], future_forecast['yhat_lower'], future_forecast['yhat_upper']),
+            start=1,
+        )
+    ]
+
+    return {
+        'historical_data': historical_data,
+        'predictions': predictions,
+        'model': 'prophet',
+        'trend': round(forecast['trend'].iloc[-1] - forecast['trend'].iloc[0], 4),
+        'seasonality': None  # Would need more data for meaningful seasonality
+    }
+
+
+def _raise_timeout(signum, frame):
+    raise FitTimeout()
+
+
+def _fit_chunk(
+    fit_fn: Callable[[History, int], Dict[str, Any]],
+    chunk: List[Tuple[str, History]],
+    periods: int,
+    fit_timeout: float,
+) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Fit a batch of SKUs inside one worker process
+
+    Each fit gets its own SIGALRM budget where the platform supports it;
+    timeouts and errors are reported per SKU instead of failing the chunk.
+    """
+    logging.getLogger('prophet').setLevel(logging.ERROR)
+    logging.getLogger('cmdstanpy').setLevel(logging.ERROR)
+    use_alarm = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+
+    results = []
+    try:
+        for sku, history in chunk:
+            try:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, fit_timeout)
+                results.append((sku, fit_fn(history, periods), None))
+            except FitTimeout:
+                results.append((sku, None, f'fit exceeded {fit_timeout:g}s'))
+            except Exception as e:
+                results.append((sku, None, f'{type(e).__name__}: {e}'))
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous)
+    return results
+
+
+def fallback_forecasts(demand_by_sku: Dict[str, History], periods: int, reasons: Dict[str, str]) -> Dict[str, Any]:
+    """Moving-average + trend forecasts for SKUs whose Prophet fit did not finish"""
+    rows = [(sku, d['week'], d['quantity']) for sku, history in demand_by_sku.items() for d in history]
+    batch = DemandBatch(pd.DataFrame(rows, columns=['sku', 'week', 'quantity']))
+    forecasts = forecasts_by_sku(batch, forecast_batch(batch, periods))
+    for sku, forecast in forecasts.items():
+        forecast.update({
+            'historical_data': demand_by_sku[sku],
+            'model': 'moving_average_trend',
+            'seasonality': None,
+            'fallback_reason': reasons.get(sku),
+        })
+    return forecasts
+
+
+class ProphetFitPool:
+    """Process pool that fits Prophet models for many SKUs in parallel"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        fit_timeout: Optional[float] = None,
+        fit_fn: Callable[[History, int], Dict[str, Any]] = fit_prophet_series,
+    ):
+        """
+        Args:
+            max_workers: Worker processes (env PROPHET_WORKERS, default CPU count)
+            chunk_size: SKUs sent to a worker per task (env PROPHET_CHUNK_SIZE)
+            fit_timeout: Seconds allowed per SKU fit (env PROPHET_FIT_TIMEOUT_SECONDS)
+            fit_fn: Module-level fit(historical_data, periods) run in the workers
+        """
+        self.max_workers = max_workers or int(os.getenv("PROPHET_WORKERS", "0")) or os.cpu_count() or 1
+        self.chunk_size = chunk_size or int(os.getenv("PROPHET_CHUNK_SIZE", "8"))
+        self.fit_timeout = fit_timeout if fit_timeout is not None else float(os.getenv("PROPHET_FIT_TIMEOUT_SECONDS", "30"))
+        self.fit_fn = fit_fn
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process holding connection pools and event loop threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._discard_executor()
+
+    async def fit(self, demand_by_sku: Dict[str, History], periods: int) -> Dict[str, Any]:
+        """
+        Forecast every SKU, falling back to moving average + trend per SKU
+
+        Args:
+            demand_by_sku: {sku: [{week, quantity}, ...]}
+            periods: Number of future periods (weeks) to forecast
+
+        Returns:
+            {sku: forecast payload} in the input SKU order
+        """
+        items = list(demand_by_sku.items())
+        if not items:
+            return {}
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        futures = {
+            loop.run_in_executor(executor, _fit_chunk, self.fit_fn, chunk, periods, self.fit_timeout): chunk
+            for chunk in chunks
+        }
+        # Backstop in case a worker hangs where the per-fit alarm cannot reach it
+        waves = math.ceil(len(chunks) / self.max_workers)
+        deadline = self.fit_timeout * self.chunk_size * waves + 30
+        done, pending = await asyncio.wait(futures, timeout=deadline)
+
+        fitted: Dict[str, Dict[str, Any]] = {}
+        reasons: Dict[str, str] = {}
+        for future in done:
+            try:
+                for sku, forecast, error in future.result():
+                    if forecast is None:
+                        reasons[sku] = error
+                    else:
+                        fitted[sku] = forecast
+            except Exception as e:
+                # Worker process died; the pool is unusable from here on
+                reasons.update({sku: f'{type(e).__name__}: {e}' for sku, _ in futures[future]})
+                self._discard_executor()
+        for future in pending:
+            future.cancel()
+            reasons.update({sku: 'fit pool deadline exceeded' for sku, _ in futures[future]})
+        if pending:
+            self._discard_executor()
+
+        if reasons:
+            fitted.update(fallback_forecasts({sku: demand_by_sku[sku] for sku in reasons}, periods, reasons))
+        return {sku: fitted[sku] for sku, _ in items}
+
+
+_pool: Optional[ProphetFitPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_fit_pool() -> ProphetFitPool:
+    """Process-wide ProphetFitPool configured from the environment"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProphetFitPool()
+    return _pool
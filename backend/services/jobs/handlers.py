@@ -0,0 +1,157 @@
+"""
+Job Handlers
+ELT, forecast and optimize work units executed by queue workers
+"""
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from backend.services.coach.answer_cache import get_answer_cache
+from backend.services.coach.context import get_tenant_context_cache
+from backend.services.dashboard.snapshots import refresh_snapshot_async
+from backend.services.elt_pipeline import ELTPipeline
+from backend.services.forecaster.service import ForecastService
+from backend.services.lazy_services import get_lazy_services
+from backend.services.optimizer.inventory import InventoryOptimizer
+from backend.utils.database import as_async_backend
+from backend.utils.response_cache import bump_data_version_async
+
+
+ProgressFn = Callable[[float, str], Awaitable[None]]
+
+
+def tenant_data_changed(tenant_id: str) -> None:
+    """Drop cached views of a tenant's data after ELT, forecast or optimization writes"""
+    get_tenant_context_cache().invalidate(tenant_id)
+    get_answer_cache().invalidate(tenant_id)
+
+
+async def tenant_data_written(backend, tenant_id: str, sections: Iterable[str] = ()) -> None:
+    """
+    Publish a committed ELT write
+
+    Drops in-process caches, bumps the tenant's data version (response
+    ETags) and refreshes the given dashboard snapshot sections in one
+    transaction. A failure is logged: the write itself already committed,
+    and the previous snapshot stays in place. Forecasts and optimizations
+    bump the version in their own write transaction.
+    """
+    tenant_data_changed(tenant_id)
+    try:
+        async with as_async_backend(backend).get_connection() as conn:
+            async with conn.cursor() as cur:
+                await bump_data_version_async(cur, tenant_id)
+                await refresh_snapshot_async(cur, tenant_id, sections)
+            await conn.commit()
+    except Exception as e:
+        print(f"[JOBS] Publishing data change for {tenant_id} failed: {e}")
+
+
+def _stored(tenant_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    # Error results wrote nothing, so cached views stay valid
+    if 'error' not in result:
+        tenant_data_changed(tenant_id)
+    return result
+
+
+async def run_forecast(backend, tenant_id: str, sku: Optional[str] = None, periods: int = 4, model: str = "auto") -> Dict[str, Any]:
+    """
+    Generate a demand forecast with the requested model
+
+    Args:
+        model: 'auto' (Prophet, falling back to simple), 'prophet' or 'simple'
+    """
+    # Prophet and its Stan backend are imported on the first Prophet forecast
+    services = get_lazy_services()
+    prophet_available = services.available("prophet_forecaster")
+    if model == "prophet" and prophet_available:
+        ProphetForecaster = services.symbol("prophet_forecaster", "ProphetForecaster")
+        return _stored(tenant_id, await ProphetForecaster(backend).forecast_with_prophet(tenant_id, sku, periods))
+    if model == "auto" and prophet_available:
+        # Try Prophet, fallback to simple
+        try:
+            ProphetForecaster = services.symbol("prophet_forecaster", "ProphetForecaster")
+            return _stored(tenant_id, await ProphetForecaster(backend).forecast_with_prophet(tenant_id, sku, periods))
+        except Exception:
+            pass
+    # Use simple moving average model
+    return _stored(tenant_id, await ForecastService(backend).forecast_demand(tenant_id, sku, periods))
+
+
+async def run_inventory_optimization(
+    backend,
+    tenant_id: str,
+    objective: str = "minimize_cost",
+    algorithm: str = "auto",
+    constraints: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Optimize inventory with the requested algorithm
+
+    Args:
+        algorithm: 'auto' (OR-Tools LP, falling back to EOQ), 'lp' or 'simple'
+        offset: First recommendation to return
+        limit: Recommendation page size (None returns all)
+    """
+    services = get_lazy_services()
+    ortools_available = services.available("ortools_optimizer")
+    if algorithm == "lp" and ortools_available:
+        ORToolsOptimizer = services.symbol("ortools_optimizer", "ORToolsOptimizer")
+        return _stored(tenant_id, await ORToolsOptimizer(backend).optimize_inventory_lp(tenant_id, objective, constraints, offset, limit))
+    if algorithm == "auto" and ortools_available:
+        # Try OR-Tools, fallback to simple
+        try:
+            ORToolsOptimizer = services.symbol("ortools_optimizer", "ORToolsOptimizer")
+            return _stored(tenant_id, await ORToolsOptimizer(backend).optimize_inventory_lp(tenant_id, objective, constraints, offset, limit))
+        except Exception:
+            pass
+    # Use simple EOQ model; both paths only materialize the requested page
+    return _stored(tenant_id, await InventoryOptimizer(backend).optimize_inventory(tenant_id, objective, constraints, offset, limit))
+
+
+async def elt_job(backend, job: Dict[str, Any], progress: ProgressFn) -> Dict[str, Any]:
+    async def on_source(done: int, total: int, source_id: str) -> None:
+        await progress(100.0 * done / max(total, 1), f"Processed connector {done}/{total}")
+
+    await progress(0, "Processing connectors")
+    try:
+        return await ELTPipeline(backend).run_full_pipeline(
+            job["tenant_id"],
+            progress=on_source,
+            detail_limit=(job.get("payload") or {}).get("detail_limit"),
+        )
+    finally:
+        await tenant_data_written(backend, job["tenant_id"], ("metrics",))
+
+
+async def forecast_job(backend, job: Dict[str, Any], progress: ProgressFn) -> Dict[str, Any]:
+    payload = job["payload"]
+    await progress(0, "Forecasting demand")
+    return await run_forecast(
+        backend,
+        job["tenant_id"],
+        sku=payload.get("sku"),
+        periods=int(payload.get("periods", 4)),
+        model=payload.get("model", "auto"),
+    )
+
+
+async def optimize_job(backend, job: Dict[str, Any], progress: ProgressFn) -> Dict[str, Any]:
+    payload = job["payload"]
+    await progress(0, "Optimizing inventory")
+    return await run_inventory_optimization(
+        backend,
+        job["tenant_id"],
+        objective=payload.get("objective", "minimize_cost"),
+        algorithm=payload.get("algorithm", "auto"),
+        constraints=payload.get("constraints"),
+        offset=int(payload.get("offset") or 0),
+        limit=payload.get("limit"),
+    )
+
+
+JOB_HANDLERS: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+    "elt": elt_job,
+    "forecast": forecast_job,
+    "optimize": optimize_job,
+}
@@ -0,0 +1,353 @@
+"""
+Job Queue
+Postgres-backed background jobs with enqueue/poll/ack, retries and backoff
+"""
+import json
+import os
+import random
+import uuid
+from typing import Any, Dict, List, Optional
+
+from backend.utils.database import as_async_backend
+
+
+JOB_COLUMNS = """
+    job_id, tenant_id, job_type, payload, status, priority, attempts,
+    max_attempts, run_after, locked_by, heartbeat_at, progress, result,
+    error, created_at, updated_at, finished_at
+"""
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _row_to_job(row) -> Dict[str, Any]:
+    (
+        job_id, tenant_id, job_type, payload, status, priority, attempts,
+        max_attempts, run_after, locked_by, heartbeat_at, progress, result,
+        error, created_at, updated_at, finished_at,
+    ) = row
+    return {
+        "job_id": str(job_id),
+        "tenant_id": str(tenant_id),
+        "job_type": job_type,
+        "payload": payload or {},
+        "status": status,
+        "priority": priority,
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+        "run_after": _iso(run_after),
+        "locked_by": locked_by,
+        "heartbeat_at": _iso(heartbeat_at),
+        "progress": progress or {},
+        "result": result,
+        "error": error,
+        "created_at": _iso(created_at),
+        "updated_at": _iso(updated_at),
+        "finished_at": _iso(finished_at),
+    }
+
+
+class JobQueue:
+    """Enqueue, claim and settle rows in the jobs table"""
+
+    def __init__(
+        self,
+        backend,
+        retry_base_seconds: Optional[float] = None,
+        retry_max_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        Initialize with PostgreSQL backend
+
+        Args:
+            backend: Sync or async database backend
+            retry_base_seconds: First retry delay; doubles per attempt (JOB_RETRY_BASE_SECONDS)
+            retry_max_seconds: Cap on the retry delay (JOB_RETRY_MAX_SECONDS)
+            max_attempts: Default attempts before a job fails for good (JOB_MAX_ATTEMPTS)
+        """
+        self.backend = backend
+        self.async_backend = as_async_backend(backend)
+        self.retry_base_seconds = retry_base_seconds if retry_base_seconds is not None else float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+        self.retry_max_seconds = retry_max_seconds if retry_max_seconds is not None else float(os.getenv("JOB_RETRY_MAX_SECONDS", "300"))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+
+    def backoff_seconds(self, attempts: int) -> float:
+        """Exponential backoff with +/-20% jitter for the given attempt number"""
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def enqueue(
+        self,
+        tenant_id: str,
+        job_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        dedupe_key: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add a job to the queue
+
+        If dedupe_key is given and a job with that key is still queued, the
+        existing job is returned instead of adding another.
+
+        Returns:
+            Job dict (includes 'deduplicated': True when coalesced)
+        """
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    f"""
+                    INSERT INTO jobs (job_id, tenant_id, job_type, payload, priority, max_attempts, dedupe_key)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (dedupe_key) WHERE status = 'queued' DO NOTHING
+                    RETURNING {JOB_COLUMNS}
+                    """,
+                    [
+                        str(uuid.uuid4()),
+                        tenant_id,
+                        job_type,
+                        json.dumps(payload or {}),
+                        priority,
+                        max_attempts or self.max_attempts,
+                        dedupe_key,
+                    ]
+                )
+                row = await cur.fetchone()
+                deduplicated = row is None
+                if deduplicated:
+                    await cur.execute(
+                        f"SELECT {JOB_COLUMNS} FROM jobs WHERE dedupe_key = %s AND status = 'queued'",
+                        [dedupe_key]
+                    )
+                    row = await cur.fetchone()
+            await conn.commit()
+        job = _row_to_job(row)
+        job["deduplicated"] = deduplicated
+        return job
+
+    async def poll(self, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next runnable job, or None if the queue is empty
+
+        Uses FOR UPDATE SKIP LOCKED so concurrent workers never claim the
+        same job.
+        """
+        type_filter = "AND job_type = ANY(%s)" if job_types else ""
+        params: List[Any] = [worker_id]
+        if job_types:
+            params.append(list(job_types))
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    f"""
+                    UPDATE jobs
+                       SET status = 'running',
+                           attempts = attempts + 1,
+                           locked_by = %s,
+                           locked_at = NOW(),
+                           heartbeat_at = NOW(),
+                           updated_at = NOW()
+                     WHERE job_id = (
+                           SELECT job_id FROM jobs
+                            WHERE status = 'queued' AND run_after <= NOW() {type_filter}
+                            ORDER BY priority DESC, run_after
+                            LIMIT 1
+                            FOR UPDATE SKIP LOCKED
+                     )
+                    RETURNING {JOB_COLUMNS}
+                    """,
+                    params
+                )
+                row = await cur.fetchone()
+            await conn.commit()
+        return _row_to_job(row) if row else None
+
+    async def ack(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a claimed job succeeded; False if the lease was lost"""
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE jobs
+                       SET status = 'succeeded',
+                           result = %s,
+                           error = NULL,
+                           progress = jsonb_set(progress, '{percent}', '100'::jsonb, true),
+                           finished_at = NOW(),
+                           updated_at = NOW()
+                     WHERE job_id = %s AND locked_by = %s AND status = 'running'
+                    """,
+                    [json.dumps(result, default=str), job_id, worker_id]
+                )
+                acked = cur.rowcount > 0
+            await conn.commit()
+        return acked
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt
+
+        Re-queues the job after an exponential backoff while attempts remain,
+        otherwise marks it failed. A job whose dedupe key already has a newer
+        queued job fails as superseded instead: that job will do the work,
+        and only one queued job per key is allowed.
+
+        Returns:
+            New status ('queued' or 'failed'), or None if the lease was lost
+        """
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT attempts, max_attempts, dedupe_key FROM jobs WHERE job_id = %s AND locked_by = %s AND status = 'running' FOR UPDATE",
+                    [job_id, worker_id]
+                )
+                row = await cur.fetchone()
+                if row is None:
+                    return None
+                attempts, max_attempts, dedupe_key = row
+                twin = None
+                if attempts < max_attempts and dedupe_key is not None:
+                    await cur.execute(
+                        "SELECT job_id FROM jobs WHERE dedupe_key = %s AND status = 'queued'",
+                        [dedupe_key]
+                    )
+                    twin = await cur.fetchone()
+                    if twin is not None:
+                        error = f"{error} (superseded by queued job {twin[0]})"
+                if attempts < max_attempts and twin is None:
+                    status = "queued"
+                    await cur.execute(
+                        """
+                        UPDATE jobs
+                           SET status = 'queued',
+                               error = %s,
+                               run_after = NOW() + make_interval(secs => %s),
+                               locked_by = NULL,
+                               updated_at = NOW()
+                         WHERE job_id = %s
+                        """,
+                        [error, self.backoff_seconds(attempts), job_id]
+                    )
+                else:
+                    status = "failed"
+                    await cur.execute(
+                        """
+                        UPDATE jobs
+                           SET status = 'failed',
+                               error = %s,
+                               finished_at = NOW(),
+                               updated_at = NOW()
+                         WHERE job_id = %s
+                        """,
+                        [error, job_id]
+                    )
+            await conn.commit()
+        return status
+
+    async def report_progress(self, job_id: str, percent: float, message: str = "") -> None:
+        """Store progress for status/SSE readers; doubles as a heartbeat"""
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE jobs
+                       SET progress = %s, heartbeat_at = NOW(), updated_at = NOW()
+                     WHERE job_id = %s AND status = 'running'
+                    """,
+                    [json.dumps({"percent": round(percent, 1), "message": message}), job_id]
+                )
+            await conn.commit()
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> None:
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "UPDATE jobs SET heartbeat_at = NOW() WHERE job_id = %s AND locked_by = %s AND status = 'running'",
+                    [job_id, worker_id]
+                )
+            await conn.commit()
+
+    async def requeue_stale(self, stale_after_seconds: float) -> int:
+        """
+        Release jobs whose worker stopped heartbeating (crashed or killed)
+
+        Jobs with attempts left go back to the queue; the rest fail. Per
+        dedupe key only the newest stale job is re-queued, and only if no
+        job with that key is queued already; the others fail as superseded.
+
+        Returns:
+            Number of jobs released
+        """
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    WITH stale AS (
+                        SELECT job_id, dedupe_key, created_at, attempts < max_attempts AS retry
+                          FROM jobs
+                         WHERE status = 'running'
+                           AND heartbeat_at < NOW() - make_interval(secs => %s)
+                           FOR UPDATE
+                    ),
+                    requeued AS (
+                        SELECT job_id
+                          FROM (
+                                SELECT job_id, dedupe_key,
+                                       ROW_NUMBER() OVER (PARTITION BY dedupe_key ORDER BY created_at DESC) AS newest
+                                  FROM stale
+                                 WHERE retry
+                               ) ranked
+                         WHERE dedupe_key IS NULL
+                            OR (newest = 1 AND NOT EXISTS (
+                                   SELECT 1 FROM jobs queued
+                                    WHERE queued.dedupe_key = ranked.dedupe_key AND queued.status = 'queued'
+                               ))
+                    )
+                    UPDATE jobs
+                       SET status = CASE WHEN requeued.job_id IS NOT NULL THEN 'queued' ELSE 'failed' END,
+                           finished_at = CASE WHEN requeued.job_id IS NOT NULL THEN NULL ELSE NOW() END,
+                           error = CASE WHEN stale.retry AND requeued.job_id IS NULL
+                                        THEN 'Worker stopped responding (superseded by a queued job)'
+                                        ELSE 'Worker stopped responding' END,
+                           locked_by = NULL,
+                           run_after = NOW(),
+                           updated_at = NOW()
+                      FROM stale
+                      LEFT JOIN requeued ON requeued.job_id = stale.job_id
+                     WHERE jobs.job_id = stale.job_id
+                    """,
+                    [stale_after_seconds]
+                )
+                released = cur.rowcount
+            await conn.commit()
+        return released
+
+    async def get(self, job_id: str, tenant_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Fetch one job, optionally scoped to a tenant"""
+        sql = f"SELECT {JOB_COLUMNS} FROM jobs WHERE job_id = %s"
+        params: List[Any] = [job_id]
+        if tenant_id:
+            sql += " AND tenant_id = %s"
+            params.append(tenant_id)
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params)
+                row = await cur.fetchone()
+        return _row_to_job(row) if row else None
+
+    async def list_for_tenant(self, tenant_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs for a tenant"""
+        async with self.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    f"SELECT {JOB_COLUMNS} FROM jobs WHERE tenant_id = %s ORDER BY created_at DESC LIMIT %s",
+                    [tenant_id, limit]
+                )
+                rows = await cur.fetchall()
+        return [_row_to_job(r) for r in rows]
@@ -0,0 +1,145 @@
+"""
+Job Worker
+Polls the jobs table and runs handlers; `python -m backend.services.jobs.worker`
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from backend.services.jobs.handlers import JOB_HANDLERS
+from backend.services.jobs.queue import JobQueue
+
+
+class JobWorker:
+    """Single-threaded asyncio worker that claims and executes queued jobs"""
+
+    def __init__(
+        self,
+        backend,
+        worker_id: Optional[str] = None,
+        job_types: Optional[List[str]] = None,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 15.0,
+        stale_after: float = 300.0,
+        handlers: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            backend: Database backend shared by the queue and handlers
+            worker_id: Lease owner recorded on claimed jobs (default host:pid)
+            job_types: Only claim these job types (default: all handled types)
+            poll_interval: Seconds to sleep when the queue is empty
+            heartbeat_interval: Seconds between heartbeats while a job runs
+            stale_after: Seconds without heartbeat before a running job is released
+            handlers: job_type -> async handler(backend, job, progress)
+        """
+        self.backend = backend
+        self.queue = JobQueue(backend)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers = handlers or JOB_HANDLERS
+        self.job_types = job_types or list(self.handlers)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._last_reap = 0.0
+
+    async def run_once(self) -> bool:
+        """Claim and run at most one job; returns False when the queue was empty"""
+        now = time.monotonic()
+        if now - self._last_reap >= self.stale_after / 2:
+            self._last_reap = now
+            await self.queue.requeue_stale(self.stale_after)
+
+        job = await self.queue.poll(self.worker_id, self.job_types)
+        if job is None:
+            return False
+
+        async def progress(percent: float, message: str = "") -> None:
+            await self.queue.report_progress(job["job_id"], percent, message)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job["job_id"]))
+        try:
+            handler = self.handlers[job["job_type"]]
+            result = await handler(self.backend, job, progress)
+        except Exception as e:
+            status = await self.queue.fail(job["job_id"], self.worker_id, f"{type(e).__name__}: {e}")
+            print(f"[JOB_WORKER] {job['job_type']} job {job['job_id']} attempt {job['attempts']} failed ({status}): {e}")
+            traceback.print_exc()
+        else:
+            await self.queue.ack(job["job_id"], self.worker_id, result)
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.queue.heartbeat(job_id, self.worker_id)
+            except Exception as e:
+                print(f"[JOB_WORKER] Heartbeat for {job_id} failed: {e}")
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                worked = await self.run_once()
+            except Exception as e:
+                print(f"[JOB_WORKER] Poll failed: {e}")
+                worked = False
+            if not worked:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+def _worker_process(index: int, poll_interval: float) -> None:
+    # Imported here so each spawned process builds its own connection pools
+    from backend.utils.database import get_backend
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        worker = JobWorker(get_backend(), worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}", poll_interval=poll_interval)
+        print(f"[JOB_WORKER] {worker.worker_id} polling for {', '.join(worker.job_types)}")
+        await worker.run_forever(stop)
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("JOB_WORKERS", "2")))
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv("JOB_POLL_INTERVAL", "1.0")))
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_worker_process, args=(i, args.poll_interval), name=f"job-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(*_: Any) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
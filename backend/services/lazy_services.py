@@ -0,0 +1,197 @@
+"""
+Lazy Services
+Heavy optional service modules imported on first use, with availability from import specs and per-module import timings
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Service name -> (module, top-level packages it cannot work without).
+# Nothing here is imported until a request (or the pre-warm thread) asks;
+# the OptiGuide agent imports AutoGen when installed and degrades without it.
+HEAVY_SERVICES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'prophet_forecaster': ('backend.services.forecaster.prophet_forecaster', ('prophet',)),
+    'ortools_optimizer': ('backend.services.optimizer.ortools_optimizer', ('ortools',)),
+    'optiguide_agent': ('backend.services.coach.optiguide_agent', ()),
+    'langgraph_coach': ('backend.services.coach.langgraph_coach', ('langgraph', 'langchain_openai')),
+}
+
+
+def package_installed(name: str) -> bool:
+    """Whether a top-level package can be imported, without importing it"""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyService:
+    """
+    One service module, imported at most once
+
+    Availability only consults import specs. The first load() records the
+    wall time of the import and how many modules it pulled in; a failed
+    import is remembered and re-raised rather than retried per request.
+    """
+
+    def __init__(self, name: str, module: str, requires: Iterable[str] = ()):
+        """
+        Args:
+            name: Registry key
+            module: Dotted module path imported on first use
+            requires: Top-level packages that must be installed
+        """
+        self.name = name
+        self.module = module
+        self.requires = tuple(requires)
+        self._available: Optional[bool] = None
+        self._module: Any = None
+        self._error: Optional[ImportError] = None
+        self._lock = threading.Lock()
+        self.import_seconds: Optional[float] = None
+        self.modules_imported = 0
+        self.loaded_by: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        if self._available is None:
+            self._available = all(package_installed(name) for name in self.requires)
+        return self._available
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self, caller: str = 'request') -> Any:
+        """
+        The imported module
+
+        Raises:
+            ImportError: A required package is missing or the import failed
+        """
+        if self._module is not None:
+            return self._module
+        with self._lock:
+            if self._module is None:
+                if self._error is not None:
+                    raise self._error
+                missing = [name for name in self.requires if not package_installed(name)]
+                if missing:
+                    self._error = ImportError(
+                        f"{self.name} requires {', '.join(missing)}. Run: pip install {' '.join(missing)}"
+                    )
+                    raise self._error
+                before = len(sys.modules)
+                start = time.perf_counter()
+                try:
+                    module = importlib.import_module(self.module)
+                except ImportError as e:
+                    self._error = e
+                    raise
+                self.import_seconds = time.perf_counter() - start
+                self.modules_imported = max(len(sys.modules) - before, 0)
+                self.loaded_by = caller
+                self._module = module
+        return self._module
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'module': self.module,
+            'requires': list(self.requires),
+            'available': self.available,
+            'loaded': self.loaded,
+            'loaded_by': self.loaded_by,
+            'import_ms': round(self.import_seconds * 1000, 2) if self.import_seconds is not None else None,
+            'modules_imported': self.modules_imported,
+            'error': str(self._error) if self._error is not None else None,
+        }
+
+
+class LazyServiceRegistry:
+    """Named LazyServices, with an optional background pre-warm"""
+
+    def __init__(self, services: Optional[Dict[str, Tuple[str, Tuple[str, ...]]]] = None):
+        """
+        Args:
+            services: Service name -> (module, required packages); defaults to HEAVY_SERVICES
+        """
+        self._services = {
+            name: LazyService(name, module, requires)
+            for name, (module, requires) in (services if services is not None else HEAVY_SERVICES).items()
+        }
+        self.prewarm_thread: Optional[threading.Thread] = None
+
+    def available(self, name: str) -> bool:
+        return self._services[name].available
+
+    def load(self, name: str) -> Any:
+        return self._services[name].load()
+
+    def symbol(self, name: str, attr: str) -> Any:
+        """An attribute (usually a class) of a service's module, importing it on first use"""
+        return getattr(self.load(name), attr)
+
+    def prewarm(self, names: Optional[Iterable[str]] = None, delay_seconds: float = 0) -> threading.Thread:
+        """
+        Import available services in a daemon thread
+
+        Args:
+            names: Services to import (default: all); unavailable ones are skipped
+            delay_seconds: Wait before the first import, so startup requests go first
+        """
+        selected = [self._services[name] for name in (names if names is not None else self._services)]
+
+        def run():
+            if delay_seconds:
+                time.sleep(delay_seconds)
+            for service in selected:
+                if not service.available:
+                    continue
+                try:
+                    service.load(caller='prewarm')
+                except Exception as e:
+                    print(f"[SERVICES] Pre-warming {service.name} failed: {e}")
+
+        self.prewarm_thread = threading.Thread(target=run, name='service-prewarm', daemon=True)
+        self.prewarm_thread.start()
+        return self.prewarm_thread
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: service.stats() for name, service in self._services.items()}
+
+
+_registry: Optional[LazyServiceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_lazy_services() -> LazyServiceRegistry:
+    """Process-wide registry of HEAVY_SERVICES"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LazyServiceRegistry()
+    return _registry
+
+
+def prewarm_from_env() -> Optional[threading.Thread]:
+    """
+    Start the pre-warm configured by SERVICE_PREWARM
+
+    SERVICE_PREWARM is 'all' or a comma-separated list of service names
+    (unset: no pre-warm); SERVICE_PREWARM_DELAY_SECONDS delays it.
+    """
+    setting = os.getenv("SERVICE_PREWARM", "").strip()
+    if not setting:
+        return None
+    registry = get_lazy_services()
+    names: Optional[List[str]] = None
+    if setting.lower() != 'all':
+        names = [name.strip() for name in setting.split(',') if name.strip() in HEAVY_SERVICES]
+    return registry.prewarm(names, float(os.getenv("SERVICE_PREWARM_DELAY_SECONDS", "0")))
@@ -0,0 +1,109 @@
+"""
+EOQ / ROP Engine
+Economic order quantity, safety stock and reorder points over whole columns
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ACTIONS = np.array(['MAINTAIN', 'ORDER_NOW', 'REDUCE_STOCK'], dtype=object)
+MAINTAIN, ORDER_NOW, REDUCE_STOCK = 0, 1, 2
+
+
+def weekly_forecast_demand(forecast_data: Dict[str, Any]) -> Dict[str, float]:
+    """Average predicted weekly quantity per forecast SKU"""
+    demand = {}
+    for sku, sku_forecast in forecast_data.items():
+        predictions = sku_forecast.get('predictions', []) if isinstance(sku_forecast, dict) else []
+        demand[sku] = sum(p['predicted_quantity'] for p in predictions) / len(predictions) if predictions else 0
+    return demand
+
+
+class ReplenishmentPlan:
+    """
+    Array-backed EOQ/ROP recommendations for every SKU
+
+    All quantities are computed column-wise on construction; recommendation
+    dicts are only built for the rows handed to page().
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        forecast_data: Dict[str, Any],
+        order_cost: float = 50,
+        holding_cost_rate: float = 0.2,
+        lead_time_days: float = 7,
+        service_level: float = 0.95,
+    ):
+        """
+        Args:
+            frame: Inventory rows (sku, product_name, current_stock, max_stock, unit_cost)
+            forecast_data: {sku: {'predictions': [...]}} from the latest forecast
+            order_cost: Fixed cost per order (S)
+            holding_cost_rate: Annual holding cost as a fraction of unit cost
+            lead_time_days: Replenishment lead time
+            service_level: Target service level (picks the z-score)
+        """
+        self._frame = frame
+        self.current_stock = frame['current_stock'].to_numpy(dtype=float)
+        max_stock = frame['max_stock'].to_numpy(dtype=float)
+        unit_cost = frame['unit_cost'].to_numpy(dtype=float)
+
+        # Annual demand from forecast; fall back to a monthly turnover estimate
+        weekly = frame['sku'].map(weekly_forecast_demand(forecast_data)).to_numpy(dtype=float)
+        self.annual_demand = np.where(np.isnan(weekly), self.current_stock * 12, weekly * 52)
+
+        # EOQ = sqrt(2DS / H), zero where holding cost is zero
+        self.holding_cost = unit_cost * holding_cost_rate
+        self.eoq = np.sqrt(np.divide(
+            2 * self.annual_demand * order_cost, self.holding_cost,
+            out=np.zeros_like(self.annual_demand), where=self.holding_cost != 0,
+        ))
+
+        # Safety stock: z-score * weekly demand std (20% variance) scaled to lead time
+        z_score = 1.65 if service_level >= 0.95 else 1.28
+        self.safety_stock = z_score * (self.annual_demand * 0.2 / 52) * (lead_time_days / 7) ** 0.5
+        # ROP = average daily demand * lead time + safety stock
+        self.reorder_point = self.annual_demand / 365 * lead_time_days + self.safety_stock
+
+        order_now = self.current_stock < self.reorder_point
+        reduce = ~order_now & (self.current_stock > max_stock * 0.9)
+        self.action_codes = np.select([order_now, reduce], [ORDER_NOW, REDUCE_STOCK], MAINTAIN)
+        self.order_qty = np.where(order_now, self.eoq, 0.0)
+        # Savings from reduced holding cost on stock above the reorder point
+        self.potential_saving = np.where(reduce, (self.current_stock - self.reorder_point) * self.holding_cost, 0.0)
+
+        self.total_savings = float(self.potential_saving.sum())
+        self.actions_required = int(np.count_nonzero(self.action_codes != MAINTAIN))
+
+    def __len__(self) -> int:
+        return len(self.current_stock)
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recommendation dicts for rows [offset, offset + limit)"""
+        stop = None if limit is None else offset + limit
+        return self._records(np.arange(len(self))[offset:stop])
+
+    def actionable(self) -> List[Dict[str, Any]]:
+        """Recommendation dicts for ORDER_NOW / REDUCE_STOCK rows only"""
+        return self._records(np.flatnonzero(self.action_codes != MAINTAIN))
+
+    def _records(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        order_qty = np.round(self.order_qty[rows], 2)
+        columns = {
+            'sku': self._frame['sku'].iloc[rows].to_numpy(dtype=object),
+            'product_name': self._frame['product_name'].iloc[rows].to_numpy(dtype=object),
+            'current_stock': self.current_stock[rows],
+            'optimal_order_qty': np.round(self.eoq[rows], 2),
+            'reorder_point': np.round(self.reorder_point[rows], 2),
+            'safety_stock': np.round(self.safety_stock[rows], 2),
+            'action': ACTIONS[self.action_codes[rows]],
+            'order_quantity': np.where(self.order_qty[rows] > 0, order_qty, None),
+            'potential_saving': np.round(self.potential_saving[rows], 2),
+            'annual_demand_estimate': np.round(self.annual_demand[rows], 2),
+        }
+        keys = list(columns)
+        values = [column.tolist() for column in columns.values()]
+        return [dict(zip(keys, row)) for row in zip(*values)]
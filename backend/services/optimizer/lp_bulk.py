@@ -0,0 +1,298 @@
+"""
+Bulk Inventory LP
+Array-built inventory LP with an exact decomposed solve for the budget-coupled case
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.services.optimizer.eoq import weekly_forecast_demand
+from backend.services.optimizer.lp_model import LP_DEFAULTS, InventoryLP, _z_score
+
+try:
+    from ortools.linear_solver.python import model_builder_helper as mbh
+    ORTOOLS_AVAILABLE = True
+except ImportError:
+    ORTOOLS_AVAILABLE = False
+
+FEASIBILITY_TOLERANCE = 1e-7
+
+
+class BulkInventoryLP:
+    """
+    The InventoryLP model over whole columns instead of per-SKU Python objects
+
+    Substituting the balance equation (order = target - current + demand)
+    leaves one target and one stockout variable per SKU; the order and
+    safety-stock limits become bounds on target, so the only per-SKU row
+    is the stockout row. SKUs are then coupled only through the budget and
+    capacity rows.
+
+    Without a capacity limit the LP is solved by decomposition: relaxing
+    the budget row with a multiplier splits it into one tiny LP per SKU
+    whose optimum is either its cheapest feasible target or the target
+    that covers demand. The multiplier is found exactly by ranking SKUs on
+    stockout cost saved per unit of spend (a continuous knapsack), so no
+    solver runs at all. With a capacity limit, or decompose=False, the
+    same arrays are loaded into GLOP through the model builder.
+    """
+
+    def __init__(
+        self,
+        inventory_items: Union[pd.DataFrame, List[Dict[str, Any]]],
+        forecast_data: Dict[str, Any],
+        decompose: bool = True,
+    ):
+        """
+        Args:
+            inventory_items: Inventory rows (sku, current_stock, min/max_stock, unit_cost, ...)
+            forecast_data: {sku: {'predictions': [...]}} from the latest forecast
+            decompose: Use the decomposed solve whenever capacity is unlimited
+        """
+        if not ORTOOLS_AVAILABLE:
+            raise ImportError("OR-Tools not installed. Run: pip install ortools")
+
+        self.items = inventory_items
+        self.forecast_data = forecast_data
+        self.decompose = decompose
+        self.lock = threading.Lock()
+        self.solves = 0
+
+        frame = inventory_items if isinstance(inventory_items, pd.DataFrame) else pd.DataFrame(inventory_items)
+        self._frame = frame
+        n = len(frame)
+
+        def column(name: str) -> np.ndarray:
+            if name not in frame:
+                return np.zeros(n)
+            return pd.to_numeric(frame[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+        self.current_stock = column('current_stock')
+        self.min_stock = column('min_stock')
+        self.max_stock = column('max_stock')
+        self.unit_cost = column('unit_cost')
+
+        # Forecast demand, or a monthly turnover estimate for unforecast SKUs
+        skus = frame['sku'] if 'sku' in frame else pd.Series([''] * n)
+        weekly = skus.map(weekly_forecast_demand(forecast_data)).to_numpy(dtype=float)
+        self.demand = np.where(np.isnan(weekly), self.current_stock / 4, weekly)
+
+        # target = shift + order, so 0 <= order <= max_stock bounds target too
+        self.shift = self.current_stock - self.demand
+        self.params: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.current_stock)
+
+    def _coefficients(self, params: Dict[str, float]) -> tuple:
+        holding = self.unit_cost * params['holding_cost_rate'] / 52  # Weekly
+        ordering = params['order_cost'] / (self.demand * 4 + 1)
+        stockout = self.unit_cost * params['stockout_cost_multiplier']
+        safety_stock = _z_score(params['service_level']) * self.demand * 0.2
+        lower = np.maximum.reduce([self.min_stock, safety_stock, self.shift])
+        upper = np.minimum(self.max_stock, self.shift + self.max_stock)
+        return holding, ordering, stockout, lower, upper
+
+    def solve(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        details: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Solve with params (defaults for anything omitted)
+
+        Args:
+            params: LP parameters overriding LP_DEFAULTS
+            details: Build per-SKU recommendations (skip for sweeps)
+            offset: First recommendation to build
+            limit: Recommendation page size (None builds all)
+
+        Returns:
+            Same shape as InventoryLP.solve, plus the budget multiplier
+            when the decomposed solve was used
+        """
+        params = {**LP_DEFAULTS, **{k: v for k, v in (params or {}).items() if k in LP_DEFAULTS}}
+        with self.lock:
+            start = time.perf_counter()
+            self.params = params
+            self.solves += 1
+            holding, ordering, stockout, lower, upper = self._coefficients(params)
+            if np.any(lower > upper + FEASIBILITY_TOLERANCE):
+                return {"error": "Optimization problem is infeasible", "solver_status": 'infeasible'}
+
+            if self.decompose and params['capacity_limit'] == float('inf'):
+                solved = self._solve_decomposed(params, holding, ordering, stockout, lower, upper)
+            else:
+                solved = self._solve_glop(params, holding, ordering, stockout, lower, upper)
+            if 'error' in solved:
+                return solved
+
+            target = solved.pop('target')
+            order = target - self.shift
+            shortfall = np.maximum(self.demand - target, 0)
+            solved_at = time.perf_counter()
+            result = self._extract(target, order, offset, limit) if details else {}
+            timings = solved.pop('timings', {})
+            timings['solve'] = solved_at - start - timings.get('model_build', 0.0)
+            timings['extraction'] = time.perf_counter() - solved_at
+            demand = self.demand.sum()
+            result.update(solved)
+            result.update({
+                'kpis': {
+                    'order_spend': float(self.unit_cost @ order),
+                    'target_inventory': float(target.sum()),
+                    'stockout_units': float(shortfall.sum()),
+                    'fill_rate': float(1 - shortfall.sum() / demand) if demand > 0 else 1.0,
+                },
+                'objective_value': float(holding @ target + ordering @ order + stockout @ shortfall),
+                'warm_start': False,
+                # Size of the LP being solved, whether or not GLOP runs
+                'variables': 2 * len(self),
+                'constraints': len(self) + sum(params[k] != float('inf') for k in ('budget_limit', 'capacity_limit')),
+                'timings': timings,
+            })
+            return result
+
+    def _solve_decomposed(self, params, holding, ordering, stockout, lower, upper) -> Dict[str, Any]:
+        # Per SKU, cost falls with target at (stockout - holding - ordering) per
+        # unit until demand is covered and rises after it, so each SKU sits at
+        # its lower bound or at demand clipped into its bounds.
+        gain = stockout - holding - ordering
+        covered = np.clip(self.demand, lower, upper)
+        upgrade = np.where(gain > 0, covered - lower, 0.0)
+        spend = self.unit_cost * upgrade
+
+        budget = params['budget_limit'] - float(self.unit_cost @ (lower - self.shift))
+        if budget < -FEASIBILITY_TOLERANCE * max(1.0, abs(params['budget_limit'])):
+            return {"error": "Optimization problem is infeasible", "solver_status": 'infeasible'}
+
+        multiplier = 0.0
+        if spend.sum() <= budget:
+            target = lower + upgrade
+        else:
+            # Fund upgrades by stockout cost saved per unit of spend; the SKU
+            # the budget runs out on is partially funded and prices the row
+            ratio = np.divide(gain, self.unit_cost, out=np.full_like(gain, np.inf), where=self.unit_cost > 0)
+            ranked = np.argsort(-ratio, kind='stable')
+            funded = np.cumsum(spend[ranked])
+            marginal = int(np.searchsorted(funded, budget, side='right'))
+            fraction = np.zeros(len(self))
+            fraction[ranked[:marginal]] = 1.0
+            if marginal < len(ranked):
+                sku = ranked[marginal]
+                remaining = budget - (funded[marginal - 1] if marginal else 0.0)
+                fraction[sku] = remaining / spend[sku]
+                multiplier = float(ratio[sku])
+            target = lower + upgrade * fraction
+
+        return {
+            'target': target,
+            'solver_status': 'optimal',
+            'solve_mode': 'decomposed',
+            'budget_multiplier': multiplier,
+            'iterations': 0,
+        }
+
+    def _solve_glop(self, params, holding, ordering, stockout, lower, upper) -> Dict[str, Any]:
+        start = time.perf_counter()
+        n = len(self)
+        model = mbh.ModelBuilderHelper()
+        continuous = np.zeros(n, dtype=bool)
+        target_vars = model.add_var_array_with_bounds(lower, upper, continuous, 'inventory')
+        stockout_vars = model.add_var_array_with_bounds(np.zeros(n), np.full(n, np.inf), continuous, 'stockout')
+        target_index = target_vars.tolist()
+        model.set_objective_coefficients(target_index, (holding + ordering).tolist())
+        model.set_objective_coefficients(stockout_vars.tolist(), stockout.tolist())
+        model.set_objective_offset(-float(ordering @ self.shift))
+
+        # Stockout slack: stockout + target >= demand
+        add_row, set_lb, add_term = model.add_linear_constraint, model.set_constraint_lower_bound, model.add_term_to_constraint
+        for target_var, stockout_var, demand in zip(target_index, stockout_vars.tolist(), self.demand.tolist()):
+            row = add_row()
+            set_lb(row, demand)
+            add_term(row, target_var, 1.0)
+            add_term(row, stockout_var, 1.0)
+
+        for limit, offset, coefficients in (
+            (params['budget_limit'], -float(self.unit_cost @ self.shift), self.unit_cost),
+            (params['capacity_limit'], 0.0, np.ones(n)),
+        ):
+            if limit == float('inf'):
+                continue
+            row = add_row()
+            model.set_constraint_lower_bound(row, -np.inf)
+            model.set_constraint_upper_bound(row, limit - offset)
+            for var, coefficient in zip(target_index, coefficients.tolist()):
+                if coefficient:
+                    add_term(row, var, coefficient)
+
+        built = time.perf_counter() - start
+        solver = mbh.ModelSolverHelper('glop')
+        solver.solve(model)
+        status = solver.status()
+        if status == mbh.SolveStatus.OPTIMAL:
+            solver_status = 'optimal'
+        elif status == mbh.SolveStatus.FEASIBLE:
+            solver_status = 'feasible'
+        else:
+            return {"error": "Optimization problem is infeasible", "solver_status": 'infeasible'}
+        return {
+            'target': np.asarray(solver.variable_values())[:n],
+            'solver_status': solver_status,
+            'solve_mode': 'bulk_lp',
+            'iterations': None,
+            'timings': {'model_build': built},
+        }
+
+    def _extract(self, target: np.ndarray, order: np.ndarray, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        # Same rules as InventoryLP._extract, over columns; rows are only
+        # built for the page and for the actionable rows a run stores
+        order_now = order > 10  # Threshold for ordering
+        reduce = ~order_now & (self.current_stock > target * 1.2)
+        savings = np.where(reduce, (self.current_stock - target) * self.unit_cost * self.params['holding_cost_rate'] / 52, 0.0)
+        # potential_saving reports the running total spread over all SKUs
+        running = np.cumsum(savings)
+        n = len(self)
+        in_page = np.zeros(n, dtype=bool)
+        in_page[offset:None if limit is None else offset + limit] = True
+        actionable = order_now | reduce
+        rows = np.flatnonzero(in_page | actionable)
+        frame = self._frame
+        columns = {
+            'sku': frame['sku'].to_numpy(dtype=object) if 'sku' in frame else np.full(n, '', dtype=object),
+            'product_name': frame['product_name'].to_numpy(dtype=object) if 'product_name' in frame else np.full(n, '', dtype=object),
+            'current_stock': self.current_stock,
+            'optimal_order_qty': np.round(order, 2),
+            'target_inventory': np.round(target, 2),
+            'action': np.select([order_now, reduce], ['ORDER_NOW', 'REDUCE_STOCK'], 'MAINTAIN').astype(object),
+            'order_quantity': np.where(order_now, np.round(order, 2), None),
+            'potential_saving': np.round(running / n, 2) if n else running,
+        }
+        keys = list(columns)
+        values = [column[rows].tolist() for column in columns.values()]
+        built = [dict(zip(keys, row)) for row in zip(*values)]
+        return {
+            'recommendations': [row for row, keep in zip(built, in_page[rows].tolist()) if keep],
+            'actionable': [row for row, keep in zip(built, actionable[rows].tolist()) if keep],
+            'total_savings': float(running[-1]) if n else 0.0,
+            'items_analyzed': n,
+        }
+
+
+def build_inventory_lp(frame: pd.DataFrame, forecast_data: Dict[str, Any]):
+    """
+    Pick the LP implementation for a tenant's inventory size
+
+    Tenants below LP_BULK_MIN_SKUS keep the parametric InventoryLP, whose
+    what-ifs warm-start from the previous basis; larger tenants get
+    BulkInventoryLP, whose Python-side cost is independent of the solver.
+    """
+    if len(frame) < int(os.getenv("LP_BULK_MIN_SKUS", "5000")):
+        return InventoryLP(frame.to_dict('records'), forecast_data)
+    return BulkInventoryLP(frame, forecast_data)
@@ -0,0 +1,293 @@
+"""
+Parametric Inventory LP
+GLOP model built once per tenant whose costs and bounds are updated in place
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+try:
+    from ortools.linear_solver import pywraplp
+    ORTOOLS_AVAILABLE = True
+except ImportError:
+    ORTOOLS_AVAILABLE = False
+
+from backend.utils.caching import TTLCache
+
+
+LP_DEFAULTS: Dict[str, float] = {
+    'holding_cost_rate': 0.2,  # 20% annual
+    'order_cost': 50,  # $50 per order
+    'stockout_cost_multiplier': 5,  # 5x unit cost
+    'service_level': 0.95,  # 95%
+    'budget_limit': float('inf'),  # No limit
+    'capacity_limit': float('inf'),  # No limit on total target inventory
+}
+
+
+def _z_score(service_level: float) -> float:
+    return 1.65 if service_level >= 0.95 else 1.28
+
+
+class InventoryLP:
+    """
+    Inventory cost LP whose parameters can change without a rebuild
+
+    Variables and constraints are created once from the tenant's
+    inventory and forecast. Cost rates become objective coefficients and
+    service level / budget / capacity become constraint bounds, so a
+    what-if only rewrites those numbers and re-solves the retained GLOP
+    instance, which starts from the previous optimal basis.
+    """
+
+    def __init__(self, inventory_items: List[Dict[str, Any]], forecast_data: Dict[str, Any]):
+        """
+        Args:
+            inventory_items: Inventory rows (sku, current_stock, min/max_stock, unit_cost, ...)
+            forecast_data: {sku: {'predictions': [...]}} from the latest forecast
+        """
+        if not ORTOOLS_AVAILABLE:
+            raise ImportError("OR-Tools not installed. Run: pip install ortools")
+
+        self.items = inventory_items
+        self.forecast_data = forecast_data
+        self.lock = threading.Lock()
+        self.solves = 0
+        self.solver = pywraplp.Solver.CreateSolver('GLOP')
+        if not self.solver:
+            raise RuntimeError("Could not create LP solver")
+        solver = self.solver
+
+        self.order_vars = []  # Order quantities for each SKU
+        self.inventory_vars = []  # Target inventory levels
+        self.stockout_vars = []
+        self.safety_constraints = []
+        self.demand = []
+
+        for item in inventory_items:
+            sku = item.get('sku', '')
+            current_stock = float(item.get('current_stock', 0))
+            min_stock = float(item.get('min_stock', 0))
+            max_stock = float(item.get('max_stock', 0))
+
+            # Get forecasted demand
+            if sku in forecast_data:
+                predictions = forecast_data[sku].get('predictions', [])
+                avg_weekly_demand = sum(p['predicted_quantity'] for p in predictions) / len(predictions) if predictions else 0
+            else:
+                # Estimate from current stock
+                avg_weekly_demand = current_stock / 4  # Assume monthly turnover
+
+            order_qty = solver.NumVar(0, max_stock, f'order_{sku}')
+            target_inv = solver.NumVar(min_stock, max_stock, f'inventory_{sku}')
+            stockout = solver.NumVar(0, solver.infinity(), f'stockout_{sku}')
+
+            # Inventory balance: current + order - demand = target
+            solver.Add(target_inv == current_stock + order_qty - avg_weekly_demand)
+            # Service level (safety stock); bound set by set_params
+            self.safety_constraints.append(solver.Add(target_inv >= 0))
+            # Stockout slack: penalize insufficient inventory
+            solver.Add(stockout >= avg_weekly_demand - target_inv)
+
+            self.order_vars.append(order_qty)
+            self.inventory_vars.append(target_inv)
+            self.stockout_vars.append(stockout)
+            self.demand.append(avg_weekly_demand)
+
+        infinity = solver.infinity()
+        self.budget_constraint = solver.Constraint(-infinity, infinity, 'budget')
+        self.capacity_constraint = solver.Constraint(-infinity, infinity, 'capacity')
+        for item, order_qty, target_inv in zip(inventory_items, self.order_vars, self.inventory_vars):
+            self.budget_constraint.SetCoefficient(order_qty, float(item.get('unit_cost', 0)))
+            self.capacity_constraint.SetCoefficient(target_inv, 1)
+
+        self.objective = solver.Objective()
+        self.objective.SetMinimization()
+        self.params: Dict[str, float] = {}
+        self.set_params(LP_DEFAULTS)
+
+    def set_params(self, params: Dict[str, Any]) -> None:
+        """Rewrite objective coefficients and bounds for changed parameters"""
+        params = {**LP_DEFAULTS, **{k: v for k, v in params.items() if k in LP_DEFAULTS}}
+        changed = {k for k, v in params.items() if self.params.get(k) != v}
+        if not changed:
+            return
+        infinity = self.solver.infinity()
+
+        for item, order_qty, target_inv, stockout, demand, safety in zip(
+            self.items, self.order_vars, self.inventory_vars, self.stockout_vars,
+            self.demand, self.safety_constraints,
+        ):
+            unit_cost = float(item.get('unit_cost', 0))
+            if 'holding_cost_rate' in changed:
+                self.objective.SetCoefficient(target_inv, unit_cost * params['holding_cost_rate'] / 52)  # Weekly
+            if 'order_cost' in changed:
+                # Ordering cost, continuous approximation of the fixed cost per order
+                self.objective.SetCoefficient(order_qty, params['order_cost'] / (demand * 4 + 1))
+            if 'stockout_cost_multiplier' in changed:
+                self.objective.SetCoefficient(stockout, unit_cost * params['stockout_cost_multiplier'])
+            if 'service_level' in changed:
+                demand_std = demand * 0.2  # Assume 20% variance
+                safety.SetLb(_z_score(params['service_level']) * demand_std)
+
+        if 'budget_limit' in changed:
+            self.budget_constraint.SetUb(min(params['budget_limit'], infinity))
+        if 'capacity_limit' in changed:
+            self.capacity_constraint.SetUb(min(params['capacity_limit'], infinity))
+        self.params = params
+
+    def solve(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        details: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Apply params (defaults for anything omitted) and re-solve
+
+        Args:
+            params: LP parameters overriding LP_DEFAULTS
+            details: Build per-SKU recommendations (skip for sweeps)
+            offset: First recommendation to build
+            limit: Recommendation page size (None builds all)
+
+        Returns:
+            solver_status, objective_value, iterations, warm_start, kpis,
+            model size and phase timings, plus the recommendations page,
+            actionable rows, total_savings and items_analyzed when details
+            is set
+        """
+        with self.lock:
+            start = time.perf_counter()
+            self.set_params(params or {})
+            solver_params = pywraplp.MPSolverParameters()
+            solver_params.SetIntegerParam(solver_params.INCREMENTALITY, solver_params.INCREMENTALITY_ON)
+            warm_start = self.solves > 0
+            status = self.solver.Solve(solver_params)
+            self.solves += 1
+            solved_at = time.perf_counter()
+
+            if status == pywraplp.Solver.OPTIMAL:
+                solver_status = 'optimal'
+            elif status == pywraplp.Solver.FEASIBLE:
+                solver_status = 'feasible'
+            else:
+                return {
+                    "error": "Optimization problem is infeasible",
+                    "solver_status": 'infeasible'
+                }
+            result = self._extract(offset, limit) if details else {}
+            result.update({
+                'kpis': self._kpis(),
+                'solver_status': solver_status,
+                'objective_value': self.objective.Value(),
+                'iterations': self.solver.iterations(),
+                'warm_start': warm_start,
+                'solve_mode': 'parametric',
+                'variables': self.solver.NumVariables(),
+                'constraints': self.solver.NumConstraints(),
+                'timings': {'solve': solved_at - start, 'extraction': time.perf_counter() - solved_at},
+            })
+            return result
+
+    def _kpis(self) -> Dict[str, float]:
+        """Plan-level spend and service figures for the current solution"""
+        demand = sum(self.demand)
+        stockout = sum(var.solution_value() for var in self.stockout_vars)
+        return {
+            'order_spend': sum(
+                var.solution_value() * float(item.get('unit_cost', 0)) for var, item in zip(self.order_vars, self.items)
+            ),
+            'target_inventory': sum(var.solution_value() for var in self.inventory_vars),
+            'stockout_units': stockout,
+            'fill_rate': 1 - stockout / demand if demand > 0 else 1.0,
+        }
+
+    def _extract(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        # Rows are only built for the page and for the actionable rows a run stores
+        holding_cost_rate = self.params['holding_cost_rate']
+        stop = len(self.items) if limit is None else offset + limit
+        recommendations = []
+        actionable = []
+        total_savings = 0.0
+        for i, (item, order_var, inventory_var) in enumerate(zip(self.items, self.order_vars, self.inventory_vars)):
+            sku = item.get('sku', '')
+            current_stock = float(item.get('current_stock', 0))
+            unit_cost = float(item.get('unit_cost', 0))
+
+            optimal_order = order_var.solution_value()
+            optimal_inventory = inventory_var.solution_value()
+
+            # Determine action
+            if optimal_order > 10:  # Threshold for ordering
+                action = "ORDER_NOW"
+                order_qty = optimal_order
+            elif current_stock > optimal_inventory * 1.2:
+                action = "REDUCE_STOCK"
+                order_qty = 0
+                excess = current_stock - optimal_inventory
+                potential_saving = excess * unit_cost * holding_cost_rate / 52
+                total_savings += potential_saving
+            else:
+                action = "MAINTAIN"
+                order_qty = 0
+
+            in_page = offset <= i < stop
+            if action == "MAINTAIN" and not in_page:
+                continue
+            row = {
+                'sku': sku,
+                'product_name': item.get('product_name', ''),
+                'current_stock': current_stock,
+                'optimal_order_qty': round(optimal_order, 2),
+                'target_inventory': round(optimal_inventory, 2),
+                'action': action,
+                'order_quantity': round(order_qty, 2) if order_qty > 0 else None,
+                'potential_saving': round(total_savings / len(self.items), 2)
+            }
+            if in_page:
+                recommendations.append(row)
+            if action != "MAINTAIN":
+                actionable.append(row)
+        return {
+            'recommendations': recommendations,
+            'actionable': actionable,
+            'total_savings': total_savings,
+            'items_analyzed': len(self.items),
+        }
+
+
+class LPModelCache:
+    """Per-tenant InventoryLP instances, rebuilt when the tenant's data version changes"""
+
+    def __init__(self, max_tenants: int = 32):
+        self.max_tenants = max_tenants
+        self._models = TTLCache(max_tenants)
+
+    def get(self, tenant_id: str, version: Hashable) -> Optional[InventoryLP]:
+        entry = self._models.get(tenant_id)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put(self, tenant_id: str, version: Hashable, model: InventoryLP) -> None:
+        self._models.put(tenant_id, (version, model))
+
+    def invalidate(self, tenant_id: str) -> None:
+        self._models.pop(tenant_id)
+
+
+_cache: Optional[LPModelCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_lp_model_cache() -> LPModelCache:
+    """Process-wide LP model cache sized by LP_MODEL_CACHE_SIZE"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LPModelCache(int(os.getenv("LP_MODEL_CACHE_SIZE", "32")))
+    return _cache
@@ -0,0 +1,173 @@
+"""
+Scenario Sweep
+Solves a grid of inventory LP parameter scenarios and builds a cost/service frontier
+"""
+import asyncio
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from backend.services.optimizer.lp_model import LP_DEFAULTS, InventoryLP
+
+FRONTIER_COLUMNS = [
+    'scenario', 'holding_cost_rate', 'order_cost', 'service_level', 'budget_limit',
+    'stockout_cost_multiplier', 'capacity_limit', 'status', 'total_cost',
+    'fill_rate', 'order_spend', 'stockout_units', 'iterations', 'solve_ms',
+]
+
+
+def scenario_grid(grid: Dict[str, Sequence[float]], max_scenarios: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Cartesian product of parameter values, last parameter varying fastest
+
+    Neighbouring scenarios differ in one parameter, which keeps warm
+    starts close to the previous basis.
+
+    Raises:
+        ValueError: Unknown parameter, non-numeric value or too many scenarios
+    """
+    max_scenarios = max_scenarios or int(os.getenv("SWEEP_MAX_SCENARIOS", "500"))
+    unknown = set(grid) - set(LP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    values = []
+    for name in names:
+        options = grid[name] if isinstance(grid[name], (list, tuple)) else [grid[name]]
+        if not options or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in options):
+            raise ValueError(f"Sweep parameter {name} needs a non-empty list of numbers")
+        values.append([float(v) for v in options])
+
+    count = 1
+    for options in values:
+        count *= len(options)
+    if count > max_scenarios:
+        raise ValueError(f"Sweep has {count} scenarios; the limit is {max_scenarios}")
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def scenario_row(index: int, params: Dict[str, float], solved: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+    """Compact result row for one solved scenario"""
+    effective = {**LP_DEFAULTS, **params}
+    row = {
+        'scenario': index,
+        **{name: (None if effective[name] == float('inf') else effective[name]) for name in LP_DEFAULTS},
+        'status': solved['solver_status'],
+        'solve_ms': round(elapsed * 1000, 2),
+    }
+    if 'error' in solved:
+        row.update({'total_cost': None, 'fill_rate': None, 'order_spend': None, 'stockout_units': None, 'iterations': None})
+        return row
+    kpis = solved['kpis']
+    row.update({
+        'total_cost': round(solved['objective_value'], 2),
+        'fill_rate': round(kpis['fill_rate'], 4),
+        'order_spend': round(kpis['order_spend'], 2),
+        'stockout_units': round(kpis['stockout_units'], 2),
+        'iterations': solved['iterations'],
+    })
+    return row
+
+
+def solve_scenarios(model: InventoryLP, scenarios: List[tuple]) -> List[Dict[str, Any]]:
+    """Solve (index, params) scenarios in order on one model, warm-starting each from the last"""
+    rows = []
+    for index, params in scenarios:
+        start = time.perf_counter()
+        solved = model.solve(params, details=False)
+        rows.append(scenario_row(index, params, solved, time.perf_counter() - start))
+    return rows
+
+
+_worker_model: Optional[InventoryLP] = None
+
+
+def _init_worker(model_class: type, inventory_items: Any, forecast_data: Dict[str, Any]) -> None:
+    # Each worker builds the LP once and reuses it for every chunk it receives
+    global _worker_model
+    _worker_model = model_class(inventory_items, forecast_data)
+
+
+def _solve_chunk(scenarios: List[tuple]) -> List[Dict[str, Any]]:
+    return solve_scenarios(_worker_model, scenarios)
+
+
+def cost_service_frontier(rows: List[Dict[str, Any]]) -> List[int]:
+    """Scenario indices on the Pareto frontier of lowest cost vs highest fill rate"""
+    feasible = sorted(
+        (row for row in rows if row['total_cost'] is not None),
+        key=lambda row: (row['total_cost'], -row['fill_rate']),
+    )
+    frontier = []
+    best_fill = -1.0
+    for row in feasible:
+        if row['fill_rate'] > best_fill:
+            frontier.append(row['scenario'])
+            best_fill = row['fill_rate']
+    return frontier
+
+
+def frontier_table(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rows as a column-oriented table plus the frontier scenario indices"""
+    rows = sorted(rows, key=lambda row: row['scenario'])
+    return {
+        'columns': FRONTIER_COLUMNS,
+        'rows': [[row[column] for column in FRONTIER_COLUMNS] for row in rows],
+        'frontier': cost_service_frontier(rows),
+        'scenarios': len(rows),
+        'infeasible': sum(1 for row in rows if row['total_cost'] is None),
+    }
+
+
+class ScenarioSweep:
+    """Runs a scenario grid against one tenant's LP, streaming rows as they finish"""
+
+    def __init__(self, model: InventoryLP, max_workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        """
+        Args:
+            model: The tenant's InventoryLP or BulkInventoryLP (its data is shipped to workers once)
+            max_workers: Worker processes (env SWEEP_WORKERS); 1 solves in a thread
+            chunk_size: Consecutive scenarios per worker task (env SWEEP_CHUNK_SIZE)
+        """
+        self.model = model
+        self.max_workers = max_workers or int(os.getenv("SWEEP_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+        self.chunk_size = chunk_size or int(os.getenv("SWEEP_CHUNK_SIZE", "8"))
+
+    async def stream(self, scenarios: List[Dict[str, float]]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one scenario row per solved scenario, in completion order"""
+        indexed = list(enumerate(scenarios))
+        chunks = [indexed[i:i + self.chunk_size] for i in range(0, len(indexed), self.chunk_size)]
+
+        if self.max_workers <= 1 or len(chunks) <= 1:
+            # Not worth starting processes: re-solve the retained model in a thread
+            for chunk in chunks:
+                for row in await asyncio.to_thread(solve_scenarios, self.model, chunk):
+                    yield row
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(type(self.model), self.model.items, self.model.forecast_data),
+        )
+        try:
+            futures = [loop.run_in_executor(executor, _solve_chunk, chunk) for chunk in chunks]
+            for future in asyncio.as_completed(futures):
+                for row in await future:
+                    yield row
+        finally:
+            # Also reached when the client disconnects mid-stream
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, scenarios: List[Dict[str, float]]) -> Dict[str, Any]:
+        """Solve every scenario and return the frontier table"""
+        start = time.perf_counter()
+        rows = [row async for row in self.stream(scenarios)]
+        table = frontier_table(rows)
+        table['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return table
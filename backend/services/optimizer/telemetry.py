@@ -0,0 +1,112 @@
+"""
+Solver Telemetry
+Per-phase timings and model size for optimization runs, exported as histograms
+"""
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from backend.utils.metrics import DURATION_BUCKETS, SIZE_BUCKETS, get_metrics_registry
+
+PHASES = ('data_load', 'model_build', 'solve', 'extraction', 'persist')
+
+
+def _histograms() -> Dict[str, Any]:
+    registry = get_metrics_registry()
+    return {
+        'phase': registry.histogram(
+            'optimization_phase_seconds', 'Time spent per optimization phase',
+            ('problem_type', 'phase'), DURATION_BUCKETS,
+        ),
+        'total': registry.histogram(
+            'optimization_run_seconds', 'End-to-end optimization time',
+            ('problem_type',), DURATION_BUCKETS,
+        ),
+        'variables': registry.histogram(
+            'optimization_model_variables', 'Decision variables per solved model',
+            ('problem_type',), SIZE_BUCKETS,
+        ),
+        'constraints': registry.histogram(
+            'optimization_model_constraints', 'Constraints per solved model',
+            ('problem_type',), SIZE_BUCKETS,
+        ),
+        'iterations': registry.histogram(
+            'optimization_solver_iterations', 'Solver iterations per solve',
+            ('problem_type',), SIZE_BUCKETS,
+        ),
+    }
+
+
+class RunTelemetry:
+    """
+    Collects timings and model size for one optimization run
+
+    Phases may be entered more than once; their durations add up.
+    """
+
+    def __init__(self, problem_type: str):
+        """
+        Args:
+            problem_type: optimization_runs.problem_type (used as a metric label)
+        """
+        self.problem_type = problem_type
+        self.timings: Dict[str, float] = {}
+        self.details: Dict[str, Any] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def record_solve(self, solved: Dict[str, Any]) -> None:
+        """Take phase timings, model size and iterations reported by a model's solve()"""
+        for name, seconds in solved.get('timings', {}).items():
+            self.add_timing(name, seconds)
+        for key in ('variables', 'constraints', 'iterations', 'solve_mode', 'warm_start'):
+            if solved.get(key) is not None:
+                self.details[key] = solved[key]
+
+    @property
+    def solve_time_seconds(self) -> Optional[float]:
+        return self.timings.get('solve')
+
+    def summary(self) -> Dict[str, Any]:
+        """Timings (seconds, phase order) and model details for optimization_runs.extra_data"""
+        timings = {name: round(self.timings[name], 6) for name in PHASES if name in self.timings}
+        timings.update({name: round(value, 6) for name, value in self.timings.items() if name not in timings})
+        return {
+            'timings': timings,
+            'total_seconds': round(time.perf_counter() - self._started, 6),
+            **self.details,
+        }
+
+    def export(self) -> None:
+        """Observe this run in the process-wide histograms"""
+        histograms = _histograms()
+        for name, seconds in self.timings.items():
+            histograms['phase'].observe(seconds, problem_type=self.problem_type, phase=name)
+        histograms['total'].observe(time.perf_counter() - self._started, problem_type=self.problem_type)
+        for key in ('variables', 'constraints', 'iterations'):
+            if isinstance(self.details.get(key), (int, float)):
+                histograms[key].observe(self.details[key], problem_type=self.problem_type)
+
+
+async def update_run_telemetry(cur, run_id: str, telemetry: RunTelemetry) -> None:
+    """
+    Rewrite a stored run's extra_data with the final summary
+
+    The INSERT cannot carry its own duration, so the persist phase is
+    written back in the same transaction, just before commit.
+    """
+    await cur.execute(
+        "UPDATE optimization_runs SET extra_data = %s WHERE run_id = %s",
+        [json.dumps(telemetry.summary()), run_id]
+    )
@@ -0,0 +1,119 @@
+"""
+Metrics
+In-process histograms rendered in the Prometheus text exposition format
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds, from a cache-hit re-solve up to a cold 100k-SKU build
+DURATION_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Variables, constraints, iterations and row counts
+SIZE_BUCKETS: Tuple[float, ...] = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DURATION_BUCKETS):
+        """
+        Args:
+            name: Metric name (snake_case, unit suffixed)
+            documentation: HELP text
+            labelnames: Label keys every observation must supply
+            buckets: Upper bounds; +Inf is appended
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            # [bucket counts..., sum, count]
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """Per-label-set buckets, sum and count"""
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        return [
+            {
+                'labels': dict(zip(self.labelnames, key)),
+                'buckets': dict(zip(self.buckets, series[:-2])),
+                'sum': series[-2],
+                'count': series[-1],
+            }
+            for key, series in items
+        ]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for entry in self.snapshot():
+            labels = [f'{name}="{_escape(value)}"' for name, value in entry['labels'].items()]
+            for bound, count in entry['buckets'].items():
+                bucket_labels = ','.join(labels + [f'le="{_format_value(bound)}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+            suffix = f"{{{','.join(labels)}}}" if labels else ''
+            lines.append(f"{self.name}_sum{suffix} {_format_value(entry['sum'])}")
+            lines.append(f"{self.name}_count{suffix} {entry['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named histograms shared across the process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DURATION_BUCKETS) -> Histogram:
+        """Get or create a histogram; later calls return the first registration"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+            return self._metrics[name]
+
+    def get(self, name: str) -> Optional[Histogram]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
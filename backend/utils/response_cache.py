@@ -0,0 +1,192 @@
+"""
+Response Cache
+Serialized GET responses keyed by tenant data version, served with ETags and 304s
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.utils.caching import TTLCache
+
+# Bumped in the transaction of every write that changes a cached read
+# (connector CRUD/sync, CSV uploads, ELT, forecasts, optimizations), so
+# every API process and worker agrees on the version
+BUMP_VERSION_SQL = """
+    INSERT INTO tenant_data_versions (tenant_id, version, updated_at)
+    VALUES (%s, 1, NOW())
+    ON CONFLICT (tenant_id) DO UPDATE
+        SET version = tenant_data_versions.version + 1, updated_at = NOW()
+"""
+
+VERSION_SQL = "SELECT version FROM tenant_data_versions WHERE tenant_id = %s"
+
+
+def bump_data_version(cur, tenant_id: str) -> None:
+    """Advance a tenant's data version on an open cursor; the caller commits"""
+    cur.execute(BUMP_VERSION_SQL, [tenant_id])
+
+
+async def bump_data_version_async(cur, tenant_id: str) -> None:
+    """bump_data_version for an async cursor"""
+    await cur.execute(BUMP_VERSION_SQL, [tenant_id])
+
+
+async def data_version(async_backend, tenant_id: str) -> int:
+    """Current data version of a tenant (0 before its first write)"""
+    async with async_backend.get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(VERSION_SQL, [tenant_id])
+            row = await cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+def etag_for(*parts: Any) -> str:
+    """Weak ETag over the parts identifying a representation"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\x1f')
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match evaluation (weak comparison, lists and '*')"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in candidates)
+
+
+class LocalStore:
+    """
+    In-process stand-in for the shared tier
+
+    Implements the get/set(ex=) subset of the Redis client API the cache
+    uses, so the shared tier can be exercised without a server.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._values: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and self._clock() >= expires:
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ex: Optional[float] = None) -> bool:
+        with self._lock:
+            self._values[key] = (self._clock() + ex if ex else None, value)
+        return True
+
+
+class ResponseCache:
+    """
+    Two-tier cache of serialized responses
+
+    A bounded in-process LRU in front of an optional shared store (a Redis
+    client or LocalStore). Keys embed the data version, so writes make old
+    entries unreachable without explicit invalidation; TTLs only reclaim
+    memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300,
+        shared=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Responses kept in process before the least recent is dropped
+            ttl_seconds: Lifetime of an entry in either tier
+            shared: Optional store with get(key) and set(key, value, ex=seconds)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._entries = TTLCache(max_entries, ttl_seconds, clock)
+        self._lock = threading.Lock()
+        self.shared_hits = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """(etag, body) for a key, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        if self.shared is not None:
+            try:
+                payload = self.shared.get(key)
+            except Exception:
+                payload = None
+            if payload:
+                etag, _, body = bytes(payload).partition(b'\n')
+                self._entries.put(key, (etag.decode('ascii'), body))
+                with self._lock:
+                    self.shared_hits += 1
+                return etag.decode('ascii'), body
+        return None
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        self._entries.put(key, (etag, body))
+        if self.shared is not None:
+            try:
+                self.shared.set(key, etag.encode('ascii') + b'\n' + body, ex=self.ttl_seconds)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        with self._lock:
+            shared_hits = self.shared_hits
+        return {
+            'entries': stats['entries'],
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'shared': type(self.shared).__name__ if self.shared is not None else None,
+            'hits': stats['hits'],
+            'shared_hits': shared_hits,
+            'misses': stats['misses'] - shared_hits,  # In-process misses served by the shared tier are not misses
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Process-wide response cache
+
+    Configured by RESPONSE_CACHE_SIZE and RESPONSE_CACHE_TTL_SECONDS; set
+    RESPONSE_CACHE_REDIS_URL to share entries between processes.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = None
+                redis_url = os.getenv("RESPONSE_CACHE_REDIS_URL")
+                if redis_url:
+                    try:
+                        import redis
+                    except ImportError:
+                        raise ImportError("RESPONSE_CACHE_REDIS_URL requires redis. Run: pip install redis")
+                    shared = redis.Redis.from_url(redis_url, socket_timeout=0.2)
+                _cache = ResponseCache(
+                    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+                    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+                    shared=shared,
+                )
+    return _cache
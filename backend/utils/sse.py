@@ -0,0 +1,66 @@
+"""
+Server-Sent Events
+Frames from a producer run off the response loop, with keep-alives and disconnect cancellation
+"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+KEEP_ALIVE = ": keep-alive\n\n"
+_DONE = object()
+
+
+async def with_heartbeats(
+    frames: AsyncIterator[str],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    interval: float = 15.0,
+    buffer: int = 256,
+) -> AsyncIterator[str]:
+    """
+    Relay SSE frames, sending a keep-alive comment whenever the producer is quiet
+
+    The producer runs in its own task so a slow node never holds back
+    keep-alives. When the client goes away (or the response is closed) the
+    producer task is cancelled and its generator closed, which stops any
+    pending LLM call or query it is awaiting.
+
+    Args:
+        frames: Async iterator of pre-formatted SSE frames
+        is_disconnected: Request.is_disconnected (checked on each quiet interval)
+        interval: Seconds of silence before a keep-alive is sent
+        buffer: Frames queued ahead of a slow client before the producer waits
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+
+    async def produce() -> None:
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+        except Exception as e:
+            await queue.put(e)
+            return
+        finally:
+            if hasattr(frames, 'aclose'):
+                await frames.aclose()
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield KEEP_ALIVE
+                continue
+            if frame is _DONE:
+                return
+            if isinstance(frame, Exception):
+                raise frame
+            yield frame
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Benchmark coaching-memory recall latency (HNSW vs exact scan) against session count."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import pathlib
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from backend.services.coach.memory import ConversationMemory, HashingEmbedder, vector_literal  # noqa: E402
+from backend.utils.database import as_async_backend, get_backend  # noqa: E402
+
+SKUS = [f"SKU-{i:03d}" for i in range(200)]
+TEMPLATES = [
+    "Why is {sku} overstocked?",
+    "Forecast demand for {sku} next month",
+    "What if holding costs for {sku} increase by {pct}%?",
+    "Should I reorder {sku} now?",
+    "How can I reduce costs on {sku}?",
+    "What is the service level for {sku}?",
+]
+# Free-text context appended to questions so seeded turns are not exact duplicates
+VOCABULARY = [f"{stem}{i}" for stem in ("store", "supplier", "season", "promo", "region") for i in range(100)]
+TAG = "benchmark_coach_memory"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark coaching-memory retrieval latency.")
+    parser.add_argument("--tenant-id", default="00000000-0000-0000-0000-000000000001", help="Existing tenant to seed sessions under.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--turns", type=int, default=6, help="Turns per seeded session.")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=500, help="Sessions embedded and inserted per batch.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded sessions.")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args()
+
+
+def question(rng: np.random.Generator) -> str:
+    template = TEMPLATES[rng.integers(len(TEMPLATES))]
+    context = " ".join(VOCABULARY[i] for i in rng.integers(len(VOCABULARY), size=3))
+    return template.format(sku=SKUS[rng.integers(len(SKUS))], pct=int(rng.integers(5, 50))) + f" ({context})"
+
+
+async def seed(memory: ConversationMemory, tenant_id: str, sessions: int, turns: int, batch: int, rng) -> None:
+    for start in range(0, sessions, batch):
+        count = min(batch, sessions - start)
+        session_ids = [str(uuid.uuid4()) for _ in range(count)]
+        rows = [(sid, i, question(rng)) for sid in session_ids for i in range(turns)]
+        vectors = await memory.embed([f"{q}\nAnswer for {q}" for _, _, q in rows])
+        async with memory.async_backend.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO coaching_sessions
+                    (session_id, tenant_id, messages, created_at, updated_at, extra_data)
+                    SELECT sid, %s, '[]'::jsonb, NOW(), NOW(), %s::jsonb FROM unnest(%s::uuid[]) AS t(sid)
+                    """,
+                    [tenant_id, json.dumps({"source": TAG}), session_ids]
+                )
+                await cur.execute(
+                    """
+                    INSERT INTO coaching_turns
+                    (turn_id, session_id, tenant_id, turn_index, question, answer, intent, embedding, created_at)
+                    SELECT gen_random_uuid(), sid, %s, idx, q, 'Answer for ' || q, 'overview', e::vector, NOW()
+                      FROM unnest(%s::uuid[], %s::int[], %s::text[], %s::text[]) AS t(sid, idx, q, e)
+                    """,
+                    [
+                        tenant_id,
+                        [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows],
+                        [vector_literal(v) for v in vectors],
+                    ]
+                )
+                await conn.commit()
+
+
+async def vacuum(memory: ConversationMemory) -> None:
+    """Refresh planner stats and purge deleted tuples (HNSW scans skip them, returning fewer rows)"""
+    async with memory.async_backend.get_connection() as conn:
+        await conn.raw.execute("VACUUM ANALYZE coaching_turns")
+
+
+async def timed_recall(memory: ConversationMemory, tenant_id: str, session_id: str, questions: List[str], exact: bool):
+    latencies, results = [], []
+    for q in questions:
+        start = time.perf_counter()
+        if exact:
+            [vector] = await memory.embed([q])
+            async with memory.async_backend.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT set_config('enable_indexscan', 'off', true)")
+                    await cur.execute(
+                        """
+                        SELECT session_id, turn_index, embedding <=> %s::vector FROM coaching_turns
+                         WHERE tenant_id = %s AND embedding IS NOT NULL
+                         ORDER BY embedding <=> %s::vector LIMIT %s
+                        """,
+                        [vector_literal(vector), tenant_id, vector_literal(vector), memory.top_k]
+                    )
+                    distances = [d for _, _, d in await cur.fetchall()]
+        else:
+            distances = [t["distance"] for t in await memory.recall(tenant_id, session_id, q)]
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(distances)
+    return latencies, results
+
+
+def recall_at_k(approximate: List[List[float]], exact: List[List[float]]) -> float:
+    """Share of approximate results at least as close as the exact k-th neighbour (tie-safe)"""
+    scores = []
+    for found, truth in zip(approximate, exact):
+        if not truth:
+            continue
+        cutoff = truth[-1] + 1e-6
+        scores.append(sum(1 for d in found if d <= cutoff) / len(truth))
+    return statistics.mean(scores) if scores else 1.0
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = np.random.default_rng(args.seed)
+    # recent_turns=0 and no distance cut-off, so HNSW and exact return comparable sets
+    memory = ConversationMemory(get_backend(), HashingEmbedder(), recent_turns=0, top_k=args.k)
+    memory.max_distance = 2.0
+    memory.async_backend = as_async_backend(get_backend())
+    probe = await memory.open_session(args.tenant_id)
+    questions = [question(rng) for _ in range(args.queries)]
+
+    report: Dict[str, Any] = {"turns_per_session": args.turns, "k": args.k, "queries": args.queries, "results": []}
+    seeded = 0
+    try:
+        for target in sorted(args.sessions):
+            started = time.perf_counter()
+            await seed(memory, args.tenant_id, target - seeded, args.turns, args.batch, rng)
+            seed_seconds = time.perf_counter() - started
+            seeded = target
+            await vacuum(memory)
+
+            hnsw_ms, hnsw_found = await timed_recall(memory, args.tenant_id, probe, questions, exact=False)
+            exact_ms, exact_found = await timed_recall(memory, args.tenant_id, probe, questions, exact=True)
+            row = {
+                "sessions": target,
+                "turns": target * args.turns,
+                "seed_seconds": round(seed_seconds, 2),
+                "hnsw": summarize(hnsw_ms),
+                "exact": summarize(exact_ms),
+                "recall_at_k": round(recall_at_k(hnsw_found, exact_found), 3),
+            }
+            report["results"].append(row)
+            print(json.dumps(row))
+    finally:
+        if not args.keep:
+            async with memory.async_backend.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "DELETE FROM coaching_sessions WHERE tenant_id = %s AND (extra_data->>'source' = %s OR session_id = %s)",
+                        [args.tenant_id, TAG, probe]
+                    )
+                    await conn.commit()
+            await vacuum(memory)
+    return report
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
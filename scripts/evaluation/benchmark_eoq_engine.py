@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized EOQ/ROP engine against the per-item loop."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from backend.services.optimizer.eoq import ReplenishmentPlan  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark EOQ/ROP inventory optimization.")
+    parser.add_argument("--skus", type=int, nargs="+", default=[1_000, 20_000, 200_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--forecast-share", type=float, default=0.5, help="Fraction of SKUs with a forecast.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args()
+
+
+def make_inputs(n: int, forecast_share: float, seed: int):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "sku": [f"SKU-{i:07d}" for i in range(n)],
+        "product_name": [f"Product {i}" for i in range(n)],
+        "current_stock": rng.integers(0, 1_000, n).astype(float),
+        "min_stock": rng.integers(10, 100, n).astype(float),
+        "max_stock": rng.integers(200, 1_200, n).astype(float),
+        "unit_cost": rng.uniform(0.5, 250, n).round(2),
+        "location": "Warehouse A",
+    })
+    forecast = {
+        sku: {"predictions": [{"predicted_quantity": float(q)} for q in rng.gamma(2.0, 10.0, 4).round(1)]}
+        for sku in frame["sku"].sample(frac=forecast_share, random_state=seed)
+    }
+    return frame, forecast
+
+
+def loop_optimize(items: List[Dict[str, Any]], forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The original per-item implementation with default parameters, kept for comparison."""
+    order_cost, holding_cost_rate, lead_time_days, service_level = 50, 0.2, 7, 0.95
+    recommendations = []
+    total_savings = 0.0
+    for item in items:
+        sku = item.get("sku", "")
+        current_stock = float(item.get("current_stock", 0))
+        max_stock = float(item.get("max_stock", 0))
+        unit_cost = float(item.get("unit_cost", 0))
+        if sku in forecast_data:
+            predictions = forecast_data[sku].get("predictions", [])
+            avg_weekly_demand = sum(p["predicted_quantity"] for p in predictions) / len(predictions) if predictions else 0
+            annual_demand = avg_weekly_demand * 52
+        else:
+            annual_demand = current_stock * 12
+        holding_cost = unit_cost * holding_cost_rate
+        eoq = 0 if holding_cost == 0 else ((2 * annual_demand * order_cost) / holding_cost) ** 0.5
+        z_score = 1.65 if service_level >= 0.95 else 1.28
+        safety_stock = z_score * (annual_demand * 0.2 / 52) * (lead_time_days / 7) ** 0.5
+        rop = (annual_demand / 365) * lead_time_days + safety_stock
+        potential_saving = 0.0
+        if current_stock < rop:
+            action, order_qty = "ORDER_NOW", eoq
+        elif current_stock > max_stock * 0.9:
+            action, order_qty = "REDUCE_STOCK", 0
+            potential_saving = (current_stock - rop) * holding_cost
+        else:
+            action, order_qty = "MAINTAIN", 0
+        total_savings += potential_saving
+        recommendations.append({
+            "sku": sku,
+            "product_name": item.get("product_name", ""),
+            "current_stock": current_stock,
+            "optimal_order_qty": round(eoq, 2),
+            "reorder_point": round(rop, 2),
+            "safety_stock": round(safety_stock, 2),
+            "action": action,
+            "order_quantity": round(order_qty, 2) if order_qty > 0 else None,
+            "potential_saving": round(potential_saving, 2),
+            "annual_demand_estimate": round(annual_demand, 2),
+        })
+    return {"recommendations": recommendations, "total_savings": total_savings}
+
+
+def vectorized_page(frame: pd.DataFrame, forecast: Dict[str, Any], page_size: int) -> Dict[str, Any]:
+    plan = ReplenishmentPlan(frame, forecast)
+    return {"recommendations": plan.page(0, page_size), "total_savings": plan.total_savings}
+
+
+def time_it(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def check_equivalent(loop: Dict[str, Any], frame: pd.DataFrame, forecast: Dict[str, Any]) -> None:
+    plan = ReplenishmentPlan(frame, forecast)
+    assert math.isclose(loop["total_savings"], plan.total_savings, rel_tol=1e-9, abs_tol=1e-6)
+    for expected, actual in zip(loop["recommendations"], plan.page()):
+        assert expected["action"] == actual["action"], expected["sku"]
+        assert abs(expected["optimal_order_qty"] - actual["optimal_order_qty"]) <= 0.011, expected["sku"]
+
+
+def main() -> None:
+    args = parse_args()
+    report = []
+    for n in args.skus:
+        frame, forecast = make_inputs(n, args.forecast_share, args.seed)
+        items = frame.to_dict("records")
+        check_equivalent(loop_optimize(items, forecast), frame, forecast)
+
+        loop = time_it(lambda: loop_optimize(items, forecast), args.repeats)
+        paged = time_it(lambda: vectorized_page(frame, forecast, args.page_size), args.repeats)
+        entry = {
+            "skus": n,
+            "loop": loop,
+            "vectorized_page": paged,
+            "page_size": args.page_size,
+            "speedup": round(loop["median_ms"] / max(paged["median_ms"], 1e-9), 1),
+        }
+        report.append(entry)
+        print(
+            f"{n:>9,} SKUs  loop {loop['median_ms']:>9.1f} ms  "
+            f"vectorized (page of {args.page_size}) {paged['median_ms']:>8.1f} ms ({entry['speedup']}x)"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
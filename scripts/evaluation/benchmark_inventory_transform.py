@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized ELT inventory transform against the row-by-row loop."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from backend.services.elt_pipeline import InventoryMetrics  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ELT inventory metric computation.")
+    parser.add_argument("--skus", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--detail-limit", type=int, default=100, help="Rows per list for the limited run.")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args()
+
+
+def make_inventory(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    min_stock = rng.integers(10, 200, n).astype(float)
+    return pd.DataFrame({
+        "sku": [f"SKU-{i:07d}" for i in range(n)],
+        "product_name": [f"Product {i}" for i in range(n)],
+        "current_stock": rng.integers(0, 1_000, n).astype(float),
+        "min_stock": min_stock,
+        "max_stock": min_stock * rng.uniform(2, 8, n),
+        "unit_cost": rng.uniform(0.5, 250, n).round(2),
+        "location": rng.choice(["Warehouse A", "Warehouse B", "Store 1"], n),
+    })
+
+
+def loop_transform(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The original per-row implementation, kept verbatim for comparison."""
+    total_value = 0.0
+    stockout_risk = []
+    overstock = []
+    products = []
+
+    for item in rows:
+        sku = item.get("sku", "")
+        current_stock = float(item.get("current_stock", 0))
+        min_stock = float(item.get("min_stock", 0))
+        max_stock = float(item.get("max_stock", 0))
+        unit_cost = float(item.get("unit_cost", 0))
+
+        item_value = current_stock * unit_cost
+        total_value += item_value
+
+        if current_stock <= min_stock * 1.1:
+            stockout_risk.append({
+                "sku": sku,
+                "current_stock": current_stock,
+                "min_stock": min_stock,
+                "shortfall": min_stock - current_stock,
+            })
+
+        if current_stock >= max_stock * 0.9:
+            overstock.append({
+                "sku": sku,
+                "current_stock": current_stock,
+                "max_stock": max_stock,
+                "excess": current_stock - max_stock,
+            })
+
+        products.append({
+            "sku": sku,
+            "product_name": item.get("product_name", ""),
+            "current_stock": current_stock,
+            "inventory_value": item_value,
+            "unit_cost": unit_cost,
+            "location": item.get("location", ""),
+        })
+
+    return {
+        "total_inventory_value": total_value,
+        "stockout_risk": stockout_risk,
+        "overstock": overstock,
+        "products": products,
+    }
+
+
+def vectorized_summary(frame: pd.DataFrame) -> InventoryMetrics:
+    """Counts and totals only, as used when deciding whether metrics changed."""
+    return InventoryMetrics(frame)
+
+
+def vectorized_full(frame: pd.DataFrame, detail_limit: Optional[int] = None) -> Dict[str, Any]:
+    metrics = InventoryMetrics(frame)
+    return {
+        "total_inventory_value": metrics.total_inventory_value,
+        "stockout_risk": metrics.stockout_risk(detail_limit),
+        "overstock": metrics.overstock(detail_limit),
+        "products": metrics.products(detail_limit),
+    }
+
+
+def time_it(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def check_equivalent(loop: Dict[str, Any], vector: Dict[str, Any]) -> None:
+    assert abs(loop["total_inventory_value"] - vector["total_inventory_value"]) < 1e-6 * max(1.0, loop["total_inventory_value"])
+    for key in ("stockout_risk", "overstock", "products"):
+        assert len(loop[key]) == len(vector[key]), key
+        assert [r["sku"] for r in loop[key]] == [r["sku"] for r in vector[key]], key
+
+
+def main() -> None:
+    args = parse_args()
+    report = []
+    for n in args.skus:
+        frame = make_inventory(n, args.seed)
+        # The loop consumed JSON-decoded dict rows, the vectorized path a frame
+        rows = frame.astype({c: str for c in ("current_stock", "min_stock", "max_stock", "unit_cost")}).to_dict("records")
+        check_equivalent(loop_transform(rows), vectorized_full(frame))
+
+        loop = time_it(lambda: loop_transform(rows), args.repeats)
+        full = time_it(lambda: vectorized_full(frame), args.repeats)
+        limited = time_it(lambda: vectorized_full(frame, args.detail_limit), args.repeats)
+        summary = time_it(lambda: vectorized_summary(frame), args.repeats)
+        entry = {
+            "skus": n,
+            "loop": loop,
+            "vectorized_full": full,
+            "vectorized_limited": limited,
+            "vectorized_summary_only": summary,
+            "speedup_full": round(loop["median_ms"] / max(full["median_ms"], 1e-9), 1),
+            "speedup_limited": round(loop["median_ms"] / max(limited["median_ms"], 1e-9), 1),
+            "speedup_summary_only": round(loop["median_ms"] / max(summary["median_ms"], 1e-9), 1),
+        }
+        report.append(entry)
+        print(
+            f"{n:>9,} SKUs  loop {loop['median_ms']:>9.1f} ms  "
+            f"vectorized {full['median_ms']:>8.1f} ms ({entry['speedup_full']}x)  "
+            f"limit={args.detail_limit} {limited['median_ms']:>7.2f} ms ({entry['speedup_limited']}x)  "
+            f"summary-only {summary['median_ms']:>7.2f} ms ({entry['speedup_summary_only']}x)"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark the array-built / decomposed inventory LP against the per-SKU GLOP model."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from backend.services.optimizer.lp_bulk import BulkInventoryLP  # noqa: E402
+from backend.services.optimizer.lp_model import InventoryLP  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark inventory LP construction and solve.")
+    parser.add_argument("--skus", type=int, nargs="+", default=[1_000, 20_000, 100_000])
+    parser.add_argument("--budget-share", type=float, default=0.5, help="Share of discretionary spend the budget allows.")
+    parser.add_argument("--max-reference-skus", type=int, default=20_000, help="Largest size to run the per-SKU model on.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args()
+
+
+def make_inputs(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    max_stock = rng.integers(200, 1_200, n).astype(float)
+    frame = pd.DataFrame({
+        "sku": [f"SKU-{i:07d}" for i in range(n)],
+        "product_name": [f"Product {i}" for i in range(n)],
+        "current_stock": np.floor(max_stock * rng.uniform(0, 0.1, n)),
+        "min_stock": rng.integers(10, 100, n).astype(float),
+        "max_stock": max_stock,
+        "unit_cost": rng.uniform(0.5, 250, n).round(2),
+        "location": "Warehouse A",
+    })
+    forecast = {
+        sku: {"predictions": [{"predicted_quantity": float(q)} for q in rng.gamma(2.0, 10.0, 4).round(1)]}
+        for sku in frame["sku"].sample(frac=0.5, random_state=seed)
+    }
+    return frame, forecast
+
+
+def per_sku_solve(items, forecast: Dict[str, Any], params: Dict[str, float]) -> Dict[str, Any]:
+    return InventoryLP(items, forecast).solve(params, details=False)
+
+
+def bulk_solve(frame: pd.DataFrame, forecast: Dict[str, Any], params: Dict[str, float]) -> Dict[str, Any]:
+    return BulkInventoryLP(frame, forecast).solve(params, details=False)
+
+
+def time_it(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def check_equivalent(expected: Dict[str, Any], actual: Dict[str, Any]) -> None:
+    assert expected["solver_status"] == actual["solver_status"] == "optimal"
+    assert math.isclose(expected["objective_value"], actual["objective_value"], rel_tol=1e-6)
+
+
+def main() -> None:
+    args = parse_args()
+    report = []
+    for n in args.skus:
+        frame, forecast = make_inputs(n, args.seed)
+        # Spend with free stockouts is the least any feasible plan orders
+        floor = bulk_solve(frame, forecast, {"stockout_cost_multiplier": 0})["kpis"]["order_spend"]
+        ceiling = bulk_solve(frame, forecast, {})["kpis"]["order_spend"]
+        budget = {"budget_limit": floor + (ceiling - floor) * args.budget_share}
+        entry: Dict[str, Any] = {"skus": n}
+
+        for label, params in (("unconstrained", {}), ("budget", budget)):
+            bulk = time_it(lambda: bulk_solve(frame, forecast, params), args.repeats)
+            entry[f"decomposed_{label}"] = bulk
+            line = f"{n:>9,} SKUs  {label:<13} decomposed {bulk['median_ms']:>9.1f} ms"
+            if n <= args.max_reference_skus:
+                items = frame.to_dict("records")
+                check_equivalent(per_sku_solve(items, forecast, params), bulk_solve(frame, forecast, params))
+                reference = time_it(lambda: per_sku_solve(items, forecast, params), 1)
+                entry[f"per_sku_{label}"] = reference
+                entry[f"speedup_{label}"] = round(reference["median_ms"] / max(bulk["median_ms"], 1e-9), 1)
+                line += f"  per-SKU GLOP {reference['median_ms']:>10.1f} ms ({entry[f'speedup_{label}']}x)"
+            print(line)
+        report.append(entry)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark the indexed marketplace catalog against per-request list filtering."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from backend.services.connectors.catalog import TIERS, CatalogIndex  # noqa: E402
+from backend.services.connectors.catalog_data import DEFAULT_CATALOG  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark marketplace catalog browsing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1_000, 20_000])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per query mix.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args()
+
+
+def make_catalog(size: int) -> List[Dict[str, Any]]:
+    items = []
+    for i in range(size):
+        item = dict(DEFAULT_CATALOG[i % len(DEFAULT_CATALOG)])
+        item["id"] = f"{item['id']}_{i}"
+        item["display_name"] = f"{item['display_name']} {i}"
+        items.append(item)
+    return items
+
+
+def linear_response(items: List[Dict[str, Any]], category: Optional[str], tier: Optional[str], search: Optional[str]) -> bytes:
+    """The original handler: filter with list comprehensions, then serialize."""
+    filtered = items
+    if category:
+        filtered = [c for c in filtered if c.get("category") == category]
+    if tier:
+        filtered = [c for c in filtered if c.get("tier") == tier]
+    if search:
+        s = search.lower()
+        filtered = [c for c in filtered if s in (c.get("display_name", "") + " " + c.get("description", "")).lower()]
+    payload = {"connectors": filtered, "total": len(filtered), "categories": [], "tiers": TIERS}
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_queries(items: List[Dict[str, Any]], count: int, rng: random.Random) -> Dict[str, List[tuple]]:
+    categories = sorted({c["category"] for c in items})
+    names = [c["display_name"].lower() for c in items]
+    return {
+        "browse": [(rng.choice([None, *categories]), rng.choice([None, *TIERS]), None) for _ in range(count)],
+        # A small vocabulary of searches, as typed into the marketplace box
+        "search": [(None, None, rng.choice(names[:50])[:rng.randint(2, 8)]) for _ in range(count)],
+    }
+
+
+def timed(fn: Callable[..., bytes], queries: List[tuple]) -> Dict[str, float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(*query)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return {
+        "p50_us": round(statistics.median(latencies), 2),
+        "p95_us": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    report: Dict[str, Any] = {"requests": args.requests, "results": []}
+    for size in args.sizes:
+        items = make_catalog(size)
+        start = time.perf_counter()
+        index = CatalogIndex(items)
+        build_ms = (time.perf_counter() - start) * 1000
+        for mix, queries in make_queries(items, args.requests, rng).items():
+            row = {
+                "catalog_size": size,
+                "mix": mix,
+                "index_build_ms": round(build_ms, 2),
+                "linear": timed(lambda c, t, s: linear_response(items, c, t, s), queries),
+                "indexed": timed(index.response, queries),
+            }
+            report["results"].append(row)
+            print(json.dumps(row))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,52 @@
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
+
+
+class FakeAsyncBackend:
+    """Async backend double: records statements, answers fetches from queued results and then a fixed row"""
+
+    def __init__(self, row=None, results=()):
+        self.row = row
+        self.results = list(results)
+        self.statements = []
+        self.open_connections = 0
+
+    @property
+    def queries(self):
+        return len(self.statements)
+
+    @asynccontextmanager
+    async def get_connection(self):
+        self.open_connections += 1
+        try:
+            yield self
+        finally:
+            self.open_connections -= 1
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    async def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    async def fetchone(self):
+        return self.results.pop(0) if self.results else self.row
+
+    async def fetchall(self):
+        return self.results.pop(0) if self.results else self.row
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def fake_async_backend():
+    """FakeAsyncBackend factory"""
+    return FakeAsyncBackend
@@ -0,0 +1,59 @@
+import asyncio
+
+from backend.services.coach.answer_cache import AnswerCache, cached_answer, restate
+from backend.services.coach.narrative_service import NarrativeGenerator
+
+VERSION = ("2026-01-01 00:00:00", None, None)
+
+
+def ask(backend, cache, question, calls, answer=None):
+    async def compute():
+        calls.append(question)
+        return answer or {"question": question, "narrative": f"**Why Analysis: {question}**\n\nAll good."}
+
+    return asyncio.run(cached_answer(backend, "t1", "why", {}, question, compute, cache))
+
+
+def test_phrasings_share_an_answer_until_data_changes(fake_async_backend):
+    backend, cache, calls = fake_async_backend(VERSION), AnswerCache(), []
+    ask(backend, cache, "Why are inventory costs high?", calls)
+    again = ask(backend, cache, "why is my inventory so expensive", calls)
+    assert calls == ["Why are inventory costs high?"]
+    assert again["question"] == "why is my inventory so expensive"
+    assert again["narrative"].startswith("**Why Analysis: why is my inventory so expensive**")
+
+    backend.row = ("2026-01-02 00:00:00", None, None)
+    ask(backend, cache, "Why are inventory costs high?", calls)
+    assert len(calls) == 2
+
+
+def test_invalidate_ttl_and_errors(fake_async_backend):
+    now = [0.0]
+    backend, cache, calls = fake_async_backend(VERSION), AnswerCache(ttl_seconds=10, clock=lambda: now[0]), []
+    ask(backend, cache, "q", calls)
+    cache.invalidate("t1")
+    ask(backend, cache, "q", calls)
+    now[0] = 11
+    ask(backend, cache, "q", calls)
+    assert len(calls) == 3
+
+    failing = AnswerCache()
+    ask(backend, failing, "q", calls, answer={"error": "solver down", "question": "q"})
+    assert failing.stats()["entries"] == 0
+
+
+def test_lru_bound_and_restate_copies():
+    cache = AnswerCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put("t1", key, {"question": key})
+    assert cache.get("t1", "a") is None and cache.stats()["entries"] == 2
+
+    answer = {"question": "old", "narrative": "old answer"}
+    assert restate(answer, "new") == {"question": "new", "narrative": "new answer"}
+    assert answer["question"] == "old"
+
+
+def test_narrative_intent_ignores_phrasing():
+    assert NarrativeGenerator.classify_intent("How can I reduce costs?") == "cost_reduction"
+    assert NarrativeGenerator.classify_intent("any way to save money") == "cost_reduction"
+    assert NarrativeGenerator.classify_intent("What's the demand outlook?") == "demand_forecast"
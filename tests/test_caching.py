@@ -0,0 +1,21 @@
+from backend.utils.caching import TTLCache
+
+
+def test_entries_expire_and_evict_least_recently_used():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    assert cache.put("a", 1) == [] and cache.put("b", 2) == []
+    assert cache.get("a") == 1
+    assert cache.put("c", 3) == [("b", 2)]
+    now[0] = 11
+    assert cache.get("a") is None and len(cache) == 1
+    assert cache.stats() == {"entries": 1, "max_entries": 2, "ttl_seconds": 10, "hits": 1, "misses": 1}
+
+
+def test_discard_drops_matching_keys():
+    cache = TTLCache(max_entries=4)
+    for key in [("t1", "x"), ("t1", "y"), ("t2", "x")]:
+        cache.put(key, key)
+    assert cache.discard(lambda key: key[0] == "t1") == 2
+    cache.pop(("t2", "x"))
+    assert len(cache) == 0
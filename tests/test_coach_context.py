@@ -0,0 +1,98 @@
+import asyncio
+
+from backend.services.coach.context import TenantContextCache, build_context, tenant_context
+from backend.services.coach.narrative_service import NarrativeGenerator
+
+ROW = (
+    [
+        {"metric_name": "total_inventory_value", "value": 1200.0, "extra_data": {"product_count": 3}, "timestamp": "2026-01-02"},
+        {"metric_name": "total_inventory_value", "value": 900.0, "extra_data": {}, "timestamp": "2026-01-01"},
+    ],
+    {"value": 1200.0, "extra_data": {"product_count": 3, "stockout_risk_count": 1, "overstock_count": 0}},
+    {"predictions": {"SKU-1": {"predictions": [5, 6]}}, "horizon_days": 28, "model_type": "simple", "created_at": "2026-01-02"},
+    None,
+    {"solution": [{"action": "ORDER_NOW", "sku": "SKU-1", "potential_saving": 40.0}], "objective_value": 40.0},
+)
+
+
+def context_queries(backend):
+    return sum("jsonb_agg" in sql for sql, _ in backend.statements)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_context_keeps_latest_metric_and_forecasts():
+    context = build_context(ROW)
+    assert context["metrics"]["total_inventory_value"]["value"] == 1200.0
+    assert context["forecasts"]["SKU-1"]["predictions"] == [5, 6]
+    assert context["optimization"] == {}
+    assert build_context(None)["inventory"] is None
+
+
+def test_context_is_gathered_once_per_ttl(fake_async_backend):
+    clock = FakeClock()
+    cache = TenantContextCache(ttl_seconds=30, clock=clock)
+    backend = fake_async_backend(ROW)
+
+    first = asyncio.run(tenant_context(backend, "t1", cache))
+    assert asyncio.run(tenant_context(backend, "t1", cache)) is first
+    assert context_queries(backend) == 1
+
+    clock.now = 31
+    asyncio.run(tenant_context(backend, "t1", cache))
+    assert context_queries(backend) == 2
+
+    cache.invalidate("t1")
+    asyncio.run(tenant_context(backend, "t1", cache))
+    assert context_queries(backend) == 3
+    assert cache.stats()["hits"] == 1
+
+
+def test_write_in_another_process_is_seen_before_the_ttl(fake_async_backend):
+    api_cache, worker_cache = TenantContextCache(ttl_seconds=30), TenantContextCache(ttl_seconds=30)
+    before = ("2026-01-01 00:00:00", None, None)
+    backend = fake_async_backend(results=[before, ROW, before])
+    assert asyncio.run(tenant_context(backend, "t1", api_cache))["metrics"]["total_inventory_value"]["value"] == 1200.0
+    asyncio.run(tenant_context(backend, "t1", api_cache))
+    assert context_queries(backend) == 1
+
+    # The worker commits new metrics and only invalidates its own cache
+    written = ([{"metric_name": "total_inventory_value", "value": 700.0, "extra_data": {}, "timestamp": "2026-01-03"}],) + ROW[1:]
+    worker_cache.invalidate("t1")
+    backend.results = [("2026-01-03 00:00:00", None, None), written]
+
+    context = asyncio.run(tenant_context(backend, "t1", api_cache))
+    assert context["metrics"]["total_inventory_value"]["value"] == 700.0
+    assert context_queries(backend) == 2
+
+
+def test_cache_drops_least_recently_used_tenant():
+    cache = TenantContextCache(max_tenants=2)
+    for tenant_id in ("a", "b", "c"):
+        cache.put(tenant_id, "v1", {})
+    assert cache.get("a", "v1") is None and cache.get("c", "v1") == {}
+    assert cache.get("c", "v2") is None
+
+
+def test_narrative_reads_the_shared_context(monkeypatch, fake_async_backend):
+    from backend.services.coach import context as context_module
+
+    cache = TenantContextCache()
+    monkeypatch.setattr(context_module, "get_tenant_context_cache", lambda: cache)
+    backend = fake_async_backend(ROW)
+    narrator = NarrativeGenerator(backend)
+    narrator.async_backend = backend
+
+    answer = asyncio.run(narrator.generate_narrative("t1", "How can I reduce costs?"))
+    assert answer["intent"] == "cost_reduction"
+    assert answer["supporting_data"]["inventory_metrics"]["product_count"] == 3
+    assert answer["recommendations"][0]["sku"] == "SKU-1"
+
+    asyncio.run(narrator.generate_narrative("t1", "What is the demand forecast?"))
+    assert context_queries(backend) == 1
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from backend.services.coach.memory import (
+    EMBEDDING_DIM,
+    ConversationMemory,
+    HashingEmbedder,
+    render_memory,
+    vector_literal,
+)
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(list(texts))
+        return super().embed(texts)
+
+
+def memory_for(backend, embedder=None, **kwargs):
+    memory = ConversationMemory(backend, embedder or HashingEmbedder(), **kwargs)
+    memory.async_backend = backend
+    return memory
+
+
+def test_hashing_embedder_batches_unit_vectors():
+    vectors = HashingEmbedder().embed([
+        "Why are inventory costs high?",
+        "why are my inventory costs so high",
+        "Forecast demand for next month",
+        "",
+    ])
+    assert vectors.shape == (4, EMBEDDING_DIM) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0)
+    assert not vectors[3].any()
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert np.array_equal(HashingEmbedder().embed(["same text"]), HashingEmbedder().embed(["same text"]))
+
+
+def test_recall_puts_relevant_turns_before_recent_ones(fake_async_backend):
+    rows = [
+        ("recent", "s1", 5, "latest question", "latest answer", "overview", None),
+        ("recent", "s1", 4, "previous question", "previous answer", "why", None),
+        ("relevant", "s1", 4, "previous question", "previous answer", "why", 0.3),
+        ("relevant", "s0", 2, "why are costs high", "overstock", "why", 0.2),
+        ("relevant", "s0", 7, "unrelated", "hello", "overview", 0.95),
+        ("relevant", "s0", 1, "costs", "a", "why", 0.5),
+        ("relevant", "s0", 3, "costs again", "b", "why", 0.6),
+    ]
+    backend = fake_async_backend(results=[("0.8.1",), rows])
+    memory = memory_for(backend, recent_turns=2, top_k=3)
+
+    turns = asyncio.run(memory.recall("t1", "s1", "why are inventory costs high?"))
+    assert [(t["session_id"], t["turn_index"]) for t in turns] == [("s0", 2), ("s0", 1), ("s0", 3), ("s1", 4), ("s1", 5)]
+    assert any("hnsw.iterative_scan" in sql for sql, _ in backend.statements)
+    recall_params = backend.statements[-1][1]
+    assert recall_params[2] == 2 and recall_params[-1] == 5
+
+
+def test_recall_ranks_exactly_when_other_tenants_crowd_the_index(fake_async_backend):
+    recent = [("recent", "s1", 9, "latest question", "latest answer", "overview", None)]
+    # Every neighbour the index scan found belonged to another tenant
+    exact = [
+        ("relevant", "s0", 2, "why are costs high", "overstock", "why", 0.2),
+        ("relevant", "s0", 3, "holding costs", "reduce", "why", 0.4),
+    ]
+    backend = fake_async_backend(results=[("0.6.2",), recent, exact])
+    memory = memory_for(backend, recent_turns=1, top_k=2)
+
+    turns = asyncio.run(memory.recall("t1", "s1", "why are inventory costs high?"))
+    assert [(t["session_id"], t["turn_index"]) for t in turns] == [("s0", 2), ("s0", 3), ("s1", 9)]
+    assert not any("hnsw.iterative_scan" in sql for sql, _ in backend.statements)
+    exact_sql, exact_params = backend.statements[-1]
+    assert "OFFSET 0" in exact_sql and exact_params[1:] == ["t1", 3]
+
+
+def test_remember_embeds_all_turns_in_one_batch(fake_async_backend):
+    embedder = CountingEmbedder()
+    backend = fake_async_backend(results=[([{"role": "user", "content": "earlier"}], 3)])
+    memory = memory_for(backend, embedder)
+    turns = [{"question": f"q{i}", "answer": f"a{i}", "intent": "overview"} for i in range(3)]
+
+    assert asyncio.run(memory.remember("t1", "s1", turns)) == 3
+    assert len(embedder.batches) == 1 and len(embedder.batches[0]) == 3
+    insert = next(params for sql, params in backend.statements if sql.startswith("INSERT INTO coaching_turns"))
+    assert insert[3] == [4, 5, 6]
+    assert insert[-1][0].startswith("[") and insert[-1][0].count(",") == EMBEDDING_DIM - 1
+
+
+def test_sessions_must_be_uuids(fake_async_backend):
+    memory = memory_for(fake_async_backend())
+    with pytest.raises(ValueError):
+        asyncio.run(memory.open_session("t1", "not-a-session"))
+
+
+def test_rendered_memory_is_bounded():
+    text = render_memory([{"question": "q", "answer": "x" * 5000}])
+    assert len(text) < 400 and text.endswith("…")
+    assert vector_literal([0.5, 1, 0]) == "[0.5,1,0]"
+
+
+@pytest.mark.skipif(not os.getenv("POSTGRES_URL"), reason="needs POSTGRES_URL with pgvector and the coaching schema")
+def test_recall_finds_a_small_tenant_next_to_a_large_one():
+    psycopg2 = pytest.importorskip("psycopg2")
+    from backend.utils.database import get_backend
+
+    small, large = str(uuid.uuid4()), str(uuid.uuid4())
+    conn = psycopg2.connect(os.environ["POSTGRES_URL"])
+    with conn.cursor() as cur:
+        for tenant_id in (small, large):
+            cur.execute(
+                "INSERT INTO tenants VALUES (%s, 'Memory test', 'm@example.com', 'free', %s, 'active', NOW(), NOW(), '{}')",
+                [tenant_id, tenant_id]
+            )
+    conn.commit()
+    memory = ConversationMemory(get_backend(), HashingEmbedder(), recent_turns=0, top_k=3)
+    memory.ef_search = 16
+
+    async def scenario():
+        crowd = await memory.open_session(large)
+        await memory.remember(large, crowd, [
+            {"question": f"why are inventory costs high in warehouse {i}?", "answer": "overstock", "intent": "why"}
+            for i in range(400)
+        ])
+        own = await memory.open_session(small)
+        await memory.remember(small, own, [
+            {"question": "why are inventory costs high?", "answer": "slow movers", "intent": "why"},
+            {"question": "what drives holding costs?", "answer": "capital tied up", "intent": "why"},
+        ])
+        return await memory.recall(small, str(uuid.uuid4()), "why are my inventory costs so high?")
+
+    try:
+        # The 16 nearest entries of the shared index all belong to the large tenant
+        turns = asyncio.run(scenario())
+        assert [t["answer"] for t in turns] == ["slow movers"]
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM coaching_sessions WHERE tenant_id IN (%s, %s)", [small, large])
+            cur.execute("DELETE FROM tenants WHERE tenant_id IN (%s, %s)", [small, large])
+        conn.commit()
+        conn.close()
@@ -0,0 +1,55 @@
+import pytest
+
+from backend.services.coach.registry import CoachRegistry, get_coach_registry, llm_config_key
+
+
+class FakeBackend:
+    """Services only keep a reference to the backend until they query"""
+
+
+def test_services_are_built_once_and_shared():
+    registry = CoachRegistry(FakeBackend())
+    assert registry.forecaster is registry.forecaster
+    assert registry.elt_pipeline is registry.elt_pipeline
+    assert registry.simple_optimizer is registry.simple_optimizer
+    assert registry.optimizer is registry.optimizer
+
+
+def test_optiguide_agents_are_kept_per_llm_config():
+    pytest.importorskip("ortools")
+    registry = CoachRegistry(FakeBackend(), max_coaches=2)
+    default = registry.optiguide(None)
+    assert registry.optiguide({}) is default
+    assert default.ortools_optimizer is registry.optimizer
+    assert default.simple_optimizer is registry.simple_optimizer
+
+    gpt = registry.optiguide({"model": "gpt-4", "api_key": "k1"})
+    assert registry.optiguide({"api_key": "k1", "model": "gpt-4"}) is gpt
+    registry.optiguide({"model": "gpt-4", "api_key": "k2"})
+    registry.optiguide({"model": "gpt-4", "api_key": "k3"})
+    # LRU bound evicts the least recently used config
+    assert registry.optiguide({"model": "gpt-4", "api_key": "k1"}) is not gpt
+    assert registry.stats()["optiguide_agents"] == 2
+
+
+def test_config_key_hides_secrets():
+    key = llm_config_key({"api_key": "sk-secret"})
+    assert "sk-secret" not in key and len(key) == 64
+
+
+def test_registry_follows_the_process_backend():
+    backend = FakeBackend()
+    assert get_coach_registry(backend) is get_coach_registry(backend)
+    assert get_coach_registry(FakeBackend()) is not get_coach_registry(backend)
+
+
+def test_coach_workflow_is_compiled_once_per_config():
+    pytest.importorskip("langgraph")
+    pytest.importorskip("langchain_openai")
+    pytest.importorskip("ortools")
+    registry = CoachRegistry(FakeBackend())
+    coach = registry.coach(None)
+    assert registry.coach(None) is coach
+    assert coach.forecaster is registry.forecaster
+    assert coach.optiguide is registry.optiguide(None)
+    assert registry.coaches_built == 1
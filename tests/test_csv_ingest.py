@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import uuid
+
+import pytest
+
+from backend.services.connectors import csv_ingest
+from backend.services.connectors.csv_ingest import CSVIngester, UploadProgress
+
+POSTGRES_URL = os.getenv("POSTGRES_URL")
+
+
+class RecordedProgress:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, upload_id, bytes_read, rows):
+        self.updates.append((upload_id, bytes_read, rows))
+
+
+class CopyCursor:
+    """Captures what COPY would receive, reading the stream in small pieces."""
+
+    def __init__(self):
+        self.sql = None
+        self.lines = []
+        self.max_read = 0
+
+    def copy_expert(self, sql, stream, size=8192):
+        self.sql = sql
+        data = b""
+        while True:
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            self.max_read = max(self.max_read, len(chunk))
+            data += chunk
+        self.lines = data.decode("utf-8").splitlines()
+
+
+def parse(line):
+    raw_id, tenant_id, source_id, row_num, payload = line.split("\t")
+    payload = payload.replace("\\\\", "\\")
+    return raw_id, tenant_id, source_id, int(row_num), json.loads(payload)
+
+
+def test_every_row_is_copied_in_bounded_reads(monkeypatch):
+    monkeypatch.setattr(csv_ingest, "COPY_BUFFER_SIZE", 64)
+    monkeypatch.setattr(csv_ingest, "PROGRESS_EVERY_ROWS", 100)
+    body = "﻿sku,quantity,note\n" + "".join(f"SKU-{i},{i},\"a, b\"\n" for i in range(1000))
+    progress = RecordedProgress()
+    cur = CopyCursor()
+
+    result = CSVIngester(progress).copy_rows(cur, io.BytesIO(body.encode("utf-8")), "r", "t", "s", upload_id="u1")
+
+    assert result["headers"] == ["sku", "quantity", "note"]
+    assert result["record_count"] == 1000
+    assert len(cur.lines) == 1000
+    assert cur.max_read <= 64
+    assert cur.sql.startswith("COPY raw_connector_rows")
+    assert parse(cur.lines[0]) == ("r", "t", "s", 1, {"sku": "SKU-0", "quantity": "0", "note": "a, b"})
+    assert parse(cur.lines[-1])[3] == 1000
+    assert [r["sku"] for r in result["sample_rows"]] == ["SKU-0", "SKU-1", "SKU-2"]
+    assert [rows for _, _, rows in progress.updates] == list(range(100, 1001, 100)) + [1000]
+    assert progress.updates[-1][1] == len(body.encode("utf-8"))
+    assert result["snapshot"] is None
+
+
+def test_copy_text_escaping_and_multiline_fields():
+    body = 'sku,note\nA,"tab\there"\nB,"line one\nline two"\nC,back\\slash\n'
+    cur = CopyCursor()
+
+    result = CSVIngester(RecordedProgress()).copy_rows(cur, io.BytesIO(body.encode()), "r", "t", "s")
+
+    assert result["record_count"] == 3
+    assert len(cur.lines) == 3
+    notes = [parse(line)[4]["note"] for line in cur.lines]
+    assert notes == ["tab\there", "line one\nline two", "back\\slash"]
+
+
+def test_empty_upload_is_rejected():
+    with pytest.raises(ValueError):
+        CSVIngester(RecordedProgress()).copy_rows(CopyCursor(), io.BytesIO(b""), "r", "t", "s")
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="needs POSTGRES_URL with the csv_uploads schema")
+def test_progress_is_shared_through_the_database():
+    psycopg2 = pytest.importorskip("psycopg2")
+    from backend.utils.database import get_backend
+
+    tenant_id, upload_id = str(uuid.uuid4()), f"test-{uuid.uuid4()}"
+    conn = psycopg2.connect(POSTGRES_URL)
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO tenants VALUES (%s, 'Upload test', 'u@example.com', 'free', %s, 'active', NOW(), NOW(), '{}')",
+            [tenant_id, tenant_id]
+        )
+    conn.commit()
+    try:
+        # The staging process and the one answering the progress request share nothing but the table
+        staging, reporting = UploadProgress(get_backend()), UploadProgress(get_backend())
+        staging.start(upload_id, tenant_id, total_bytes=400, filename="demand.csv")
+        staging.update(upload_id, bytes_read=100, rows=10)
+        running = reporting.get(upload_id)
+        assert (running["status"], running["rows"], running["percent"]) == ("running", 10, 25.0)
+
+        staging.finish(upload_id, bytes_read=400, rows=42)
+        done = reporting.get(upload_id)
+        assert (done["status"], done["rows"], done["percent"]) == ("completed", 42, 100.0)
+        assert done["tenant_id"] == tenant_id and done["finished_at"]
+        assert reporting.get("missing") is None
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM csv_uploads WHERE tenant_id = %s", [tenant_id])
+            cur.execute("DELETE FROM tenants WHERE tenant_id = %s", [tenant_id])
+        conn.commit()
+        conn.close()
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from backend.services.dashboard.snapshots import (
+    REFRESH_SQL,
+    health_alerts,
+    health_score,
+    health_signals,
+    last_modified,
+    metrics_snapshot,
+    refresh_snapshot,
+    refresh_snapshot_async,
+    snapshot_from_row,
+)
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+
+class RecordingAsyncCursor(RecordingCursor):
+    async def execute(self, sql, params=None):
+        super().execute(sql, params)
+
+
+def snapshot(**overrides):
+    row = {
+        "order_records": 0, "inventory_records": 0, "customer_records": 0, "has_real_data": False,
+        "sources_refreshed_at": "2026-01-02T08:00:00+00:00",
+        "active_goals": [], "goal_progress": 0, "goals_refreshed_at": "2026-01-03T08:00:00+00:00",
+        "revenue_growth": None, "metrics_refreshed_at": None,
+        "updated_at": "2026-01-03T08:00:00+00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_refresh_runs_only_requested_sections():
+    cur = RecordingCursor()
+    refresh_snapshot(cur, "t1", ("goals",))
+    assert cur.statements == [(REFRESH_SQL["goals"], ["t1", "t1"])]
+
+    async_cur = RecordingAsyncCursor()
+    asyncio.run(refresh_snapshot_async(async_cur, "t1"))
+    assert [sql for sql, _ in async_cur.statements] == [REFRESH_SQL[s] for s in ("sources", "goals", "metrics")]
+
+    with pytest.raises(ValueError):
+        refresh_snapshot(cur, "t1", ("tasks",))
+
+
+def test_goal_sections_render_alerts_signals_and_cards():
+    goals = [
+        {"id": "g1", "title": "Grow revenue", "category": "revenue", "current": 1.0, "target": 5.0},
+        {"id": "g2", "title": "Cut stockouts", "category": "operations", "current": 8.0, "target": 10.0},
+        {"id": "g3", "title": "No target", "category": "custom", "current": 3.0, "target": 0},
+    ]
+    snap = snapshot(active_goals=goals, goal_progress=70, revenue_growth=2.5)
+    assert [a["id"] for a in health_alerts(snap)] == ["alert-goal-g1", "alert-goal-g3"]
+    assert [s["value"] for s in health_signals(snap)] == ["80%"]
+
+    cards = {card["id"]: card for card in metrics_snapshot(snap)}
+    assert cards["current_score"]["value"] == "70" and cards["current_score"]["trend"] == "up"
+    assert cards["revenue_growth"]["value"] == "+2.5%"
+    assert metrics_snapshot(snapshot())[1]["value"] == "+4.2%"
+    assert [a["id"] for a in health_alerts(snapshot())] == ["alert-low-ops"]
+    assert [s["id"] for s in health_signals(snapshot())] == ["signal-rev-growth"]
+
+
+def test_health_score_and_freshness():
+    score = health_score(snapshot(order_records=2500, inventory_records=100))
+    assert score["breakdown"]["revenue"] == 75 and score["breakdown"]["operations"] == 51
+    assert score["breakdown"]["customer_available"] is False
+    assert score["last_updated"] == "2026-01-02T08:00:00+00:00"
+
+    snap = snapshot()
+    assert last_modified(snap, "sources", "goals") == "Sat, 03 Jan 2026 08:00:00 GMT"
+    assert last_modified(snap, "metrics") is None
+
+
+def test_snapshot_rows_decode_goals_and_naive_timestamps():
+    from datetime import datetime
+
+    row = (1, 2, 3, True, datetime(2026, 1, 2, 8), '[{"id": "g1"}]', 40, None, 1.5, None, datetime(2026, 1, 2, 8))
+    snap = snapshot_from_row(row)
+    assert snap["active_goals"] == [{"id": "g1"}]
+    assert snap["sources_refreshed_at"] == "2026-01-02T08:00:00+00:00"
+    assert snap["goals_refreshed_at"] is None
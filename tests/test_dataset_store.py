@@ -0,0 +1,113 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from backend.services.connectors import dataset_store
+from backend.services.connectors.dataset_store import (
+    DEMAND_COLUMNS,
+    DEMAND_NUMERIC,
+    ColumnarDatasetStore,
+    classify_dataset,
+    demand_series_by_sku,
+    load_dataset_frame,
+)
+
+
+DEMAND_CSV = "sku,week,quantity\n001,1,10\n002,1,5\n001,2,12\n002,2,7\n"
+
+
+def write_snapshot(store, body, raw_id="raw-1"):
+    headers, *rows = [line.split(",") for line in body.splitlines()]
+    snapshot = store.open_snapshot("t1", "s1", headers, raw_id)
+    for row in rows:
+        snapshot.add(dict(zip(headers, row)))
+    return snapshot, snapshot.commit()
+
+
+def test_snapshot_reads_with_column_and_predicate_pushdown(tmp_path):
+    store = ColumnarDatasetStore(str(tmp_path))
+    snapshot, written = write_snapshot(store, DEMAND_CSV)
+    assert snapshot.dataset == "demand" and written["rows"] == 4
+
+    frame = store.read_frame("t1", "s1", "demand", columns=["sku", "quantity"], filters=[("sku", "=", "001")])
+    assert list(frame.columns) == ["sku", "quantity"]
+    # sku stays text even though it looks numeric
+    assert frame["sku"].tolist() == ["001", "001"]
+    assert frame["quantity"].tolist() == [10.0, 12.0]
+
+    arrays = store.read_arrays("t1", "s1", "demand", columns=["week"])
+    assert arrays["week"].dtype.kind == "f"
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    store = ColumnarDatasetStore(str(tmp_path))
+    write_snapshot(store, DEMAND_CSV)
+    assert store.read_table("t1", "s1", "demand", raw_id="raw-2") is None
+    assert store.snapshot_raw_id("t1", "s1", "demand") == "raw-1"
+
+
+def test_row_groups_and_unparseable_numbers(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_store, "SNAPSHOT_ROW_GROUP", 100)
+    body = "sku,week,quantity\n" + "".join(f"A,{i},{i}\n" for i in range(500)) + "A,501,2.5\nA,502,n/a\n"
+    store = ColumnarDatasetStore(str(tmp_path))
+    write_snapshot(store, body)
+    frame = store.read_frame("t1", "s1", "demand")
+    assert len(frame) == 502
+    assert frame["quantity"].iloc[-2] == 2.5
+    assert frame["quantity"].isna().iloc[-1]
+
+
+def test_aborted_snapshot_keeps_the_current_one(tmp_path):
+    store = ColumnarDatasetStore(str(tmp_path))
+    write_snapshot(store, DEMAND_CSV)
+    snapshot = store.open_snapshot("t1", "s1", ["sku", "week", "quantity"], "raw-2")
+    snapshot.add({"sku": "X", "week": "1", "quantity": "1"})
+    snapshot.abort()
+    assert snapshot.commit() is None
+    assert store.snapshot_raw_id("t1", "s1", "demand") == "raw-1"
+    assert os.listdir(tmp_path / "t1" / "s1") == ["demand.parquet"]
+
+
+def test_upload_is_snapshotted_while_it_is_copied(tmp_path):
+    from backend.services.connectors.csv_ingest import CSVIngester
+
+    class CopyCursor:
+        def copy_expert(self, sql, stream, size=8192):
+            while stream.read(size):
+                pass
+
+    class NoProgress:
+        def update(self, *args, **kwargs):
+            pass
+
+    store = ColumnarDatasetStore(str(tmp_path))
+    staged = CSVIngester(NoProgress()).copy_rows(
+        CopyCursor(), io.BytesIO(DEMAND_CSV.encode()), "raw-1", "t1", "s1", snapshots=store
+    )
+    # Nothing is published until the caller's transaction has committed
+    assert store.snapshot_raw_id("t1", "s1", "demand") is None
+    assert staged["snapshot"].commit()["rows"] == staged["record_count"] == 4
+    assert store.read_frame("t1", "s1", "demand", raw_id="raw-1")["sku"].tolist() == ["001", "002", "001", "002"]
+
+
+def test_load_dataset_frame_falls_back_to_staged_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_store, "get_dataset_store", lambda: ColumnarDatasetStore(str(tmp_path)))
+    raw_data = {"sample_rows": [{"sku": "A", "week": "1", "quantity": "3"}, {"sku": "B", "week": "1", "quantity": ""}]}
+
+    frame = asyncio.run(load_dataset_frame(None, "t1", "s1", "raw-1", raw_data, "demand", DEMAND_COLUMNS, DEMAND_NUMERIC))
+
+    assert frame["quantity"].tolist() == [3.0, 0.0]
+    assert demand_series_by_sku(frame) == {
+        "A": [{"week": 1, "quantity": 3.0}],
+        "B": [{"week": 1, "quantity": 0.0}],
+    }
+
+
+def test_classify_dataset():
+    assert classify_dataset(["sku", "current_stock"]) == "inventory"
+    assert classify_dataset(["SKU", "Week", "Quantity"]) == "demand"
+    assert classify_dataset(["a", "b"]) == "data"
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.utils import database
+from backend.utils.database import (
+    AsyncPostgresBackend,
+    PostgresBackend,
+    PoolTimeoutError,
+    ThreadedAsyncBackend,
+    _to_numbered_params,
+    current_tenant,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.executed.append((sql, params))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def get_transaction_status(self):
+        return 0  # TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory(_dsn):
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    pool = PostgresBackend("postgresql://test", connection_factory=factory, **kwargs)
+    return pool, created
+
+
+def test_connections_are_reused():
+    pool, created = make_pool(max_size=2)
+    with pool.get_connection() as first:
+        pass
+    with pool.get_connection() as second:
+        pass
+    assert first is second
+    assert len(created) == 1
+    stats = pool.pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["idle"] == 1 and stats["in_use"] == 0
+
+
+def test_checkout_times_out_when_exhausted():
+    pool, _ = make_pool(max_size=1, timeout=0.05)
+    with pool.get_connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.get_connection():
+                pass
+    assert pool.pool_stats()["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection():
+    pool, created = make_pool(max_size=1, timeout=2)
+    got = []
+
+    def worker():
+        with pool.get_connection() as conn:
+            got.append(conn)
+
+    with pool.get_connection():
+        t = threading.Thread(target=worker)
+        t.start()
+        time.sleep(0.05)
+    t.join()
+    assert got and got[0] is created[0]
+    assert pool.pool_stats()["waits"] == 1
+
+
+def test_dead_connection_replaced_on_checkout():
+    pool, created = make_pool(max_size=2, healthcheck_interval=0)
+    with pool.get_connection() as conn:
+        pass
+    conn.broken = True
+    with pool.get_connection() as fresh:
+        assert fresh is not conn
+    assert conn.closed
+    assert pool.pool_stats()["healthcheck_failures"] == 1
+    assert pool.pool_stats()["size"] == 1
+
+
+def test_idle_connections_reaped_above_min_size():
+    pool, created = make_pool(min_size=1, max_size=3, idle_timeout=0)
+    with pool.get_connection():
+        with pool.get_connection():
+            pass
+    stats = pool.pool_stats()
+    assert stats["size"] == 1
+    assert stats["reaped"] == 1
+
+
+def test_tenant_statement_timeout_applied_from_context():
+    pool, created = make_pool(statement_timeout_ms=5000, tenant_statement_timeouts={"t-slow": 60000})
+    token = current_tenant.set("t-slow")
+    try:
+        with pool.get_connection():
+            pass
+    finally:
+        current_tenant.reset(token)
+    with pool.get_connection():
+        pass
+    timeouts = [params[0] for sql, params in created[0].executed if "statement_timeout" in sql]
+    assert timeouts == [60000, 5000]
+
+
+def test_psycopg_placeholders_rewritten_for_asyncpg():
+    sql = "SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = %s"
+    assert _to_numbered_params(sql) == "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2"
+
+
+def test_threaded_async_backend_wraps_sync_pool():
+    pool, created = make_pool(max_size=1)
+
+    async def run():
+        async with ThreadedAsyncBackend(pool).get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT 1")
+            await conn.commit()
+
+    asyncio.run(run())
+    assert ("SELECT 1", None) in created[0].executed
+    assert pool.pool_stats()["in_use"] == 0
+
+
+def test_async_pool_size_is_configured_separately(monkeypatch):
+    monkeypatch.setenv("POSTGRES_MAX_POOL_SIZE", "4")
+    monkeypatch.setenv("POSTGRES_ASYNC_MAX_POOL_SIZE", "25")
+    assert PostgresBackend.from_env("postgresql://test").async_max_size == 25
+    pool, _ = make_pool(max_size=4)
+    assert pool.async_max_size == 4
+
+
+class FakeAsyncpgPool:
+    def __init__(self):
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+def test_pool_from_a_finished_loop_is_closed(monkeypatch):
+    pytest.importorskip("asyncpg")
+    created = []
+
+    async def create_pool(*args, **kwargs):
+        created.append(FakeAsyncpgPool())
+        return created[-1]
+
+    monkeypatch.setattr(database.asyncpg, "create_pool", create_pool)
+    backend = AsyncPostgresBackend("postgresql://test")
+    first = asyncio.run(backend._get_pool())
+    second = asyncio.run(backend._get_pool())
+
+    assert first is not second
+    assert first.terminated and not second.terminated
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from backend.services.elt_pipeline import demand_metrics, inventory_metrics, merge_demand, merge_inventory
+
+
+def inventory_frame(rows):
+    columns = ["sku", "product_name", "current_stock", "min_stock", "max_stock", "unit_cost", "location"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_inventory_batches_replace_per_sku():
+    state = {}
+    merge_inventory(state, inventory_frame([
+        ("A", "Alpha", 10.0, 5.0, 50.0, 2.0, "W1"),
+        ("B", "Beta", 48.0, 5.0, 50.0, 1.0, "W1"),
+    ]))
+    merge_inventory(state, inventory_frame([("A", "Alpha", 4.0, 5.0, 50.0, 2.0, "W1")]))
+
+    metrics = inventory_metrics(state)
+    assert metrics.product_count == 2
+    assert metrics.total_inventory_value == 4.0 * 2.0 + 48.0 * 1.0
+    assert metrics.stockout_risk() == [{"sku": "A", "current_stock": 4.0, "min_stock": 5.0, "shortfall": 1.0}]
+    assert [i["sku"] for i in metrics.overstock()] == ["B"]
+    assert {p["sku"]: p["inventory_value"] for p in metrics.products()} == {"A": 8.0, "B": 48.0}
+
+
+def test_detail_limit_only_materializes_requested_rows():
+    state = {}
+    merge_inventory(state, inventory_frame([
+        (sku, sku, 1.0, 5.0, 50.0, 1.0, "W1") for sku in ("A", "B", "C")
+    ]))
+
+    metrics = inventory_metrics(state)
+    assert metrics.stockout_count == 3
+    assert [r["sku"] for r in metrics.stockout_risk(2)] == ["A", "B"]
+    assert len(metrics.products(1)) == 1
+    assert metrics.overstock(2) == []
+
+
+def test_demand_batches_update_running_aggregates():
+    state = {}
+    merge_demand(state, pd.DataFrame({"sku": ["A", "A"], "week": [1.0, 2.0], "quantity": [10.0, 20.0]}), {})
+    # Week 2 is re-sent; its stored quantity comes back as 'previous'
+    merge_demand(state, pd.DataFrame({"sku": ["A", "A"], "week": [2.0, 3.0], "quantity": [25.0, 30.0]}), {("A", 2): 20.0})
+
+    assert state["demand"]["skus"]["A"] == [1, 10.0, 3, 30.0, 3]
+    metrics = demand_metrics(state)
+    assert metrics["total_demand"] == 65.0 and metrics["sku_count"] == 1
+    assert metrics["trends"]["A"] == {"growth_rate_pct": 200.0, "direction": "up", "weeks_tracked": 3}
+
+
+def test_earlier_weeks_and_repeated_rows_in_a_batch():
+    state = {}
+    merge_demand(state, pd.DataFrame({"sku": ["A"], "week": [5.0], "quantity": [8.0]}), {})
+    merge_demand(state, pd.DataFrame({"sku": ["A", "A"], "week": [2.0, 2.0], "quantity": [3.0, 4.0]}), {})
+
+    assert state["demand"]["skus"]["A"] == [2, 4.0, 5, 8.0, 2]
+    assert demand_metrics(state)["total_demand"] == 12.0
+
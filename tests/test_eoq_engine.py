@@ -0,0 +1,51 @@
+import math
+
+import pandas as pd
+import pytest
+
+from backend.services.optimizer.eoq import ReplenishmentPlan
+
+FRAME = pd.DataFrame({
+    "sku": ["A", "B", "C", "D"],
+    "product_name": ["Alpha", "Beta", "Gamma", "Delta"],
+    "current_stock": [5.0, 500.0, 40.0, 10.0],
+    "max_stock": [100.0, 520.0, 200.0, 50.0],
+    "unit_cost": [10.0, 2.0, 4.0, 0.0],
+})
+FORECAST = {"A": {"predictions": [{"predicted_quantity": 20.0}, {"predicted_quantity": 30.0}]}, "B": {"predictions": []}}
+
+
+def reference(current_stock, max_stock, unit_cost, annual_demand, order_cost=50, rate=0.2, lead=7, z=1.65):
+    holding = unit_cost * rate
+    eoq = math.sqrt(2 * annual_demand * order_cost / holding) if holding else 0
+    safety = z * (annual_demand * 0.2 / 52) * (lead / 7) ** 0.5
+    rop = annual_demand / 365 * lead + safety
+    if current_stock < rop:
+        return eoq, rop, "ORDER_NOW", 0.0
+    if current_stock > max_stock * 0.9:
+        return eoq, rop, "REDUCE_STOCK", (current_stock - rop) * holding
+    return eoq, rop, "MAINTAIN", 0.0
+
+
+def test_plan_matches_per_item_formulas():
+    plan = ReplenishmentPlan(FRAME, FORECAST)
+    annual = [25.0 * 52, 0.0, 40.0 * 12, 10.0 * 12]  # forecast, empty forecast, turnover fallback
+    recs = plan.page()
+    for rec, (_, row), demand in zip(recs, FRAME.iterrows(), annual):
+        eoq, rop, action, saving = reference(row.current_stock, row.max_stock, row.unit_cost, demand)
+        assert rec["annual_demand_estimate"] == pytest.approx(demand)
+        assert rec["optimal_order_qty"] == pytest.approx(eoq, abs=0.01)
+        assert rec["reorder_point"] == pytest.approx(rop, abs=0.01)
+        assert rec["action"] == action
+        assert rec["potential_saving"] == pytest.approx(saving, abs=0.01)
+        assert rec["order_quantity"] == (pytest.approx(eoq, abs=0.01) if action == "ORDER_NOW" else None)
+    assert plan.actions_required == 2
+    assert plan.total_savings == pytest.approx(sum(r["potential_saving"] for r in recs), abs=0.01)
+
+
+def test_pages_and_actionable_rows_are_built_on_demand():
+    plan = ReplenishmentPlan(FRAME, FORECAST)
+    assert [r["sku"] for r in plan.page(1, 2)] == ["B", "C"]
+    assert plan.page(10, 5) == []
+    assert [r["action"] for r in plan.actionable()] == ["ORDER_NOW", "REDUCE_STOCK"]
+    assert ReplenishmentPlan(FRAME, FORECAST, service_level=0.9).safety_stock[0] < plan.safety_stock[0]
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from backend.services.forecaster.batch import DemandBatch, forecast_batch, forecasts_by_sku
+
+
+def scalar_forecast(values, periods, window=3):
+    """Per-SKU reference: moving average plus OLS trend"""
+    n = len(values)
+    ma = sum(values[-window:]) / min(n, window)
+    if n < 2:
+        trend = 0.0
+    else:
+        x_mean, y_mean = (n - 1) / 2, sum(values) / n
+        trend = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values)) / sum((i - x_mean) ** 2 for i in range(n))
+    return trend, ma, [max(0.0, ma + trend * i) for i in range(1, periods + 1)]
+
+
+def test_batch_matches_scalar_forecast_for_ragged_series():
+    frame = pd.DataFrame({
+        "sku": ["B", "A", "A", "B", "C", "A", "B", "A", "B", "B"],
+        "week": [3.0, 2.0, 1.0, 1.0, 5.0, 3.0, 2.0, 4.0, 4.0, 5.0],
+        "quantity": [30.0, 12.0, 10.0, 10.0, 7.0, 11.0, 20.0, 15.0, 5.0, 1.0],
+    })
+    batch = DemandBatch(frame)
+    result = forecast_batch(batch, periods=5)
+
+    assert batch.skus == ["B", "A", "C"]
+    assert batch.lengths.tolist() == [5, 4, 1]
+    for i, sku in enumerate(batch.skus):
+        values = frame[frame["sku"] == sku].sort_values("week")["quantity"].tolist()
+        trend, ma, predicted = scalar_forecast(values, 5)
+        assert result["trend"][i] == pytest.approx(trend)
+        assert result["moving_average"][i] == pytest.approx(ma)
+        assert result["predicted"][i].tolist() == pytest.approx(predicted)
+    # B trends down hard enough to be clamped at zero
+    assert result["predicted"][0].min() == 0.0
+
+
+def test_forecasts_by_sku_response_shape():
+    frame = pd.DataFrame({"sku": ["A", "A"], "week": [2.0, 1.0], "quantity": [20.0, 10.0]})
+    batch = DemandBatch(frame)
+    forecasts = forecasts_by_sku(batch, forecast_batch(batch, periods=2))
+
+    assert forecasts["A"]["historical_data"] == [{"week": 1, "quantity": 10.0}, {"week": 2, "quantity": 20.0}]
+    assert forecasts["A"]["trend"] == 10.0
+    assert forecasts["A"]["moving_average"] == 15.0
+    assert forecasts["A"]["predictions"][0] == {
+        "period": 3, "predicted_quantity": 25.0, "lower_bound": 20.0, "upper_bound": 30.0, "confidence": 0.8,
+    }
+
+
+def test_empty_frame_packs_to_empty_batch():
+    batch = DemandBatch(pd.DataFrame({"sku": [], "week": [], "quantity": []}))
+    result = forecast_batch(batch)
+    assert len(batch) == 0
+    assert result["predicted"].shape == (0, 4)
+    assert forecasts_by_sku(batch, result) == {}
+
+
+def test_one_long_series_does_not_pad_the_short_ones():
+    weeks = list(range(1, 201))
+    frame = pd.DataFrame({
+        "sku": ["LONG"] * 200 + ["S1", "S1", "S2"],
+        "week": weeks + [1, 2, 7],
+        "quantity": [float(w % 13) for w in weeks] + [4.0, 6.0, 9.0],
+    })
+    batch = DemandBatch(frame)
+    result = forecast_batch(batch, periods=3)
+
+    assert batch.sorted_quantity.shape == (203,)
+    for i, sku in enumerate(batch.skus):
+        values = frame[frame["sku"] == sku].sort_values("week")["quantity"].tolist()
+        trend, ma, predicted = scalar_forecast(values, 3)
+        assert result["trend"][i] == pytest.approx(trend)
+        assert result["moving_average"][i] == pytest.approx(ma)
+        assert result["predicted"][i].tolist() == pytest.approx(predicted)
@@ -0,0 +1,36 @@
+from backend.services.forecaster.cache import ForecastCache, series_fingerprint
+
+HISTORY = [{"week": 1, "quantity": 10.0}, {"week": 2, "quantity": 12.0}]
+PARAMS = {"model": "prophet", "interval_width": 0.8}
+
+
+def test_fingerprint_changes_with_series_params_and_horizon():
+    key = series_fingerprint("t1", "A", HISTORY, PARAMS, 4)
+    assert key == series_fingerprint("t1", "A", [dict(d) for d in HISTORY], dict(PARAMS), 4)
+    assert key != series_fingerprint("t2", "A", HISTORY, PARAMS, 4)
+    assert key != series_fingerprint("t1", "A", HISTORY[:1], PARAMS, 4)
+    assert key != series_fingerprint("t1", "A", HISTORY, {**PARAMS, "interval_width": 0.9}, 4)
+    assert key != series_fingerprint("t1", "A", HISTORY, PARAMS, 8)
+
+
+def test_lru_evictions_spill_to_disk_and_promote_back(tmp_path):
+    cache = ForecastCache(max_entries=2, spill_dir=str(tmp_path))
+    cache.put("aa1", {"sku": "A"})
+    cache.put("bb2", {"sku": "B"})
+    assert cache.get("aa1") == {"sku": "A"}  # B is now least recent
+    cache.put("cc3", {"sku": "C"})
+
+    assert (tmp_path / "bb" / "bb2.json").exists()
+    assert cache.get("bb2") == {"sku": "B"}
+    assert not (tmp_path / "bb" / "bb2.json").exists()
+    assert (tmp_path / "aa" / "aa1.json").exists()
+    assert cache.get("missing") is None
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "disk_hits": 1, "misses": 1}
+
+
+def test_without_spill_dir_evictions_are_dropped():
+    cache = ForecastCache(max_entries=1)
+    cache.put("k1", {"v": 1})
+    cache.put("k2", {"v": 2})
+    assert cache.get("k1") is None
+    assert cache.get("k2") == {"v": 2}
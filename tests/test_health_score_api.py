@@ -48,3 +48,13 @@ def test_metrics_snapshot():
             "changeType",
             "trend",
         }.issubset(item.keys())
+
+
+def test_dashboard_aggregate_matches_individual_endpoints():
+    r = client.get("/v1/tenants/demo/dashboard")
+    assert r.status_code == 200
+    data = r.json()
+    assert {"health_score", "alerts", "signals", "metrics", "data_source", "readiness", "recommendations", "refreshed_at"} <= data.keys()
+    assert data["data_source"] == client.get("/v1/tenants/demo/data-source").json()
+    assert [a["id"] for a in data["alerts"]] == [a["id"] for a in client.get("/v1/tenants/demo/health-score/alerts").json()]
+    assert data["readiness"]["total"] == len(data["readiness"]["connectors"])
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from backend.services.jobs.queue import JobQueue
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+POSTGRES_URL = os.getenv("POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="needs POSTGRES_URL with the jobs schema")
+
+
+@pytest.fixture
+def queue():
+    from backend.utils.database import get_backend
+
+    tenant_id = str(uuid.uuid4())
+    conn = psycopg2.connect(POSTGRES_URL)
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO tenants VALUES (%s, 'Queue test', 'q@example.com', 'free', %s, 'active', NOW(), NOW(), '{}')",
+            [tenant_id, tenant_id]
+        )
+    conn.commit()
+    yield JobQueue(get_backend(), retry_base_seconds=0), tenant_id, conn
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM jobs WHERE tenant_id = %s", [tenant_id])
+        cur.execute("DELETE FROM tenants WHERE tenant_id = %s", [tenant_id])
+    conn.commit()
+    conn.close()
+
+
+def status(conn, job_id):
+    with conn.cursor() as cur:
+        cur.execute("SELECT status, error FROM jobs WHERE job_id = %s", [job_id])
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def test_failed_job_with_a_queued_twin_is_superseded(queue):
+    jobs, tenant_id, conn = queue
+    job_type = f"test_{uuid.uuid4().hex[:12]}"
+    key = f"{job_type}:{tenant_id}"
+
+    async def scenario():
+        running = await jobs.enqueue(tenant_id, job_type, dedupe_key=key)
+        assert (await jobs.poll("w1", [job_type]))["job_id"] == running["job_id"]
+        twin = await jobs.enqueue(tenant_id, job_type, dedupe_key=key)
+        assert not twin["deduplicated"]
+        return running, twin, await jobs.fail(running["job_id"], "w1", "boom")
+
+    running, twin, new_status = asyncio.run(scenario())
+    assert new_status == "failed"
+    assert "superseded" in status(conn, running["job_id"])[1]
+    assert status(conn, twin["job_id"])[0] == "queued"
+
+
+def test_reaper_requeues_one_stale_job_per_dedupe_key(queue):
+    jobs, tenant_id, conn = queue
+    job_type = f"test_{uuid.uuid4().hex[:12]}"
+
+    async def enqueue_running(key):
+        job = await jobs.enqueue(tenant_id, job_type, dedupe_key=key)
+        assert (await jobs.poll("w1", [job_type]))["job_id"] == job["job_id"]
+        return job["job_id"]
+
+    async def scenario():
+        # Two stale jobs sharing a key, and a stale job whose key is queued again
+        older = await enqueue_running(f"{job_type}:pair")
+        newer = await enqueue_running(f"{job_type}:pair")
+        superseded = await enqueue_running(f"{job_type}:twin")
+        queued = (await jobs.enqueue(tenant_id, job_type, dedupe_key=f"{job_type}:twin"))["job_id"]
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE jobs SET heartbeat_at = NOW() - INTERVAL '1 hour' WHERE job_id IN (%s, %s, %s)",
+                [older, newer, superseded]
+            )
+            cur.execute("UPDATE jobs SET created_at = created_at + INTERVAL '1 second' WHERE job_id = %s", [newer])
+        conn.commit()
+        return superseded, queued, older, newer, await jobs.requeue_stale(60)
+
+    superseded, queued, older, newer, released = asyncio.run(scenario())
+    assert released == 3
+    assert status(conn, superseded) == ("failed", "Worker stopped responding (superseded by a queued job)")
+    assert status(conn, queued)[0] == "queued"
+    assert status(conn, newer)[0] == "queued" and status(conn, older)[0] == "failed"
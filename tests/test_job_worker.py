@@ -0,0 +1,90 @@
+import asyncio
+
+from backend.services.jobs import handlers
+from backend.services.jobs.queue import JobQueue
+from backend.services.jobs.worker import JobWorker
+
+
+class MemoryQueue:
+    """Records what the worker does with claimed jobs."""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.acked = {}
+        self.failed = {}
+        self.progress = []
+
+    async def requeue_stale(self, stale_after):
+        return 0
+
+    async def poll(self, worker_id, job_types=None):
+        return self.jobs.pop(0) if self.jobs else None
+
+    async def ack(self, job_id, worker_id, result=None):
+        self.acked[job_id] = result
+        return True
+
+    async def fail(self, job_id, worker_id, error):
+        self.failed[job_id] = error
+        return "queued"
+
+    async def report_progress(self, job_id, percent, message=""):
+        self.progress.append((job_id, percent, message))
+
+    async def heartbeat(self, job_id, worker_id):
+        pass
+
+
+def make_worker(queue, handlers):
+    worker = JobWorker(backend=object(), worker_id="w1", handlers=handlers)
+    worker.queue = queue
+    return worker
+
+
+def test_worker_acks_results_and_fails_exceptions():
+    async def ok(backend, job, progress):
+        await progress(50, "half way")
+        return {"value": job["payload"]["x"] * 2}
+
+    async def broken(backend, job, progress):
+        raise ValueError("bad input")
+
+    queue = MemoryQueue([
+        {"job_id": "j1", "job_type": "ok", "payload": {"x": 21}, "attempts": 1},
+        {"job_id": "j2", "job_type": "broken", "payload": {}, "attempts": 1},
+    ])
+    worker = make_worker(queue, {"ok": ok, "broken": broken})
+
+    async def drain():
+        while await worker.run_once():
+            pass
+
+    asyncio.run(drain())
+    assert queue.acked == {"j1": {"value": 42}}
+    assert queue.failed == {"j2": "ValueError: bad input"}
+    assert queue.progress == [("j1", 50, "half way")]
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    queue = JobQueue(backend=None, retry_base_seconds=2, retry_max_seconds=30)
+    assert 1.6 <= queue.backoff_seconds(1) <= 2.4
+    assert 6.4 <= queue.backoff_seconds(3) <= 9.6
+    assert queue.backoff_seconds(10) <= 36
+
+
+def test_only_stored_runs_drop_cached_views(monkeypatch):
+    dropped = []
+
+    class Forecaster:
+        def __init__(self, backend):
+            pass
+
+        async def forecast_demand(self, tenant_id, sku, periods):
+            return {"error": f"No demand data for SKU {sku}"} if sku else {"forecast_id": "f1"}
+
+    monkeypatch.setattr(handlers, "tenant_data_changed", dropped.append)
+    monkeypatch.setattr(handlers, "ForecastService", Forecaster)
+    assert "error" in asyncio.run(handlers.run_forecast(None, "t1", "NOPE", model="simple"))
+    assert dropped == []
+    asyncio.run(handlers.run_forecast(None, "t1", model="simple"))
+    assert dropped == ["t1"]
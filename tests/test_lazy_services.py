@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+from backend.services.lazy_services import LazyServiceRegistry, package_installed
+
+SERVICES = {
+    "tool": ("json.tool", ("json",)),
+    "missing": ("surely_not_an_installed_package.api", ("surely_not_an_installed_package",)),
+}
+
+
+def test_availability_comes_from_import_specs():
+    assert package_installed("json") and not package_installed("surely_not_an_installed_package")
+    registry = LazyServiceRegistry(SERVICES)
+    assert registry.available("tool") and not registry.available("missing")
+    assert not any(stats["loaded"] for stats in registry.stats().values())
+
+
+def test_first_load_is_timed_and_failures_are_remembered():
+    registry = LazyServiceRegistry(SERVICES)
+    assert registry.symbol("tool", "main") is registry.load("tool").main
+    stats = registry.stats()["tool"]
+    assert stats["loaded"] and stats["loaded_by"] == "request" and stats["import_ms"] >= 0
+    with pytest.raises(ImportError, match="pip install surely_not_an_installed_package"):
+        registry.load("missing")
+    assert "pip install" in registry.stats()["missing"]["error"]
+
+
+def test_prewarm_skips_unavailable_services():
+    registry = LazyServiceRegistry(SERVICES)
+    registry.prewarm().join(timeout=10)
+    stats = registry.stats()
+    assert stats["tool"]["loaded_by"] == "prewarm"
+    assert not stats["missing"]["loaded"] and stats["missing"]["error"] is None
+
+
+def test_app_start_and_capabilities_import_no_heavy_modules():
+    script = (
+        "import sys\n"
+        "from fastapi.testclient import TestClient\n"
+        "from backend.main import app\n"
+        "assert TestClient(app).get('/v1/capabilities').json()['success']\n"
+        "heavy = ('ortools', 'prophet', 'langgraph', 'autogen_agentchat',\n"
+        "         'backend.services.optimizer.ortools_optimizer', 'backend.services.forecaster.prophet_forecaster')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.optimizer.lp_bulk import BulkInventoryLP, build_inventory_lp
+from backend.services.optimizer.lp_model import InventoryLP
+
+pytest.importorskip("ortools")
+
+
+def make_inventory(n, seed=3):
+    rng = np.random.default_rng(seed)
+    max_stock = rng.integers(100, 1000, n).astype(float)
+    frame = pd.DataFrame({
+        "sku": [f"SKU-{i}" for i in range(n)],
+        "product_name": [f"Product {i}" for i in range(n)],
+        "current_stock": np.floor(max_stock * rng.uniform(0, 0.95, n)),
+        "min_stock": np.floor(max_stock * rng.uniform(0.02, 0.1, n)),
+        "max_stock": max_stock,
+        "unit_cost": np.round(rng.uniform(1, 100, n), 2),
+    })
+    forecast = {
+        sku: {"predictions": [{"predicted_quantity": float(q)} for q in rng.uniform(0, cap * 0.3, 3)]}
+        for i, (sku, cap) in enumerate(zip(frame["sku"], max_stock))
+        if i % 5  # Every fifth SKU falls back to the turnover estimate
+    }
+    return frame, forecast
+
+
+FRAME, FORECAST = make_inventory(200)
+REFERENCE = InventoryLP(FRAME.to_dict("records"), FORECAST)
+BASE_SPEND = REFERENCE.solve(details=False)["kpis"]["order_spend"]
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"order_cost": 500, "stockout_cost_multiplier": 1},
+    {"budget_limit": BASE_SPEND * 0.8},
+    {"budget_limit": BASE_SPEND * 0.5, "service_level": 0.9, "holding_cost_rate": 0.4},
+])
+def test_decomposed_solve_matches_inventory_lp(params):
+    expected = REFERENCE.solve(params)
+    solved = BulkInventoryLP(FRAME, FORECAST).solve(params)
+
+    assert solved["solve_mode"] == "decomposed"
+    assert solved["objective_value"] == pytest.approx(expected["objective_value"])
+    assert solved["recommendations"] == expected["recommendations"]
+    assert solved["total_savings"] == pytest.approx(expected["total_savings"])
+    for name, value in expected["kpis"].items():
+        assert solved["kpis"][name] == pytest.approx(value)
+
+
+def test_pages_are_built_inside_extraction():
+    full = REFERENCE.solve()
+    for model in (REFERENCE, BulkInventoryLP(FRAME, FORECAST)):
+        page = model.solve(offset=10, limit=5)
+        assert page["recommendations"] == full["recommendations"][10:15]
+        assert page["actionable"] == [r for r in full["recommendations"] if r["action"] != "MAINTAIN"]
+        assert page["items_analyzed"] == len(FRAME)
+
+
+def test_binding_budget_is_spent_and_priced():
+    solved = BulkInventoryLP(FRAME, FORECAST).solve({"budget_limit": BASE_SPEND * 0.7})
+    assert solved["kpis"]["order_spend"] == pytest.approx(BASE_SPEND * 0.7)
+    assert solved["budget_multiplier"] > 0
+    assert BulkInventoryLP(FRAME, FORECAST).solve()["budget_multiplier"] == 0
+    assert BulkInventoryLP(FRAME, FORECAST).solve({"budget_limit": 1})["solver_status"] == "infeasible"
+
+
+def test_capacity_limit_solves_bulk_model_with_glop():
+    target = REFERENCE.solve(details=False)["kpis"]["target_inventory"]
+    params = {"capacity_limit": target * 0.98, "budget_limit": BASE_SPEND * 0.9}
+    expected = REFERENCE.solve(params, details=False)
+    solved = BulkInventoryLP(FRAME.to_dict("records"), FORECAST).solve(params, details=False)
+
+    assert solved["solve_mode"] == "bulk_lp"
+    assert solved["objective_value"] == pytest.approx(expected["objective_value"])
+    assert solved["kpis"]["target_inventory"] <= target * 0.98 + 1e-6
+
+
+def test_forced_glop_matches_decomposed():
+    params = {"budget_limit": BASE_SPEND * 0.6}
+    decomposed = BulkInventoryLP(FRAME, FORECAST).solve(params, details=False)
+    glop = BulkInventoryLP(FRAME, FORECAST, decompose=False).solve(params, details=False)
+    assert glop["solve_mode"] == "bulk_lp"
+    assert glop["objective_value"] == pytest.approx(decomposed["objective_value"])
+
+
+def test_model_choice_follows_sku_threshold(monkeypatch):
+    monkeypatch.setenv("LP_BULK_MIN_SKUS", "100")
+    assert isinstance(build_inventory_lp(FRAME, FORECAST), BulkInventoryLP)
+    assert isinstance(build_inventory_lp(FRAME.head(50), FORECAST), InventoryLP)
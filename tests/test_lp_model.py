@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from backend.services.optimizer.lp_model import InventoryLP, LPModelCache
+from backend.services.optimizer.ortools_optimizer import ORToolsOptimizer
+
+pytest.importorskip("ortools")
+
+ITEMS = [
+    {"sku": "A", "product_name": "Alpha", "current_stock": 20.0, "min_stock": 10.0, "max_stock": 200.0, "unit_cost": 4.0},
+    {"sku": "B", "product_name": "Beta", "current_stock": 150.0, "min_stock": 5.0, "max_stock": 160.0, "unit_cost": 9.0},
+    {"sku": "C", "product_name": "Gamma", "current_stock": 0.0, "min_stock": 20.0, "max_stock": 120.0, "unit_cost": 2.5},
+]
+FORECAST = {
+    "A": {"predictions": [{"predicted_quantity": 30.0}, {"predicted_quantity": 34.0}]},
+    "C": {"predictions": [{"predicted_quantity": 25.0}]},
+}
+
+
+@pytest.mark.parametrize("params", [
+    {"order_cost": 80},
+    {"holding_cost_rate": 0.5, "service_level": 0.9},
+    {"stockout_cost_multiplier": 10, "budget_limit": 300},
+])
+def test_in_place_resolve_matches_fresh_model(params):
+    model = InventoryLP(ITEMS, FORECAST)
+    baseline = model.solve()
+    updated = model.solve(params)
+    fresh = InventoryLP(ITEMS, FORECAST).solve(params)
+
+    assert not baseline["warm_start"] and updated["warm_start"]
+    assert updated["objective_value"] == pytest.approx(fresh["objective_value"])
+    assert updated["recommendations"] == fresh["recommendations"]
+
+
+def test_params_reset_to_defaults_between_solves():
+    model = InventoryLP(ITEMS, FORECAST)
+    baseline = model.solve()
+    model.solve({"order_cost": 500})
+    assert model.solve()["objective_value"] == pytest.approx(baseline["objective_value"])
+
+
+def test_budget_limit_restricts_orders():
+    model = InventoryLP(ITEMS, FORECAST)
+    unlimited = model.solve()
+    limited = model.solve({"budget_limit": 300})
+    spend = sum(r["optimal_order_qty"] * item["unit_cost"] for r, item in zip(limited["recommendations"], ITEMS))
+    assert spend <= 300 + 1e-6
+    assert limited["objective_value"] > unlimited["objective_value"]
+    assert model.solve({"budget_limit": 100})["solver_status"] == "infeasible"
+
+
+def test_model_cache_rebuilds_on_new_data_version():
+    cache = LPModelCache(max_tenants=1)
+    model = InventoryLP(ITEMS, FORECAST)
+    cache.put("t1", ("raw1", "f1"), model)
+    assert cache.get("t1", ("raw1", "f1")) is model
+    assert cache.get("t1", ("raw2", "f1")) is None
+    cache.put("t2", ("raw1", None), model)
+    assert cache.get("t1", ("raw1", "f1")) is None
+
+
+def test_solve_runs_without_holding_a_connection(fake_async_backend):
+    backend = fake_async_backend()
+    model = InventoryLP(ITEMS, FORECAST)
+    solve, open_during_solve = model.solve, []
+
+    def tracked_solve(*args):
+        open_during_solve.append(backend.open_connections)
+        return solve(*args)
+
+    model.solve = tracked_solve
+    optimizer = object.__new__(ORToolsOptimizer)
+    optimizer.async_backend = backend
+
+    async def tenant_model(cur, tenant_id, telemetry=None):
+        return model
+
+    optimizer._tenant_model = tenant_model
+    result = asyncio.run(optimizer.optimize_inventory_lp("t1", limit=2))
+
+    assert open_during_solve == [0]
+    assert len(result["recommendations"]) == 2
+    assert any(sql.startswith("INSERT INTO optimization_runs") for sql, _ in backend.statements)
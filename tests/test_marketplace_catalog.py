@@ -0,0 +1,54 @@
+import json
+from enum import Enum
+
+from backend.services.connectors.catalog import TIERS, CatalogIndex
+from backend.services.connectors.catalog_data import DEFAULT_CATALOG
+
+
+def naive_ids(items, category=None, tier=None, search=None):
+    if category:
+        items = [c for c in items if c["category"] == category]
+    if tier:
+        items = [c for c in items if c["tier"] == tier]
+    if search:
+        s = search.lower()
+        items = [c for c in items if s in (c.get("display_name", "") + " " + c.get("description", "")).lower()]
+    return [c["id"] for c in items]
+
+
+def test_facets_and_search_match_a_linear_scan():
+    index = CatalogIndex(DEFAULT_CATALOG)
+    queries = [
+        ("crm", None, None), (None, "free", None), ("pos", "standard", None), ("unknown", None, None),
+        (None, None, "S"), (None, None, "sync"), (None, None, "SALESFORCE"), (None, None, "e sync"),
+        ("ecommerce", "free", "order"), (None, None, "no such connector"), (None, None, ""),
+    ]
+    for category, tier, search in queries:
+        assert index.ids(category, tier, search) == naive_ids(DEFAULT_CATALOG, category, tier, search)
+        body = json.loads(index.response(category, tier, search))
+        assert [c["id"] for c in body["connectors"]] == naive_ids(DEFAULT_CATALOG, category, tier, search)
+        assert body["total"] == len(body["connectors"]) and body["tiers"] == TIERS
+
+
+def test_response_is_the_serialized_catalog():
+    index = CatalogIndex(DEFAULT_CATALOG)
+    body = json.loads(index.response())
+    assert body["connectors"] == DEFAULT_CATALOG
+    assert body["categories"] == sorted({c["category"] for c in DEFAULT_CATALOG})
+    assert index.response("crm") is index.response("crm")
+    assert CatalogIndex(DEFAULT_CATALOG).fingerprint == index.fingerprint
+
+
+class Tier(Enum):
+    FREE = "free"
+
+
+def test_enum_facets_and_bounded_search_cache():
+    items = [{"id": f"c{i}", "displayName": f"Connector {i}", "description": "", "category": "crm", "tier": Tier.FREE} for i in range(5)]
+    index = CatalogIndex(items, search_cache_size=2)
+    assert index.ids(tier="free") == [f"c{i}" for i in range(5)]
+    assert json.loads(index.response(tier="free"))["connectors"][0]["tier"] == "free"
+    for query in ("connector 1", "connector 2", "connector 3"):
+        assert index.ids(search=query) == [f"c{query[-1]}"]
+        index.response(search=query)
+    assert len(index._searches) == 2
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from backend.services.forecaster.fitting import ProphetFitPool
+from backend.services.forecaster.prophet_forecaster import ProphetForecaster
+
+
+def flat_fit(historical_data, periods):
+    if historical_data[0]["quantity"] < 0:
+        raise ValueError("negative demand")
+    if historical_data[0]["quantity"] >= 1000:
+        time.sleep(5)
+    last = historical_data[-1]
+    return {
+        "historical_data": historical_data,
+        "predictions": [{"period": last["week"] + i, "predicted_quantity": last["quantity"]} for i in range(1, periods + 1)],
+        "model": "flat",
+    }
+
+
+def test_slow_and_failing_fits_fall_back_per_sku():
+    demand = {
+        "ok": [{"week": 1, "quantity": 10.0}, {"week": 2, "quantity": 12.0}],
+        "slow": [{"week": 1, "quantity": 1000.0}, {"week": 2, "quantity": 1010.0}],
+        "bad": [{"week": 1, "quantity": -1.0}, {"week": 2, "quantity": 3.0}],
+        "also_ok": [{"week": 1, "quantity": 5.0}],
+    }
+    pool = ProphetFitPool(max_workers=2, chunk_size=2, fit_timeout=0.5, fit_fn=flat_fit)
+    try:
+        start = time.monotonic()
+        forecasts = asyncio.run(pool.fit(demand, periods=2))
+        elapsed = time.monotonic() - start
+    finally:
+        pool.shutdown()
+
+    assert list(forecasts) == ["ok", "slow", "bad", "also_ok"]
+    assert forecasts["ok"]["model"] == "flat"
+    assert forecasts["also_ok"]["predictions"][0] == {"period": 2, "predicted_quantity": 5.0}
+
+    assert forecasts["slow"]["model"] == "moving_average_trend"
+    assert forecasts["slow"]["fallback_reason"] == "fit exceeded 0.5s"
+    assert forecasts["slow"]["predictions"][0]["period"] == 3
+    assert forecasts["bad"]["fallback_reason"] == "ValueError: negative demand"
+    assert elapsed < 5
+
+
+def test_fits_run_without_holding_a_connection(fake_async_backend):
+    backend = fake_async_backend(results=[({"source_id": "s1"},), [("A", 1, 10.0), ("A", 2, 12.0)]])
+    forecaster = object.__new__(ProphetForecaster)  # Prophet itself is not needed
+    forecaster.async_backend = backend
+    open_during_fit = []
+
+    async def cached_fit(tenant_id, demand_by_sku, periods):
+        open_during_fit.append(backend.open_connections)
+        return {sku: flat_fit(history, periods) for sku, history in demand_by_sku.items()}, 0
+
+    forecaster._cached_fit = cached_fit
+    result = asyncio.run(forecaster.forecast_with_prophet("t1", periods=2))
+
+    assert open_during_fit == [0]
+    assert result["forecasts"]["A"]["predictions"][-1] == {"period": 4, "predicted_quantity": 12.0}
+    assert any(sql.startswith("INSERT INTO forecasts") for sql, _ in backend.statements)
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.response_cache import LocalStore, ResponseCache, etag_for, etag_matches
+
+
+def test_etag_matching():
+    etag = etag_for("t1", 3, "/v1/tenants/t1/forecasts?")
+    assert etag.startswith('W/"') and etag == etag_for("t1", 3, "/v1/tenants/t1/forecasts?")
+    assert etag != etag_for("t1", 4, "/v1/tenants/t1/forecasts?")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"other"', etag)
+
+
+def test_lru_bound_and_ttl():
+    now = [0.0]
+    cache = ResponseCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    for key in ("a", "b", "c"):
+        cache.put(key, f'W/"{key}"', key.encode())
+    assert cache.get("a") is None and cache.get("c") == ('W/"c"', b"c")
+    now[0] = 11
+    assert cache.get("c") is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_shared_tier_fills_other_processes():
+    now = [0.0]
+    shared = LocalStore(clock=lambda: now[0])
+    writer = ResponseCache(shared=shared, ttl_seconds=10, clock=lambda: now[0])
+    reader = ResponseCache(shared=shared, ttl_seconds=10, clock=lambda: now[0])
+    writer.put("k", 'W/"e"', b'{"a": 1}\n')
+    assert reader.get("k") == ('W/"e"', b'{"a": 1}\n')
+    assert reader.stats()["shared_hits"] == 1 and reader.get("k") is not None and reader.stats()["hits"] == 1
+    now[0] = 11
+    assert ResponseCache(shared=shared, clock=lambda: now[0]).get("k") is None
+
+
+def test_marketplace_answers_revalidation_with_304():
+    client = TestClient(app)
+    first = client.get("/v1/marketplace/connectors", params={"tier": "free"})
+    etag = first.headers["etag"]
+    again = client.get("/v1/marketplace/connectors", params={"tier": "free"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag
+    other = client.get("/v1/marketplace/connectors", params={"tier": "premium"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+def test_cached_and_not_modified_responses_carry_cors_headers():
+    client = TestClient(app)
+    origin = {"Origin": "http://localhost:5173"}
+    first = client.get("/v1/marketplace/connectors", params={"tier": "standard"}, headers=origin)
+    cached = client.get("/v1/marketplace/connectors", params={"tier": "standard"}, headers=origin)
+    revalidated = client.get(
+        "/v1/marketplace/connectors", params={"tier": "standard"},
+        headers={**origin, "If-None-Match": first.headers["etag"]},
+    )
+    assert cached.status_code == 200 and revalidated.status_code == 304
+    for response in (first, cached, revalidated):
+        assert response.headers["access-control-allow-origin"] == "*"
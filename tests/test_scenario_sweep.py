@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("ortools")
+
+from backend.services.optimizer.lp_model import InventoryLP
+from backend.services.optimizer.sweep import ScenarioSweep, cost_service_frontier, scenario_grid
+
+ITEMS = [
+    {"sku": "A", "current_stock": 20.0, "min_stock": 10.0, "max_stock": 200.0, "unit_cost": 4.0},
+    {"sku": "B", "current_stock": 150.0, "min_stock": 5.0, "max_stock": 160.0, "unit_cost": 9.0},
+    {"sku": "C", "current_stock": 0.0, "min_stock": 20.0, "max_stock": 120.0, "unit_cost": 2.5},
+]
+FORECAST = {"A": {"predictions": [{"predicted_quantity": 32.0}]}, "C": {"predictions": [{"predicted_quantity": 25.0}]}}
+GRID = {"holding_cost_rate": [0.1, 0.3], "stockout_cost_multiplier": [0.01, 5], "budget_limit": [100, 300, 1000]}
+
+
+def test_grid_varies_last_parameter_fastest_and_validates():
+    scenarios = scenario_grid({"order_cost": [40, 60], "service_level": [0.9, 0.95]})
+    assert scenarios == [
+        {"order_cost": 40.0, "service_level": 0.9},
+        {"order_cost": 40.0, "service_level": 0.95},
+        {"order_cost": 60.0, "service_level": 0.9},
+        {"order_cost": 60.0, "service_level": 0.95},
+    ]
+    with pytest.raises(ValueError, match="Unknown"):
+        scenario_grid({"discount": [1]})
+    with pytest.raises(ValueError, match="numbers"):
+        scenario_grid({"order_cost": ["cheap"]})
+    with pytest.raises(ValueError, match="limit is 3"):
+        scenario_grid({"order_cost": [1, 2], "service_level": [0.9, 0.95]}, max_scenarios=3)
+
+
+def test_frontier_keeps_only_undominated_scenarios():
+    rows = [
+        {"scenario": 0, "total_cost": 10.0, "fill_rate": 0.90},
+        {"scenario": 1, "total_cost": 12.0, "fill_rate": 0.85},
+        {"scenario": 2, "total_cost": 15.0, "fill_rate": 0.99},
+        {"scenario": 3, "total_cost": None, "fill_rate": None},
+    ]
+    assert cost_service_frontier(rows) == [0, 2]
+
+
+def test_process_pool_sweep_matches_inline_solves():
+    scenarios = scenario_grid(GRID)
+
+    async def collect(sweep):
+        return sorted([row async for row in sweep.stream(scenarios)], key=lambda row: row["scenario"])
+
+    inline = asyncio.run(collect(ScenarioSweep(InventoryLP(ITEMS, FORECAST), max_workers=1)))
+    pooled = asyncio.run(collect(ScenarioSweep(InventoryLP(ITEMS, FORECAST), max_workers=2, chunk_size=4)))
+
+    strip = lambda row: {k: v for k, v in row.items() if k not in ("solve_ms", "iterations")}
+    assert [strip(row) for row in pooled] == [strip(row) for row in inline]
+    assert len(inline) == 12
+    assert {row["status"] for row in inline} == {"optimal", "infeasible"}
+
+    table = asyncio.run(ScenarioSweep(InventoryLP(ITEMS, FORECAST), max_workers=1).run(scenarios))
+    assert table["scenarios"] == 12 and table["infeasible"] == 4
+    assert table["frontier"] and all(table["rows"][i][7] == "optimal" for i in table["frontier"])
@@ -0,0 +1,71 @@
+import pytest
+
+from backend.services.optimizer import telemetry as telemetry_module
+from backend.services.optimizer.telemetry import RunTelemetry
+from backend.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_counts_cumulative_buckets_per_label_set():
+    histogram = Histogram("solve_seconds", "Solve time", ("phase",), buckets=(0.1, 1))
+    histogram.observe(0.05, phase="solve")
+    histogram.observe(0.5, phase="solve")
+    histogram.observe(5, phase="solve")
+    histogram.observe(0.5, phase="persist")
+
+    by_phase = {entry["labels"]["phase"]: entry for entry in histogram.snapshot()}
+    assert list(by_phase["solve"]["buckets"].values()) == [1, 2, 3]
+    assert by_phase["solve"]["count"] == 3
+    assert by_phase["solve"]["sum"] == pytest.approx(5.55)
+    assert by_phase["persist"]["count"] == 1
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("optimization_phase_seconds", "Phase time", ("problem_type", "phase"), (0.5,))
+    assert registry.histogram("optimization_phase_seconds", "ignored") is histogram
+    histogram.observe(0.25, problem_type="inventory_lp", phase="solve")
+
+    text = registry.render()
+    assert "# TYPE optimization_phase_seconds histogram" in text
+    assert 'optimization_phase_seconds_bucket{problem_type="inventory_lp",phase="solve",le="0.5"} 1' in text
+    assert 'optimization_phase_seconds_bucket{problem_type="inventory_lp",phase="solve",le="+Inf"} 1' in text
+    assert 'optimization_phase_seconds_count{problem_type="inventory_lp",phase="solve"} 1' in text
+
+
+def test_run_telemetry_summarizes_and_exports(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(telemetry_module, "get_metrics_registry", lambda: registry)
+
+    run = RunTelemetry("inventory_lp")
+    with run.phase("data_load"):
+        pass
+    run.record_solve({
+        "timings": {"solve": 0.2, "extraction": 0.05},
+        "variables": 300, "constraints": 302, "iterations": 41, "solve_mode": "parametric",
+    })
+    run.add_timing("solve", 0.1)
+
+    summary = run.summary()
+    assert list(summary["timings"]) == ["data_load", "solve", "extraction"]
+    assert run.solve_time_seconds == pytest.approx(0.3)
+    assert summary["variables"] == 300 and summary["iterations"] == 41
+
+    run.export()
+    phases = {entry["labels"]["phase"] for entry in registry.get("optimization_phase_seconds").snapshot()}
+    assert phases == {"data_load", "solve", "extraction"}
+    assert registry.get("optimization_model_constraints").snapshot()[0]["sum"] == 302
+
+
+def test_lp_solves_report_size_and_phase_timings():
+    pytest.importorskip("ortools")
+    from backend.services.optimizer.lp_bulk import BulkInventoryLP
+    from backend.services.optimizer.lp_model import InventoryLP
+
+    items = [
+        {"sku": "A", "current_stock": 20.0, "min_stock": 10.0, "max_stock": 200.0, "unit_cost": 4.0},
+        {"sku": "B", "current_stock": 150.0, "min_stock": 5.0, "max_stock": 160.0, "unit_cost": 9.0},
+    ]
+    for model in (InventoryLP(items, {}), BulkInventoryLP(items, {})):
+        solved = model.solve()
+        assert solved["variables"] > 0 and solved["constraints"] > 0
+        assert set(solved["timings"]) >= {"solve", "extraction"}
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from backend.utils.sse import KEEP_ALIVE, with_heartbeats
+
+
+async def connected():
+    return False
+
+
+async def collect(stream):
+    return [frame async for frame in stream]
+
+
+def test_keep_alives_fill_quiet_gaps():
+    async def frames():
+        yield "data: 1\n\n"
+        await asyncio.sleep(0.05)
+        yield "data: 2\n\n"
+
+    received = asyncio.run(collect(with_heartbeats(frames(), connected, interval=0.01)))
+    assert received[0] == "data: 1\n\n" and received[-1] == "data: 2\n\n"
+    assert KEEP_ALIVE in received
+
+
+def test_disconnect_cancels_the_producer():
+    state = {"cancelled": False, "closed": False}
+
+    async def frames():
+        try:
+            yield "data: 1\n\n"
+            await asyncio.sleep(10)
+            yield "data: never\n\n"
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        finally:
+            state["closed"] = True
+
+    async def gone():
+        return True
+
+    received = asyncio.run(collect(with_heartbeats(frames(), gone, interval=0.01)))
+    assert received == ["data: 1\n\n"]
+    assert state == {"cancelled": True, "closed": True}
+
+
+def test_closing_the_response_stops_the_producer():
+    state = {"closed": False}
+
+    async def frames():
+        try:
+            while True:
+                yield "data: tick\n\n"
+                await asyncio.sleep(0)
+        finally:
+            state["closed"] = True
+
+    async def run():
+        stream = with_heartbeats(frames(), connected, interval=1)
+        assert await stream.__anext__() == "data: tick\n\n"
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert state["closed"]
+
+
+def test_producer_errors_reach_the_response():
+    async def frames():
+        yield "data: 1\n\n"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(collect(with_heartbeats(frames(), connected, interval=1)))